@@ -0,0 +1,10 @@
+"""
+Benchmarks of the bond service.
+
+``api`` replays the scenarios of ``scenarios.jsonl`` against the DRF stack;
+run it with ``python manage.py benchmark_api``. ``serialization`` compares
+the bond list serialization paths; run it with
+``python manage.py benchmark_serializers``. ``isin`` times ISIN validation;
+run it with ``python manage.py benchmark_isins``. ``server`` loads running
+servers over HTTP; run it with ``python manage.py benchmark_server``.
+"""
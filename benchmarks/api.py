@@ -0,0 +1,315 @@
+"""
+Load and latency benchmark of the bond API.
+
+Seeds users with bonds, replays weighted mixes of API calls through the full
+Django/DRF stack (middleware, token authentication, views, serializers and
+the database) and reports latency percentiles, queries and allocations per
+endpoint.
+"""
+
+import json
+import random
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from bonds.models import Bond, PortfolioSummary
+
+SCENARIOS_FILE: Path = Path(__file__).with_name("scenarios.jsonl")
+
+# Host sent by the benchmark client; must be in ALLOWED_HOSTS
+SERVER_NAME: str = "localhost"
+
+# Latency percentiles reported for every endpoint
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+
+def new_bond_data(rng: random.Random) -> dict[str, str]:
+    """Request body of a newly created bond."""
+    return {
+        "cval": "CZ0003551251",
+        "ison": f"Benchmark bond {rng.randrange(10**6)}",
+        "tval": str(Decimal(rng.randrange(1000, 400000)) / 4),
+        "pdcp": "list",
+        "regdt": "2023-05-24",
+        "eico": "0019319703",
+        "ename": "Rentico Invest s.r.o.",
+        "elei": "315700PZ559GOUR26559",
+        "interest_rate": str(Decimal(rng.randrange(100, 1200)) / 100),
+        "purchase_date": "2023-01-01",
+        "maturity_date": (
+            date(2025, 1, 1) + timedelta(rng.randrange(3000))
+        ).isoformat(),
+        "interest_frequency": "Semiannual",
+    }
+
+
+def bond_update_data(rng: random.Random) -> dict[str, str]:
+    """Request body of a partial bond update."""
+    return {"tval": str(Decimal(rng.randrange(1000, 400000)) / 4)}
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """One API call of a scenario; ``{bond_id}`` in the path is filled per call."""
+
+    method: str
+    path: str
+    body: Callable[[random.Random], dict] | None = None
+
+
+ENDPOINTS: dict[str, Endpoint] = {
+    "list": Endpoint("GET", "/api/bonds/manage/"),
+    "list_page": Endpoint("GET", "/api/bonds/manage/?page_size=50"),
+    "retrieve": Endpoint("GET", "/api/bonds/manage/{bond_id}/"),
+    "create": Endpoint("POST", "/api/bonds/manage/", new_bond_data),
+    "update": Endpoint("PATCH", "/api/bonds/manage/{bond_id}/", bond_update_data),
+    "analysis": Endpoint("GET", "/api/bonds/analysis/"),
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A weighted mix of endpoints replayed ``requests`` times."""
+
+    name: str
+    mix: dict[str, int]
+    requests: int = 1000
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Scenario":
+        unknown: set[str] = set(data.get("mix", {})) - set(ENDPOINTS)
+        if not data.get("mix") or unknown:
+            raise ValueError(
+                f"Scenario {data.get('name')!r} has an empty mix or unknown "
+                f"endpoints: {sorted(unknown)}"
+            )
+        return cls(**data)
+
+
+def load_scenarios(path: Path = SCENARIOS_FILE) -> dict[str, Scenario]:
+    """Reads one scenario per line of a JSON Lines file."""
+    scenarios: dict[str, Scenario] = {}
+    with open(path, encoding="utf-8") as scenario_file:
+        for line in scenario_file:
+            if line.strip():
+                scenario: Scenario = Scenario.from_dict(json.loads(line))
+                scenarios[scenario.name] = scenario
+    return scenarios
+
+
+@dataclass
+class BenchmarkUser:
+    """
+    A seeded user with an authenticated client, the ids of their bonds and
+    their API token.
+    """
+
+    client: APIClient
+    bond_ids: list[int]
+    token: str
+
+
+def seed_users(
+    users: int, bonds_per_user: int, rng: random.Random
+) -> list[BenchmarkUser]:
+    """Creates ``users`` users with tokens, each owning ``bonds_per_user`` bonds."""
+    prefix: str = f"bench-{uuid.uuid4().hex[:8]}"
+    owners: list[User] = User.objects.bulk_create(
+        User(username=f"{prefix}-{index}") for index in range(users)
+    )
+    tokens: list[Token] = Token.objects.bulk_create(
+        Token(user=owner, key=Token.generate_key()) for owner in owners
+    )
+    bonds: list[Bond] = Bond.objects.bulk_create(
+        (
+            Bond(owner=owner, **_bond_fields(rng))
+            for owner in owners
+            for _ in range(bonds_per_user)
+        ),
+        batch_size=1000,
+    )
+
+    bond_ids: dict[int, list[int]] = {owner.pk: [] for owner in owners}
+    for bond in bonds:
+        bond_ids[bond.owner_id].append(bond.pk)
+    seeded: list[BenchmarkUser] = []
+    for owner, token in zip(owners, tokens):
+        PortfolioSummary.objects.rebuild(owner.pk)
+        client: APIClient = APIClient(SERVER_NAME=SERVER_NAME)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        seeded.append(BenchmarkUser(client, bond_ids[owner.pk], token.key))
+    return seeded
+
+
+def _bond_fields(rng: random.Random) -> dict:
+    """Model field values of a seeded bond."""
+    data: dict = new_bond_data(rng)
+    for name in ("tval", "interest_rate"):
+        data[name] = Decimal(data[name])
+    for name in ("regdt", "purchase_date", "maturity_date"):
+        data[name] = date.fromisoformat(data[name])
+    return data
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Linearly interpolated percentile of ``values``."""
+    ordered: list[float] = sorted(values)
+    if not ordered:
+        return 0.0
+    position: float = (len(ordered) - 1) * percent / 100
+    lower: int = int(position)
+    upper: int = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+@dataclass
+class EndpointSamples:
+    """Raw measurements of one endpoint."""
+
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    allocations: list[int] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> dict:
+        latencies_ms: list[float] = [latency * 1000 for latency in self.latencies]
+        allocations_kib: list[float] = [size / 1024 for size in self.allocations]
+        return {
+            "count": len(self.latencies),
+            "errors": self.errors,
+            "latency_ms": {
+                "mean": _mean(latencies_ms),
+                **{f"p{p}": percentile(latencies_ms, p) for p in PERCENTILES},
+                "max": max(latencies_ms, default=0.0),
+            },
+            "queries": {
+                "mean": _mean(self.queries),
+                "max": max(self.queries, default=0),
+            },
+            "allocated_peak_kib": {
+                "mean": _mean(allocations_kib),
+                "max": max(allocations_kib, default=0.0),
+            },
+        }
+
+
+def _mean(values: list[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+class ApiBenchmark:
+    """
+    Replays scenarios for a set of seeded users.
+
+    Latency and query counts are measured on every call. Allocations are
+    measured with tracemalloc in a separate pass of ``allocation_samples``
+    calls per endpoint, so that tracing does not inflate the latencies.
+    """
+
+    def __init__(
+        self,
+        users: list[BenchmarkUser],
+        rng: random.Random,
+        allocation_samples: int = 20,
+    ) -> None:
+        self.users: list[BenchmarkUser] = users
+        self.rng: random.Random = rng
+        self.allocation_samples: int = allocation_samples
+
+    def run(self, scenario: Scenario, warmup: int = 0) -> dict:
+        """Replays ``scenario`` and returns its per-endpoint summary."""
+        names: list[str] = list(scenario.mix)
+        weights: list[int] = list(scenario.mix.values())
+        samples: dict[str, EndpointSamples] = {
+            name: EndpointSamples() for name in names
+        }
+
+        for name in self.rng.choices(names, weights, k=warmup):
+            self.call(name)
+
+        started: float = time.perf_counter()
+        for name in self.rng.choices(names, weights, k=scenario.requests):
+            with CaptureQueriesContext(connection) as queries:
+                call_started: float = time.perf_counter()
+                status_code: int = self.call(name)
+                samples[name].latencies.append(time.perf_counter() - call_started)
+            samples[name].queries.append(len(queries))
+            samples[name].errors += status_code >= 400
+        duration: float = time.perf_counter() - started
+
+        tracemalloc.start()
+        try:
+            for name in names:
+                for _ in range(self.allocation_samples):
+                    tracemalloc.reset_peak()
+                    before, _ = tracemalloc.get_traced_memory()
+                    self.call(name)
+                    samples[name].allocations.append(
+                        tracemalloc.get_traced_memory()[1] - before
+                    )
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "description": scenario.description,
+            "requests": scenario.requests,
+            "duration_s": duration,
+            "throughput_rps": scenario.requests / duration if duration else 0.0,
+            "endpoints": {name: samples[name].summary() for name in names},
+        }
+
+    def call(self, name: str) -> int:
+        """Sends one request to ``name`` as a random user and returns its status."""
+        endpoint: Endpoint = ENDPOINTS[name]
+        user: BenchmarkUser = self.rng.choice(self.users)
+        path: str = endpoint.path
+        if "{bond_id}" in path:
+            path = path.format(bond_id=self.rng.choice(user.bond_ids))
+        body: dict | None = endpoint.body(self.rng) if endpoint.body else None
+
+        response = user.client.generic(
+            endpoint.method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+        )
+        if response.streaming:
+            b"".join(response.streaming_content)
+        if name == "create" and response.status_code == 201:
+            user.bond_ids.append(response.data["id"])
+        return response.status_code
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Lists the endpoints whose p95 latency or mean query count grew by more
+    than ``threshold`` (a fraction) between two benchmark results.
+    """
+    regressions: list[str] = []
+    for scenario_name, scenario in current["scenarios"].items():
+        baseline_scenario: dict | None = baseline["scenarios"].get(scenario_name)
+        if baseline_scenario is None:
+            continue
+        for name, endpoint in scenario["endpoints"].items():
+            before: dict | None = baseline_scenario["endpoints"].get(name)
+            if before is None:
+                continue
+            for metric, key in (("latency_ms", "p95"), ("queries", "mean")):
+                old: float = before[metric][key]
+                new: float = endpoint[metric][key]
+                if new > old * (1 + threshold) and new - old > 1e-9:
+                    regressions.append(
+                        f"{scenario_name}/{name}: {metric} {key} {old:.2f} -> {new:.2f}"
+                    )
+    return regressions
@@ -0,0 +1,83 @@
+"""
+Microbenchmark of ISIN validation.
+
+Times the format check that ``validate_cval_format`` used to run, which
+matched a pattern string looked up in the ``re`` cache on every call,
+against ``bonds.isin`` validating one code at a time and in a batch. The
+codes are a mix of valid ISINs, wrong check digits and malformed values and,
+like the ISINs of a bulk import, repeat: the batch checks each distinct code
+once.
+"""
+
+import logging
+import random
+import re
+import string
+from typing import Callable
+from bonds.isin import FORMAT_ERROR, check_digit, invalid_isins, isin_error
+from benchmarks.serialization import best_of
+
+# Logger of validate_cval_format, which logged every value it checked
+legacy_logger: logging.Logger = logging.getLogger("bonds.models")
+
+
+def legacy_format_check(value: str) -> bool:
+    """The format check of ``validate_cval_format`` before ``bonds.isin``."""
+    legacy_logger.debug("Validating ISIN value: %s", value)
+    pattern = r"^(?P<country_code>[A-Z]{2})(?P<identifier>[0-9]{10})$"
+    return len(value) == 12 and re.match(pattern, value) is not None
+
+
+def sample_codes(count: int, distinct: int, rng: random.Random) -> list[str]:
+    """
+    ``count`` codes drawn from ``distinct`` ones: mostly valid ISINs, a tenth
+    with wrong check digits and a tenth malformed.
+    """
+    codes: list[str] = []
+    for _ in range(distinct):
+        prefix: str = "".join(rng.choices(string.ascii_uppercase, k=2)) + "".join(
+            rng.choices(string.digits, k=9)
+        )
+        digit: str = check_digit(prefix)
+        kind: float = rng.random()
+        if kind < 0.1:
+            codes.append(prefix + str((int(digit) + 1) % 10))
+        elif kind < 0.2:
+            codes.append(prefix.lower() + digit)
+        else:
+            codes.append(prefix + digit)
+    return rng.choices(codes, k=count)
+
+
+def compare_validators(
+    count: int, distinct: int | None = None, repeat: int = 5, seed: int = 0
+) -> dict:
+    """
+    Times the validators on ``count`` codes of which ``distinct`` (all by
+    default) differ. Raises if the new validator does
+    not accept exactly the codes of the legacy format check, less the ones
+    with a wrong check digit.
+    """
+    codes: list[str] = sample_codes(count, distinct or count, random.Random(seed))
+    for code in codes:
+        if legacy_format_check(code) != (isin_error(code) != FORMAT_ERROR):
+            raise AssertionError(f"Validators disagree on the format of {code!r}.")
+
+    paths: dict[str, Callable[[], object]] = {
+        "legacy": lambda: [legacy_format_check(code) for code in codes],
+        "single": lambda: [isin_error(code) for code in codes],
+        "batch": lambda: invalid_isins(codes),
+    }
+    seconds: dict[str, float] = {
+        name: best_of(run, repeat) for name, run in paths.items()
+    }
+    return {
+        "codes": count,
+        "distinct": len(set(codes)),
+        "seconds": seconds,
+        "codes_per_second": {
+            name: count / elapsed if elapsed else 0.0
+            for name, elapsed in seconds.items()
+        },
+        "invalid": len(invalid_isins(codes)),
+    }
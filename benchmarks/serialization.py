@@ -0,0 +1,79 @@
+"""
+Microbenchmark of the bond list serialization paths.
+
+Serializes and renders the same in-memory bonds with BondSerializer and
+JSONRenderer, the path of the list endpoint before the fast read path, and
+with the fast row serializer and FastJSONRenderer, and checks that both
+produce the same bytes. The database is not involved.
+"""
+
+import random
+import time
+from typing import Callable
+from django.contrib.auth.models import User
+from rest_framework.renderers import JSONRenderer
+from benchmarks.api import _bond_fields
+from bonds.models import Bond
+from bonds.renderers import FastJSONRenderer
+from bonds.serializers import BondSerializer, bond_rows
+
+
+def sample_bonds(count: int, rng: random.Random) -> list[Bond]:
+    """Unsaved bonds with ids and owners, as the list endpoint would load them."""
+    owner: User = User(pk=1, username="benchmark")
+    return [
+        Bond(pk=index + 1, owner=owner, **_bond_fields(rng)) for index in range(count)
+    ]
+
+
+def serializer_path(bonds: list[Bond]) -> Callable[[], bytes]:
+    def run() -> bytes:
+        return JSONRenderer().render(BondSerializer(bonds, many=True).data)
+
+    return run
+
+
+def fast_path(bonds: list[Bond]) -> Callable[[], bytes]:
+    rows: list[tuple] = [
+        tuple(getattr(bond, column) for column in bond_rows.columns) for bond in bonds
+    ]
+
+    def run() -> bytes:
+        return FastJSONRenderer().render([bond_rows.from_values(row) for row in rows])
+
+    return run
+
+
+def best_of(run: Callable[[], bytes], repeat: int) -> float:
+    """Fastest of ``repeat`` timed calls, in seconds."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def compare_paths(rows: int, repeat: int = 5, seed: int = 0) -> dict:
+    """Times both paths on ``rows`` bonds; raises if their output differs."""
+    bonds: list[Bond] = sample_bonds(rows, random.Random(seed))
+    paths: dict[str, Callable[[], bytes]] = {
+        "serializer": serializer_path(bonds),
+        "fast": fast_path(bonds),
+    }
+    if paths["serializer"]() != paths["fast"]():
+        raise AssertionError("The fast path does not match BondSerializer output.")
+    seconds: dict[str, float] = {
+        name: best_of(run, repeat) for name, run in paths.items()
+    }
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": {
+            name: rows / elapsed if elapsed else 0.0
+            for name, elapsed in seconds.items()
+        },
+        "speedup": (
+            seconds["serializer"] / seconds["fast"] if seconds["fast"] else 0.0
+        ),
+    }
@@ -0,0 +1,102 @@
+"""
+HTTP load benchmark of running servers.
+
+Unlike ``api``, which calls the Django stack in-process, this sends real
+HTTP requests from concurrent clients, so it measures the server itself:
+``manage.py runserver`` against the gunicorn profile of
+docker-compose.prod.yml, worker counts, or persistent database connections.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import requests
+from benchmarks.api import PERCENTILES, percentile
+
+# Paths requested by default, relative to the server URL
+DEFAULT_PATHS: tuple[str, ...] = (
+    "/api/bonds/manage/?page_size=50",
+    "/api/bonds/analysis/",
+)
+
+
+@dataclass
+class LoadSamples:
+    """Raw measurements of one server."""
+
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    duration: float = 0.0
+
+    def summary(self) -> dict:
+        latencies_ms: list[float] = [latency * 1000 for latency in self.latencies]
+        requests_sent: int = len(self.latencies) + self.errors
+        return {
+            "requests": requests_sent,
+            "errors": self.errors,
+            "duration_s": self.duration,
+            "throughput_rps": (
+                len(self.latencies) / self.duration if self.duration else 0.0
+            ),
+            "latency_ms": {
+                **{f"p{p}": percentile(latencies_ms, p) for p in PERCENTILES},
+                "max": max(latencies_ms, default=0.0),
+            },
+        }
+
+
+class ServerLoad:
+    """
+    Sends ``requests`` GET requests spread over ``paths`` to a server from
+    ``concurrency`` threads. Each thread keeps its own HTTP session, so
+    connections are reused the way a client or proxy with keep-alive would.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        paths: tuple[str, ...] = DEFAULT_PATHS,
+        concurrency: int = 8,
+        timeout: float = 30.0,
+    ) -> None:
+        self.token: str = token
+        self.paths: tuple[str, ...] = paths
+        self.concurrency: int = concurrency
+        self.timeout: float = timeout
+        self._local: threading.local = threading.local()
+        self._lock: threading.Lock = threading.Lock()
+
+    def run(self, base_url: str, requests_count: int, warmup: int = 0) -> dict:
+        """Loads the server at ``base_url`` and returns its summary."""
+        base_url = base_url.rstrip("/")
+        urls: list[str] = [
+            base_url + self.paths[i % len(self.paths)] for i in range(requests_count)
+        ]
+        samples: LoadSamples = LoadSamples()
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            warmup_urls: list[str] = urls[:warmup]
+            list(executor.map(lambda url: self.get(url, LoadSamples()), warmup_urls))
+            started: float = time.perf_counter()
+            list(executor.map(lambda url: self.get(url, samples), urls))
+            samples.duration = time.perf_counter() - started
+        return samples.summary()
+
+    def get(self, url: str, samples: LoadSamples) -> None:
+        """Sends one request and records its latency, or an error."""
+        session: requests.Session | None = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers["Authorization"] = f"Token {self.token}"
+        started: float = time.perf_counter()
+        try:
+            response: requests.Response = session.get(url, timeout=self.timeout)
+            ok: bool = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        latency: float = time.perf_counter() - started
+        with self._lock:
+            if ok:
+                samples.latencies.append(latency)
+            else:
+                samples.errors += 1
@@ -2,6 +2,9 @@
 ASGI config for bond_service_demonstrator project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with uvicorn workers (see gunicorn.conf.py) to run the async-native
+endpoints under /api/bonds/async/ on the event loop; the DRF endpoints run in
+a thread per request as under WSGI.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -0,0 +1,402 @@
+import asyncio
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable
+from asgiref.sync import sync_to_async
+from django.core.cache import BaseCache, caches
+
+# Sentinel distinguishing "not cached" from a cached ``None``
+MISSING: object = object()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded in-process cache with per-entry expiry.
+    The least recently used entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0) -> None:
+        self.max_entries: int = max_entries
+        self.ttl: float = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Returns the cached value, or ``default`` if it is missing or expired."""
+        with self._lock:
+            entry: tuple[float, Any] | None = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Stores a value, evicting the least recently used entry if full."""
+        expires_at: float = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Removes a single entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TieredCache:
+    """
+    Two-level cache: a bounded in-process LRU in front of a shared Django
+    cache (Redis, or the file-based stand-in; see ``CACHES``), so values are
+    reused across requests, worker processes and restarts while hot keys are
+    served without a network round trip.
+
+    ``namespace`` (e.g. an owner id) puts a generation number into the key;
+    ``invalidate_namespace`` bumps it, which drops every entry of the
+    namespace on all processes at once. Processes cache the generation for
+    ``local_ttl`` seconds, so they may serve an invalidated entry for that long.
+
+    ``get_or_set`` is single-flight: concurrent misses of one key compute the
+    value once, within a process by waiting on the first caller's future and
+    across processes through a lock entry in the shared tier, whose holder
+    the others wait for. Misses of other keys are never held up. Across
+    processes this relies on an atomic ``add``, which Redis provides; on the
+    file-based cache two processes may occasionally both compute a value.
+    """
+
+    # Counters reported by ``stats``
+    COUNTERS: tuple[str, ...] = ("local_hits", "shared_hits", "misses", "coalesced")
+    # Seconds between checks of the shared tier while another process computes
+    POLL_INTERVAL: float = 0.05
+
+    def __init__(
+        self,
+        prefix: str,
+        ttl: float = 300,
+        local_ttl: float | None = None,
+        max_entries: int = 1024,
+        alias: str = "default",
+        lock_timeout: float = 10.0,
+    ) -> None:
+        self.prefix: str = prefix
+        self.ttl: float = ttl
+        self.local_ttl: float = ttl if local_ttl is None else local_ttl
+        self.alias: str = alias
+        self.lock_timeout: float = lock_timeout
+        self._local: LRUCache = LRUCache(max_entries=max_entries, ttl=self.local_ttl)
+        self._generations: LRUCache = LRUCache(
+            max_entries=max_entries, ttl=min(self.local_ttl, ttl)
+        )
+        # In-flight computations by shared key, and by loop and key for async
+        self._pending: dict[str, Future] = {}
+        self._flights: dict[tuple, asyncio.Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self.reset_stats()
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self.alias]
+
+    def ttl_for(self, value: Any) -> float:
+        """Seconds ``value`` is kept; override to vary it by value."""
+        return self.ttl
+
+    def accepts(self, value: Any) -> bool:
+        """Whether a shared-tier value is a hit; override to skip markers."""
+        return True
+
+    def key(self, key: str, namespace: Hashable | None = None) -> str:
+        """Shared-tier key of ``key``, including its namespace generation."""
+        if namespace is None:
+            return f"{self.prefix}{key}"
+        return f"{self.prefix}{namespace}:{self.generation(namespace)}:{key}"
+
+    def generation(self, namespace: Hashable) -> int:
+        """Current generation of ``namespace``, starting at a random number."""
+        generation: int | object = self._generations.get(namespace)
+        if generation is MISSING:
+            generation_key: str = self._generation_key(namespace)
+            # A random start keeps a namespace whose counter was evicted from
+            # reusing the keys, and so the entries, of an earlier generation
+            self.shared.add(generation_key, secrets.randbits(48), timeout=None)
+            generation = self.shared.get(generation_key) or 0
+            self._generations.set(namespace, generation)
+        return generation
+
+    def invalidate_namespace(self, namespace: Hashable) -> None:
+        """Drops every entry of ``namespace`` from both tiers."""
+        generation_key: str = self._generation_key(namespace)
+        try:
+            self.shared.incr(generation_key)
+        except ValueError:
+            self.shared.set(generation_key, secrets.randbits(48), timeout=None)
+        self._generations.delete(namespace)
+
+    def lookup(self, key: str, namespace: Hashable | None = None) -> tuple[Any, str]:
+        """
+        Returns the cached value and the tier that served it ("local" or
+        "shared"), or ``(MISSING, "miss")``.
+        """
+        shared_key: str = self.key(key, namespace)
+        value: Any = self._local.get(shared_key)
+        if value is not MISSING:
+            self._hit("local", value)
+            return value, "local"
+
+        value = self.shared.get(shared_key, MISSING)
+        if value is not MISSING and self.accepts(value):
+            self._hit("shared", value)
+            self._local.set(shared_key, value, ttl=self._local_ttl_for(value))
+            return value, "shared"
+
+        self._count("misses")
+        return MISSING, "miss"
+
+    def get(
+        self, key: str, namespace: Hashable | None = None, default: Any = None
+    ) -> Any:
+        """Returns the cached value, or ``default`` on a miss."""
+        value, _ = self.lookup(key, namespace)
+        return default if value is MISSING else value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        namespace: Hashable | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Stores a value in both tiers."""
+        ttl = self.ttl_for(value) if ttl is None else ttl
+        shared_key: str = self.key(key, namespace)
+        self._local.set(shared_key, value, ttl=min(ttl, self._local_ttl_for(value)))
+        self.shared.set(shared_key, value, timeout=ttl)
+
+    def delete_many(self, keys: list[str], namespace: Hashable | None = None) -> None:
+        """Drops keys from both tiers with one shared-tier call."""
+        if not keys:
+            return
+        shared_keys: list[str] = [self.key(key, namespace) for key in keys]
+        for shared_key in shared_keys:
+            self._local.delete(shared_key)
+        self.shared.delete_many(shared_keys)
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        namespace: Hashable | None = None,
+    ) -> Any:
+        """
+        Returns the cached value of ``key``, computing and storing it on a
+        miss. Concurrent misses wait for a single computation. Exceptions of
+        ``compute`` propagate and nothing is stored.
+        """
+        value, _ = self.lookup(key, namespace)
+        if value is not MISSING:
+            return value
+        shared_key: str = self.key(key, namespace)
+        # The lock only guards the registry; computations of other keys, and
+        # the waiting for this one, run without it
+        with self._lock:
+            pending: Future | None = self._pending.get(shared_key)
+            if pending is None:
+                flight: Future = Future()
+                self._pending[shared_key] = flight
+        if pending is not None:
+            self._count("coalesced")
+            return pending.result()
+
+        try:
+            # A computation that finished meanwhile may have filled it
+            value = self._local.get(shared_key)
+            if value is not MISSING:
+                self._count("coalesced")
+            else:
+                value = self._compute_once(key, shared_key, compute, namespace)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._pending[shared_key]
+
+    async def alookup(
+        self, key: str, namespace: Hashable | None = None
+    ) -> tuple[Any, str]:
+        """Asynchronous variant of ``lookup``; only shared-tier calls leave the loop."""
+        if namespace is None:
+            value: Any = self._local.get(self.key(key))
+            if value is not MISSING:
+                self._hit("local", value)
+                return value, "local"
+        return await sync_to_async(self.lookup, thread_sensitive=False)(key, namespace)
+
+    async def aset(
+        self,
+        key: str,
+        value: Any,
+        namespace: Hashable | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Asynchronous variant of ``set``."""
+        await sync_to_async(self.set, thread_sensitive=False)(
+            key, value, namespace, ttl
+        )
+
+    async def aget_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        namespace: Hashable | None = None,
+    ) -> Any:
+        """
+        Asynchronous variant of ``get_or_set``: concurrent misses in one
+        event loop await the same computation.
+        """
+        value, _ = await self.alookup(key, namespace)
+        if value is not MISSING:
+            return value
+        flight: tuple = (id(asyncio.get_running_loop()), namespace, key)
+        pending: asyncio.Future | None = self._flights.get(flight)
+        if pending is not None:
+            self._count("coalesced")
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._flights[flight] = future
+        try:
+            value = await self._acompute_once(key, compute, namespace)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # Marked as retrieved, so an exception no waiter awaited is not logged
+            future.exception()
+            raise
+        finally:
+            del self._flights[flight]
+            if not future.done():
+                future.cancel()
+
+    def clear(self) -> None:
+        """Drops the in-process tier; shared entries expire on their own."""
+        self._local.clear()
+        self._generations.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        """Returns hit/miss counters and the overall hit rate."""
+        with self._lock:
+            counters: dict[str, int] = dict(self._counters)
+        hits: int = counters["local_hits"] + counters["shared_hits"]
+        lookups: int = hits + counters["misses"]
+        counters["hits"] = hits
+        return {**counters, "hit_rate": hits / lookups if lookups else 0.0}
+
+    def reset_stats(self) -> None:
+        """Resets all counters to zero."""
+        with self._lock:
+            self._counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _hit(self, tier: str, value: Any) -> None:
+        """Counts a hit of ``tier``; override to count by value as well."""
+        self._count(f"{tier}_hits")
+
+    def _local_ttl_for(self, value: Any) -> float:
+        return min(self.local_ttl, self.ttl_for(value))
+
+    def _generation_key(self, namespace: Hashable) -> str:
+        return f"{self.prefix}generation:{namespace}"
+
+    def _compute_once(
+        self,
+        key: str,
+        shared_key: str,
+        compute: Callable[[], Any],
+        namespace: Hashable | None,
+    ) -> Any:
+        """Computes and stores ``key`` unless another process already is."""
+        lock_key: str = shared_key + ":lock"
+        if not self.shared.add(lock_key, 1, timeout=self.lock_timeout):
+            value: Any = self._wait_for(shared_key, lock_key)
+            if value is not MISSING:
+                self._count("coalesced")
+                self._local.set(shared_key, value, ttl=self._local_ttl_for(value))
+                return value
+            # The holder failed or timed out; compute without the lock
+            value = compute()
+            self.set(key, value, namespace)
+            return value
+        try:
+            value = compute()
+            self.set(key, value, namespace)
+            return value
+        finally:
+            self.shared.delete(lock_key)
+
+    async def _acompute_once(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        namespace: Hashable | None,
+    ) -> Any:
+        """Asynchronous variant of ``_compute_once``."""
+        shared_key: str = await sync_to_async(self.key, thread_sensitive=False)(
+            key, namespace
+        )
+        lock_key: str = shared_key + ":lock"
+        locked: bool = await self.shared.aadd(lock_key, 1, timeout=self.lock_timeout)
+        if not locked:
+            deadline: float = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.POLL_INTERVAL)
+                value: Any = await self.shared.aget(shared_key, MISSING)
+                if value is not MISSING and self.accepts(value):
+                    self._count("coalesced")
+                    self._local.set(shared_key, value, ttl=self._local_ttl_for(value))
+                    return value
+                if await self.shared.aget(lock_key) is None:
+                    break
+        try:
+            value = await compute()
+            await self.aset(key, value, namespace)
+            return value
+        finally:
+            if locked:
+                await self.shared.adelete(lock_key)
+
+    def _wait_for(self, shared_key: str, lock_key: str) -> Any:
+        """Waits for the lock holder to store ``shared_key``; MISSING if it does not."""
+        deadline: float = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.POLL_INTERVAL)
+            value: Any = self.shared.get(shared_key, MISSING)
+            if value is not MISSING and self.accepts(value):
+                return value
+            if self.shared.get(lock_key) is None:
+                break
+        return MISSING
@@ -1,34 +1,157 @@
+import atexit
+import copy
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
+TEXT_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(message)s"
 
-# Nastavení loggeru
-def setup_logging() -> None:
+# Defaults of the LOGGING setting, see setup_logging
+DEFAULT_CONFIG: dict = {
+    "MODE": "queue",
+    "FORMAT": "text",
+    "LEVEL": "INFO",
+    "LEVELS": {},
+    "DIRECTORY": os.path.join(os.getcwd(), "logs"),
+    "FILENAME": "bsd_main.log",
+    "MAX_BYTES": 10 * 1024 * 1024,
+    "BACKUP_COUNT": 5,
+    "CONSOLE": True,
+}
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES: frozenset[str] = frozenset(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+# Handlers installed on the root logger and the listener feeding them
+_root_handlers: list[logging.Handler] = []
+_listener: QueueListener | None = None
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRIBUTES
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RecordQueueHandler(QueueHandler):
     """
-    Configures the logging system to log to both a file in the 'logs' directory
-    and the console.
-    The logs are stored in the 'logs/bsd_main.log' file, and logs are also
-    shown in the console.
+    Puts records on the queue with the message merged and the traceback
+    rendered, but leaves the formatting to the listener's handlers so that
+    structured fields survive.
     """
-    # Ensure that the 'logs' directory exists
-    log_dir: str = os.path.join(os.getcwd(), "logs")
-    os.makedirs(log_dir, exist_ok=True)  # Create the directory if it doesn't exist
 
-    log_file: str = os.path.join(log_dir, "bsd_main.log")
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
 
-    # Set up logging configuration with rotation
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(message)s",
-        handlers=[
-            RotatingFileHandler(
-                log_file, maxBytes=10 * 1024 * 1024, backupCount=5
-            ),  # Log to file with rotation
-            logging.StreamHandler(),  # Log to console
-        ],
+
+def setup_logging(config: dict | None = None) -> None:
+    """
+    Configures the root logger from ``config`` (the LOGGING setting), which
+    is merged over DEFAULT_CONFIG.
+
+    Records go to a rotating file in DIRECTORY and to the console, formatted
+    as text or JSON lines (FORMAT). In "queue" MODE the calling thread only
+    puts the record on a queue; a QueueListener thread formats it and does the
+    file and console I/O, including rotation. "sync" MODE writes directly.
+    LEVEL is the root level and LEVELS maps logger names to their own level.
+    Safe to call again: the previous handlers and listener are replaced.
+    """
+    global _listener
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    stop_logging()
+
+    formatter: logging.Formatter = (
+        JSONFormatter()
+        if config["FORMAT"] == "json"
+        else logging.Formatter(TEXT_FORMAT)
     )
+    handlers: list[logging.Handler] = []
+    if config["DIRECTORY"]:
+        os.makedirs(config["DIRECTORY"], exist_ok=True)
+        handlers.append(
+            RotatingFileHandler(
+                os.path.join(config["DIRECTORY"], config["FILENAME"]),
+                maxBytes=config["MAX_BYTES"],
+                backupCount=config["BACKUP_COUNT"],
+                encoding="utf-8",
+                delay=True,
+            )
+        )
+    if config["CONSOLE"]:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if config["MODE"] == "queue":
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        _root_handlers[:] = [RecordQueueHandler(log_queue)]
+    elif config["MODE"] == "sync":
+        _root_handlers[:] = handlers
+    else:
+        raise ValueError(f"Unknown logging mode: {config['MODE']}")
+
+    root: logging.Logger = logging.getLogger()
+    root.setLevel(config["LEVEL"])
+    for handler in _root_handlers:
+        root.addHandler(handler)
+    for name, level in config["LEVELS"].items():
+        logging.getLogger(name).setLevel(level)
+
+
+def stop_logging() -> None:
+    """Flushes queued records and removes the handlers installed by setup_logging."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    root: logging.Logger = logging.getLogger()
+    for handler in _root_handlers:
+        root.removeHandler(handler)
+        handler.close()
+    _root_handlers.clear()
+
 
+atexit.register(stop_logging)
 
-# A reference to the root logger
+# Logger of scripts outside the Django apps, such as init_db.py
 logger: logging.Logger = logging.getLogger(__name__)
@@ -0,0 +1,309 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+
+Counters and histograms live in process memory and are updated under a
+lock, so recording a value costs a bisect and a few additions. With several
+worker processes each process reports its own series; Prometheus sums them
+per scrape target.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseForbidden
+
+# Default histogram buckets for durations in seconds
+DURATION_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100, 250)
+SIZE_BUCKETS: tuple[float, ...] = (
+    256,
+    1024,
+    4096,
+    16384,
+    65536,
+    262144,
+    1048576,
+    4194304,
+    16777216,
+)
+
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A named metric with one series per combination of label values."""
+
+    kind: str = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()) -> None:
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+        self._lock: threading.Lock = threading.Lock()
+
+    def render(self) -> list[str]:
+        """Returns the exposition lines of all series."""
+        lines: list[str] = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            lines.extend(self._render_series())
+        return lines
+
+    def _render_series(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind: str = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def _render_series(self) -> list[str]:
+        return [
+            (
+                f"{self.name}{{{_format_labels(self.labelnames, labels)}}} "
+                f"{_format_number(value)}"
+                if labels
+                else f"{self.name} {_format_number(value)}"
+            )
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+@dataclass
+class _HistogramSeries:
+    counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed, cumulative buckets."""
+
+    kind: str = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple[float, ...] = DURATION_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index: int = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series: _HistogramSeries | None = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _HistogramSeries(
+                    [0] * (len(self.buckets) + 1)
+                )
+            series.counts[index] += 1
+            series.total += value
+            series.count += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series: _HistogramSeries | None = self._series.get(labels)
+            return series.count if series else 0
+
+    def total(self, *labels: str) -> float:
+        with self._lock:
+            series: _HistogramSeries | None = self._series.get(labels)
+            return series.total if series else 0.0
+
+    def _render_series(self) -> list[str]:
+        lines: list[str] = []
+        for labels, series in sorted(self._series.items()):
+            prefix: str = _format_labels(self.labelnames, labels)
+            separator: str = "," if prefix else ""
+            cumulative: int = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series.counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{prefix}{separator}le="'
+                    f'{_format_number(bound)}"}} {cumulative}'
+                )
+            suffix: str = f"{{{prefix}}}" if prefix else ""
+            lines.append(f"{self.name}_sum{suffix} {_format_number(series.total)}")
+            lines.append(f"{self.name}_count{suffix} {series.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together by the /metrics endpoint."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple[float, ...] = DURATION_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics: list[Metric] = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+registry: MetricsRegistry = MetricsRegistry()
+
+REQUEST_LABELS: tuple[str, ...] = ("view", "method")
+
+requests_total: Counter = registry.counter(
+    "bsd_http_requests_total", "HTTP requests handled.", REQUEST_LABELS + ("status",)
+)
+request_duration: Histogram = registry.histogram(
+    "bsd_http_request_duration_seconds", "Wall time of HTTP requests.", REQUEST_LABELS
+)
+request_db_queries: Histogram = registry.histogram(
+    "bsd_http_request_db_queries",
+    "SQL queries run per HTTP request.",
+    REQUEST_LABELS,
+    COUNT_BUCKETS,
+)
+request_db_duration: Histogram = registry.histogram(
+    "bsd_http_request_db_duration_seconds",
+    "Time spent in SQL queries per HTTP request.",
+    REQUEST_LABELS,
+)
+request_cdcp_calls: Histogram = registry.histogram(
+    "bsd_http_request_cdcp_calls",
+    "CDCP API calls made per HTTP request.",
+    REQUEST_LABELS,
+    COUNT_BUCKETS,
+)
+request_cdcp_duration: Histogram = registry.histogram(
+    "bsd_http_request_cdcp_duration_seconds",
+    "Time spent in CDCP API calls per HTTP request.",
+    REQUEST_LABELS,
+)
+response_size: Histogram = registry.histogram(
+    "bsd_http_response_size_bytes",
+    "Size of HTTP response bodies.",
+    REQUEST_LABELS,
+    SIZE_BUCKETS,
+)
+cdcp_calls_total: Counter = registry.counter(
+    "bsd_cdcp_calls_total", "CDCP API HTTP calls by outcome.", ("outcome",)
+)
+cdcp_call_duration: Histogram = registry.histogram(
+    "bsd_cdcp_call_duration_seconds", "Duration of CDCP API HTTP calls."
+)
+
+
+@dataclass
+class RequestStats:
+    """Work done on behalf of the current request."""
+
+    db_queries: int = 0
+    db_time: float = 0.0
+    cdcp_calls: int = 0
+    cdcp_time: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+# Stats of the request being handled; copied into worker threads with the context
+current_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+@contextmanager
+def track_cdcp_call() -> Iterator[None]:
+    """Times one CDCP HTTP call and attributes it to the current request."""
+    started: float = time.perf_counter()
+    outcome: str = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        elapsed: float = time.perf_counter() - started
+        cdcp_calls_total.inc(outcome)
+        cdcp_call_duration.observe(elapsed)
+        stats: RequestStats | None = current_request_stats.get()
+        if stats is not None:
+            with stats.lock:
+                stats.cdcp_calls += 1
+                stats.cdcp_time += elapsed
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Serves all metrics in the Prometheus text format. Disabled (404) unless
+    ``METRICS["ENABLED"]`` is set.
+    """
+    config: dict = getattr(settings, "METRICS", {})
+    if not config.get("ENABLED", False):
+        raise Http404
+    allowed_ips: list[str] = config.get("ALLOWED_IPS", [])
+    if allowed_ips and request.META.get("REMOTE_ADDR") not in allowed_ips:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,136 @@
+import time
+from contextlib import ExitStack
+from typing import Callable, Iterator
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from . import metrics
+
+# Methods reported as their own label value; anything else is "other"
+KNOWN_METHODS: frozenset[str] = frozenset(
+    {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records wall time, SQL query count and time, CDCP call count and time and
+    response size of every request into the histograms of ``metrics``,
+    labelled with the resolved view name and the HTTP method.
+
+    SQL queries are counted with ``connection.execute_wrapper``, which adds
+    one function call per query and does not keep the SQL text. Streaming
+    responses are measured once their body has been sent.
+    """
+
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response: Callable[[HttpRequest], HttpResponse] = get_response
+        self.is_async: bool = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)
+        stats: metrics.RequestStats = metrics.RequestStats()
+        token = metrics.current_request_stats.set(stats)
+        started: float = time.perf_counter()
+        try:
+            with self._instrument_queries(stats):
+                response: HttpResponse = self.get_response(request)
+        finally:
+            metrics.current_request_stats.reset(token)
+        return self._finish(request, response, stats, started)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Async variant of ``__call__``, so that async views keep running on the
+        event loop under ASGI instead of in a thread.
+        """
+        stats: metrics.RequestStats = metrics.RequestStats()
+        token = metrics.current_request_stats.set(stats)
+        started: float = time.perf_counter()
+        try:
+            with self._instrument_queries(stats):
+                response: HttpResponse = await self.get_response(request)
+        finally:
+            metrics.current_request_stats.reset(token)
+        return self._finish(request, response, stats, started)
+
+    def _finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: metrics.RequestStats,
+        started: float,
+    ) -> HttpResponse:
+        """Records the response, or wraps a streamed body to record it once sent."""
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._measure_stream(
+                response.streaming_content, request, response, stats, started
+            )
+        else:
+            size: int = 0 if response.streaming else len(response.content)
+            self._record(request, response, stats, started, size)
+        return response
+
+    def _measure_stream(
+        self,
+        content: Iterator[bytes],
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: metrics.RequestStats,
+        started: float,
+    ) -> Iterator[bytes]:
+        """Passes the streamed body through, counting its bytes and queries."""
+        size: int = 0
+        token = metrics.current_request_stats.set(stats)
+        try:
+            with self._instrument_queries(stats):
+                for chunk in content:
+                    size += len(chunk)
+                    yield chunk
+        finally:
+            metrics.current_request_stats.reset(token)
+            self._record(request, response, stats, started, size)
+
+    @staticmethod
+    def _instrument_queries(stats: metrics.RequestStats) -> ExitStack:
+        """Installs an execute wrapper counting queries on every database alias."""
+
+        def count_query(execute, sql, params, many, context):
+            query_started: float = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                stats.db_queries += 1
+                stats.db_time += time.perf_counter() - query_started
+
+        stack: ExitStack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(count_query))
+        return stack
+
+    @staticmethod
+    def _record(
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: metrics.RequestStats,
+        started: float,
+        size: int,
+    ) -> None:
+        match = request.resolver_match
+        labels: tuple[str, str] = (
+            (match.view_name or match.route) if match else "unmatched",
+            request.method if request.method in KNOWN_METHODS else "other",
+        )
+        metrics.requests_total.inc(*labels, str(response.status_code))
+        metrics.request_duration.observe(time.perf_counter() - started, *labels)
+        metrics.request_db_queries.observe(stats.db_queries, *labels)
+        metrics.request_db_duration.observe(stats.db_time, *labels)
+        metrics.request_cdcp_calls.observe(stats.cdcp_calls, *labels)
+        metrics.request_cdcp_duration.observe(stats.cdcp_time, *labels)
+        metrics.response_size.observe(size, *labels)
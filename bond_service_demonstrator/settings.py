@@ -11,7 +11,9 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,13 +24,27 @@ BASE_DIR: Path = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
+# Serving profile: "development" runs manage.py runserver with DEBUG on;
+# "production" runs gunicorn (gunicorn.conf.py, docker-compose.prod.yml) with
+# DEBUG off, a secret key from the environment and persistent DB connections
+SERVER_PROFILE: str = os.getenv("DJANGO_SERVER_PROFILE", "development")
+if SERVER_PROFILE not in ("development", "production"):
+    raise ImproperlyConfigured(f"Unknown DJANGO_SERVER_PROFILE: {SERVER_PROFILE}")
+PRODUCTION: bool = SERVER_PROFILE == "production"
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY: str = "django-insecure-_@25=jnqsp((h_y_c#c5^7nf6*8rsu6l)r84zc9r8utmhkvbk*"
+SECRET_KEY: str = (
+    os.environ["DJANGO_SECRET_KEY"]
+    if PRODUCTION
+    else "django-insecure-_@25=jnqsp((h_y_c#c5^7nf6*8rsu6l)r84zc9r8utmhkvbk*"
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG: bool = True
+DEBUG: bool = os.getenv("DJANGO_DEBUG", str(not PRODUCTION)).lower() == "true"
 
-ALLOWED_HOSTS: list[str] = ["localhost", "127.0.0.1"]
+ALLOWED_HOSTS: list[str] = os.getenv(
+    "DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1"
+).split(",")
 
 
 # Application definition
@@ -48,6 +64,7 @@ INSTALLED_APPS: list[str] = [
 ]
 
 MIDDLEWARE: list[str] = [
+    "bond_service_demonstrator.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -81,7 +98,7 @@ WSGI_APPLICATION: str = "bond_service_demonstrator.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES: dict[str, dict[str, str | None]] = {
+DATABASES: dict[str, dict[str, str | int | bool | dict | None]] = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": os.getenv("POSTGRES_DB"),
@@ -89,6 +106,13 @@ DATABASES: dict[str, dict[str, str | None]] = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        # Seconds a connection is kept open and reused by later requests of the
+        # same worker thread; 0 opens a new connection for every request
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 600 if PRODUCTION else 0)),
+        # Checks a reused connection before a request and reconnects if the
+        # server closed it, e.g. after a PostgreSQL restart
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", 5))},
     }
 }
 
@@ -138,7 +162,7 @@ DEFAULT_AUTO_FIELD: str = "django.db.models.BigAutoField"
 REST_FRAMEWORK: dict[str, str | list[str] | dict[str, str]] = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "users.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -156,6 +180,167 @@ REST_FRAMEWORK: dict[str, str | list[str] | dict[str, str]] = {
     },
 }
 
+# True while the test suite runs (manage.py test)
+TESTING: bool = sys.argv[1:2] == ["test"]
+
+# Shared tier behind the in-process LRUs of the CDCP, token and response
+# caches. REDIS_URL (e.g. redis://redis:6379/0) selects Redis or a compatible
+# server, whose atomic add/incr make the single-flight lookups and namespace
+# invalidation of TieredCache exact across processes. Without it entries are
+# kept as files in CACHE_DIR, shared by the worker processes of one host;
+# that backend's add/incr are not atomic, so there both are best effort.
+# CACHE_DIR holds pickled tokens with their users, so it defaults to a private
+# directory outside the source tree. Tests use a per-process memory cache so
+# no run sees entries left by another.
+REDIS_URL: str = os.getenv("REDIS_URL", "")
+CACHE_DIR: str = os.getenv(
+    "CACHE_DIR",
+    str(
+        Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+        / "bond_service_demonstrator"
+    ),
+)
+CACHES: dict[str, dict[str, str | int | dict]] = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        if TESTING
+        else (
+            {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": REDIS_URL,
+            }
+            if REDIS_URL
+            else {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": CACHE_DIR,
+                "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 10000))},
+            }
+        )
+    )
+}
+
+# CDCP API response cache: in-process LRU in front of the Django cache framework.
+# ISINs unknown to CDCP are cached with NEGATIVE_TTL (seconds). Concurrent
+# lookups of an uncached ISIN wait up to LOCK_TIMEOUT for one API call.
+CDCP_CACHE: dict[str, int | str] = {
+    "ALIAS": "default",
+    "TTL": int(os.getenv("CDCP_CACHE_TTL", 3600)),
+    "NEGATIVE_TTL": int(os.getenv("CDCP_CACHE_NEGATIVE_TTL", 300)),
+    "MAX_ENTRIES": int(os.getenv("CDCP_CACHE_MAX_ENTRIES", 1024)),
+    "LOCK_TIMEOUT": int(os.getenv("CDCP_CACHE_LOCK_TIMEOUT", 30)),
+}
+
+# Local CDCP ISIN registry loaded by the load_cdcp_registry command. MODE
+# "remote" always calls the CDCP API, "registry" checks the registry first and
+# calls the API only for unlisted ISINs, "offline" never calls the API.
+CDCP_REGISTRY: dict[str, str | int] = {
+    "MODE": os.getenv("CDCP_REGISTRY_MODE", "remote"),
+    "BATCH_SIZE": int(os.getenv("CDCP_REGISTRY_BATCH_SIZE", 2000)),
+}
+
+# CDCP reconciliation worker (reconcile_cdcp): CDCP calls per second, ISINs
+# claimed per batch, attempts per ISIN and the lease after which a task left
+# running by a crashed worker is picked up again
+CDCP_RECONCILIATION: dict[str, int | float] = {
+    "RATE": float(os.getenv("CDCP_RECONCILIATION_RATE", 5)),
+    "BATCH_SIZE": int(os.getenv("CDCP_RECONCILIATION_BATCH_SIZE", 100)),
+    "MAX_ATTEMPTS": int(os.getenv("CDCP_RECONCILIATION_MAX_ATTEMPTS", 3)),
+    "LEASE_SECONDS": int(os.getenv("CDCP_RECONCILIATION_LEASE_SECONDS", 300)),
+}
+
+# Token authentication cache: in-process LRU in front of the Django cache
+# framework. Other processes may accept a deleted token for up to LOCAL_TTL
+# seconds.
+TOKEN_AUTH_CACHE: dict[str, int | str] = {
+    "ALIAS": "default",
+    "TTL": int(os.getenv("TOKEN_AUTH_CACHE_TTL", 300)),
+    "LOCAL_TTL": int(os.getenv("TOKEN_AUTH_CACHE_LOCAL_TTL", 5)),
+    "MAX_ENTRIES": int(os.getenv("TOKEN_AUTH_CACHE_MAX_ENTRIES", 4096)),
+}
+
+# Pooled HTTP client used for CDCP API calls (timeouts in seconds)
+CDCP_CLIENT: dict[str, int | float] = {
+    "CONNECT_TIMEOUT": float(os.getenv("CDCP_CONNECT_TIMEOUT", 3.05)),
+    "READ_TIMEOUT": float(os.getenv("CDCP_READ_TIMEOUT", 10)),
+    "MAX_RETRIES": int(os.getenv("CDCP_MAX_RETRIES", 2)),
+    "BACKOFF_BASE": 0.2,
+    "BACKOFF_MAX": 2.0,
+    "MAX_CONCURRENCY": int(os.getenv("CDCP_MAX_CONCURRENCY", 10)),
+    "POOL_MAXSIZE": int(os.getenv("CDCP_POOL_MAXSIZE", 10)),
+    "BREAKER_FAILURE_THRESHOLD": 5,
+    "BREAKER_RESET_TIMEOUT": 30.0,
+}
+
+# Bond listing: keyset page sizes, the chunk size of streamed responses and
+# whether rows are built by the fast read serializer instead of BondSerializer
+BOND_LIST: dict[str, int | bool] = {
+    "PAGE_SIZE": int(os.getenv("BOND_LIST_PAGE_SIZE", 100)),
+    "MAX_PAGE_SIZE": int(os.getenv("BOND_LIST_MAX_PAGE_SIZE", 1000)),
+    "STREAM_CHUNK_SIZE": int(os.getenv("BOND_STREAM_CHUNK_SIZE", 2000)),
+    "FAST_SERIALIZER": os.getenv("BOND_FAST_SERIALIZER", "true").lower() == "true",
+}
+
+# Bulk bond import (/api/bonds/manage/bulk/)
+BOND_BULK_IMPORT: dict[str, int] = {
+    "BATCH_SIZE": int(os.getenv("BOND_BULK_IMPORT_BATCH_SIZE", 500)),
+    "MAX_WORKERS": int(os.getenv("BOND_BULK_IMPORT_MAX_WORKERS", 8)),
+    "MAX_ROWS": int(os.getenv("BOND_BULK_IMPORT_MAX_ROWS", 10000)),
+}
+
+# Bond exports (/api/bonds/export/<format>/ and export_bonds): rows per
+# encoded chunk and the gzip level used when the client accepts gzip
+BOND_EXPORT: dict[str, int] = {
+    "CHUNK_SIZE": int(os.getenv("BOND_EXPORT_CHUNK_SIZE", 5000)),
+    "GZIP_LEVEL": int(os.getenv("BOND_EXPORT_GZIP_LEVEL", 6)),
+}
+
+# Rendered responses of the bond list and analysis endpoints, keyed by the
+# owner's portfolio version; TTL in seconds, 0 disables the cache. Each
+# process keeps up to MAX_ENTRIES of them in memory for LOCAL_TTL seconds.
+BOND_RESPONSE_CACHE: dict[str, int | str] = {
+    "ALIAS": "default",
+    "TTL": int(os.getenv("BOND_RESPONSE_CACHE_TTL", 30)),
+    "LOCAL_TTL": int(os.getenv("BOND_RESPONSE_CACHE_LOCAL_TTL", 5)),
+    "MAX_ENTRIES": int(os.getenv("BOND_RESPONSE_CACHE_MAX_ENTRIES", 256)),
+}
+
+# How /api/bonds/analysis/ computes its metrics: "summary" (materialized
+# PortfolioSummary row), "aggregate" (one SQL query), "vectorized" (NumPy
+# columnar engine) or "python" (row by row)
+PORTFOLIO_ANALYSIS_MODE: str = os.getenv("PORTFOLIO_ANALYSIS_MODE", "summary")
+
+# /api/bonds/analysis/history/: default and largest range in days. Snapshots
+# are written by the snapshot_portfolios command, e.g. daily from cron.
+VALUATION_HISTORY: dict[str, int] = {
+    "DEFAULT_DAYS": int(os.getenv("VALUATION_HISTORY_DEFAULT_DAYS", 30)),
+    "MAX_DAYS": int(os.getenv("VALUATION_HISTORY_MAX_DAYS", 3660)),
+}
+
+# /metrics endpoint, off unless METRICS_ENABLED=true as it needs no
+# authentication; an empty ALLOWED_IPS list then allows every client
+METRICS: dict[str, bool | list[str]] = {
+    "ENABLED": os.getenv("METRICS_ENABLED", "false").lower() == "true",
+    "ALLOWED_IPS": [ip for ip in os.getenv("METRICS_ALLOWED_IPS", "").split(",") if ip],
+}
+
+# Logging pipeline, applied by bond_service_demonstrator.logger.setup_logging.
+# MODE "queue" moves formatting and file I/O to a background thread, "sync"
+# writes on the calling thread. LOG_LEVELS sets per-logger levels, e.g.
+# "bonds.views=DEBUG,bonds.services.cdcp_client=WARNING".
+LOGGING_CONFIG: str = "bond_service_demonstrator.logger.setup_logging"
+LOGGING: dict[str, str | int | bool | dict[str, str]] = {
+    "MODE": os.getenv("LOG_MODE", "queue"),
+    "FORMAT": os.getenv("LOG_FORMAT", "json"),
+    "LEVEL": os.getenv("LOG_LEVEL", "INFO"),
+    "LEVELS": dict(
+        item.split("=", 1) for item in os.getenv("LOG_LEVELS", "").split(",") if item
+    ),
+    "DIRECTORY": os.getenv("LOG_DIR", str(BASE_DIR / "logs")),
+    "MAX_BYTES": 10 * 1024 * 1024,
+    "BACKUP_COUNT": 5,
+    "CONSOLE": os.getenv("LOG_CONSOLE", "true").lower() == "true",
+}
+
 SPECTACULAR_SETTINGS: dict[str, str] = {
     "TITLE": "Bond Service Demonstrator API",
     "DESCRIPTION": "API for managing corporate bond investments, enabling users to track and analyze their bond portfolios.",
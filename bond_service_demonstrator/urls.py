@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.urls.resolvers import URLResolver, URLPattern
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from .metrics import metrics_view
 
 # URL configuration for the project
 urlpatterns: list[URLResolver | URLPattern] = [
@@ -19,4 +20,7 @@ urlpatterns: list[URLResolver | URLPattern] = [
     path(
         "swagger/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"
     ),
+    # Per-view request, SQL and CDCP metrics in the Prometheus text format;
+    # answers 404 unless METRICS["ENABLED"] is set
+    path("metrics", metrics_view, name="metrics"),
 ]
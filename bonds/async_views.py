@@ -0,0 +1,164 @@
+"""
+Async-native bond endpoints for ASGI deployments.
+
+DRF views are synchronous, so under ASGI each request holds a thread while it
+waits on PostgreSQL or on the CDCP API. These views implement list,
+retrieve, create and portfolio analysis as async Django views with the same
+token authentication, responses and logging as ``BondViewSet`` and
+``PortfolioAnalysisView``: queries go through the async ORM and the CDCP
+check of a new bond is awaited on ``AsyncCDCPClient``. That client still
+makes a blocking HTTP call on the default thread pool, so the event loop
+stays free while CDCP answers, but the number of CDCP checks in flight per
+process is bounded by that pool. They do not use the response cache of the
+synchronous endpoints.
+"""
+
+import json
+import logging
+from decimal import Decimal
+from typing import Any, Callable
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from users.authentication import CachedTokenAuthentication
+from .conditional import bond_etag, is_not_modified
+from .models import Bond
+from .renderers import FastJSONRenderer
+from .serializers import AsyncBondSerializer, BondSerializer, bond_rows
+from .services.portfolio_analysis import PortfolioAnalysisService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def json_response(
+    data: Any, status_code: int = status.HTTP_200_OK, **headers: str
+) -> HttpResponse:
+    """Renders ``data`` the way the DRF endpoints do."""
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        content_type="application/json",
+        status=status_code,
+        headers=headers,
+    )
+
+
+class AsyncBondAPIView(View):
+    """
+    Base of the async endpoints: authenticates the request token before
+    dispatching, like ``IsAuthenticated`` with ``CachedTokenAuthentication``.
+    Token-authenticated requests need no CSRF token, as in DRF.
+    """
+
+    authentication: CachedTokenAuthentication = CachedTokenAuthentication()
+
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Callable:
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        try:
+            credentials: tuple | None = await self.authentication.aauthenticate(request)
+        except AuthenticationFailed as e:
+            return self.unauthorized(str(e.detail))
+        if credentials is None:
+            return self.unauthorized("Authentication credentials were not provided.")
+        request.user = credentials[0]
+        return await super().dispatch(request, *args, **kwargs)
+
+    def unauthorized(self, detail: str) -> HttpResponse:
+        return json_response(
+            {"detail": detail},
+            status.HTTP_401_UNAUTHORIZED,
+            **{"WWW-Authenticate": self.authentication.authenticate_header(None)},
+        )
+
+
+class AsyncBondListView(AsyncBondAPIView):
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        """Returns the bonds of the current user, ordered by maturity."""
+        logger.debug("Listing bonds for user %s", request.user)
+        queryset = Bond.objects.filter(owner=request.user).order_by(
+            "maturity_date", "id"
+        )
+        chunk_size: int = settings.BOND_LIST["STREAM_CHUNK_SIZE"]
+        if settings.BOND_LIST["FAST_SERIALIZER"]:
+            data: list[dict] = await bond_rows.arows(queryset, chunk_size)
+        else:
+            serializer: BondSerializer = BondSerializer()
+            data = [
+                serializer.to_representation(bond)
+                async for bond in queryset.aiterator(chunk_size=chunk_size)
+            ]
+        logger.debug("Found %d bonds for user %s", len(data), request.user.username)
+        return json_response(data)
+
+    async def post(self, request: HttpRequest) -> HttpResponse:
+        """
+        Creates a bond owned by the current user. The CDCP check of its ISIN
+        is awaited, so the event loop keeps serving other requests meanwhile.
+        """
+        logger.debug("Creating a new bond for user %s", request.user)
+        try:
+            data: Any = json.loads(request.body)
+        except ValueError as e:
+            return json_response(
+                {"detail": f"JSON parse error - {e}"}, status.HTTP_400_BAD_REQUEST
+            )
+        serializer: AsyncBondSerializer = AsyncBondSerializer(data=data)
+        if not await serializer.ais_valid():
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        # Not acreate()/asave(): they cannot pass validate=False, so the bond
+        # would be validated again, with a blocking CDCP call
+        bond: Bond = Bond(**serializer.validated_data, owner=request.user)
+        await sync_to_async(bond.save)(validate=False)
+        logger.info("Bond created with name: %s", bond.ison)
+        return json_response(BondSerializer(bond).data, status.HTTP_201_CREATED)
+
+
+class AsyncBondDetailView(AsyncBondAPIView):
+    async def get(self, request: HttpRequest, pk: int) -> HttpResponse:
+        """
+        Fetches a specific bond owned by the user, answering 304 when the
+        ``If-None-Match`` header lists the bond's current ETag.
+        """
+        logger.debug(
+            "Retrieving bond with ID %s for user %s", pk, request.user.username
+        )
+        try:
+            bond: Bond = await Bond.objects.aget(pk=pk, owner=request.user)
+        except Bond.DoesNotExist:
+            logger.error(
+                "Bond not found with ID %s for user %s", pk, request.user.username
+            )
+            return json_response({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+        etag: str = bond_etag(bond)
+        if is_not_modified(request, etag):
+            return HttpResponse(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        logger.debug("Bond retrieved: %s", bond.ison)
+        return json_response(BondSerializer(bond).data, ETag=etag)
+
+
+class AsyncPortfolioAnalysisView(AsyncBondAPIView):
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        """Performs portfolio analysis for the current user's bonds."""
+        user: User = request.user
+        logger.debug("Performing portfolio analysis for user %s", user)
+        analysis: dict[str, Decimal | str | None] = (
+            await PortfolioAnalysisService.aanalyze_owner(
+                user, mode=settings.PORTFOLIO_ANALYSIS_MODE
+            )
+        )
+        if analysis["nearest_maturity_bond"] is None:
+            logger.info("No bonds found for user %s, returning default analysis", user)
+        return json_response(analysis)
@@ -0,0 +1,108 @@
+import hashlib
+from typing import Callable
+from django.http import HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.response import Response
+from .models import Bond, PortfolioSummary
+from .response_cache import response_cache
+
+
+class PreconditionFailed(APIException):
+    status_code: int = status.HTTP_412_PRECONDITION_FAILED
+    default_detail: str = "The bond has been modified since it was read."
+    default_code: str = "precondition_failed"
+
+
+def bond_etag(bond: Bond) -> str:
+    """Returns a strong ETag derived from every stored field of ``bond``."""
+    state: str = repr(
+        [getattr(bond, field.attname) for field in Bond._meta.concrete_fields]
+    )
+    return quote_etag(hashlib.blake2b(state.encode(), digest_size=16).hexdigest())
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """
+    Raises PreconditionFailed when the request carries an ``If-Match`` header
+    that does not list ``etag`` (weak tags never match, ``*`` always does).
+    """
+    header: str | None = request.headers.get("If-Match")
+    if header is None:
+        return
+    etags: list[str] = parse_etags(header)
+    if "*" not in etags and etag not in etags:
+        raise PreconditionFailed()
+
+
+def owner_etag(owner_id: int, version: int, request: Request, *parts: str) -> str:
+    """
+    Returns a strong ETag for an owner-scoped read: the owner's portfolio
+    version, the request path and query string, the negotiated media type and
+    any extra ``parts`` the response depends on.
+    """
+    state: str = repr(
+        [owner_id, version, request.get_full_path(), request.accepted_media_type]
+        + list(parts)
+    )
+    return quote_etag(hashlib.blake2b(state.encode(), digest_size=16).hexdigest())
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Returns True if the ``If-None-Match`` header lists ``etag``; as RFC 9110
+    requires, weak tags are compared by their opaque value.
+    """
+    header: str | None = request.headers.get("If-None-Match")
+    if header is None:
+        return False
+    etags: list[str] = parse_etags(header)
+    return "*" in etags or etag in {tag.removeprefix("W/") for tag in etags}
+
+
+def not_modified(etag: str) -> Response:
+    """An empty 304 response carrying ``etag``."""
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def owner_cached_read(
+    request: Request, build: Callable[[], HttpResponseBase], *parts: str
+) -> HttpResponseBase:
+    """
+    Serves a read of the current user's bonds conditionally.
+
+    Answers 304 when the client's copy is current and replays a cached
+    rendering when one exists for the owner's version; otherwise ``build``
+    produces the response, which is cached once rendered. The version is read
+    before ``build`` runs, so a concurrent write can only make the cached body
+    newer than its key, never older.
+    """
+    owner_id: int = request.user.pk
+    version: int = PortfolioSummary.objects.version_of(owner_id)
+    etag: str = owner_etag(owner_id, version, request, *parts)
+    if is_not_modified(request, etag):
+        return _revalidate(not_modified(etag))
+
+    cached: tuple[bytes, str] | None = response_cache.get(owner_id, etag)
+    if cached is not None:
+        content, content_type = cached
+        response: HttpResponseBase = HttpResponse(content, content_type=content_type)
+    else:
+        response = build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        if isinstance(response, Response):
+            response_cache.store_on_render(owner_id, etag, response)
+    response["ETag"] = etag
+    return _revalidate(response)
+
+
+def _revalidate(response: HttpResponseBase) -> HttpResponseBase:
+    """Lets clients keep the per-user response but revalidate it on every use."""
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization",))
+    return response
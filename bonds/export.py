@@ -0,0 +1,163 @@
+import csv
+import io
+import re
+import zlib
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator
+from django.db.models import QuerySet
+from .models import Bond
+from .streaming import stream_ndjson
+
+# Exported columns, named like the fields of BondSerializer
+EXPORT_FIELDS: tuple[str, ...] = tuple(
+    field.name for field in Bond._meta.concrete_fields
+)
+
+
+def export_rows(queryset: QuerySet[Bond], chunk_size: int) -> Iterator[tuple]:
+    """Streams ``EXPORT_FIELDS`` tuples of ``queryset`` without building models."""
+    return (
+        queryset.order_by("id")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _text(value: object) -> object:
+    """Formats Decimals and dates the way BondSerializer does."""
+    if isinstance(value, (Decimal, date)):
+        return value.isoformat() if isinstance(value, date) else str(value)
+    return value
+
+
+def encode_csv(rows: Iterable[tuple], chunk_size: int = 2000) -> Iterator[bytes]:
+    """Encodes rows as CSV with a header line, ``chunk_size`` rows at a time."""
+    buffer: io.StringIO = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    count: int = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % chunk_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def encode_ndjson(rows: Iterable[tuple], chunk_size: int = 2000) -> Iterator[bytes]:
+    """Encodes rows as newline-delimited JSON objects, ``chunk_size`` rows at a time."""
+    return stream_ndjson(
+        (dict(zip(EXPORT_FIELDS, map(_text, row))) for row in rows),
+        chunk_size=chunk_size,
+    )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting what a writer produced since the last drain."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position: int = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data: bytes = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def encode_parquet(rows: Iterable[tuple], chunk_size: int = 2000) -> Iterator[bytes]:
+    """
+    Encodes rows as a Parquet file with one row group per ``chunk_size`` rows,
+    yielding each row group once it is written. Needs the pyarrow package.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema: pa.Schema = parquet_schema()
+    sink: _ChunkSink = _ChunkSink()
+    rows = iter(rows)
+    with pq.ParquetWriter(sink, schema) as writer:
+        while batch := [row for _, row in zip(range(chunk_size), rows)]:
+            writer.write_batch(
+                pa.RecordBatch.from_arrays(
+                    [pa.array(column) for column in zip(*batch)], schema=schema
+                )
+            )
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_schema() -> "pa.Schema":
+    """Arrow schema of the exported Bond columns."""
+    import pyarrow as pa
+
+    columns: list[tuple] = []
+    for name in EXPORT_FIELDS:
+        field = Bond._meta.get_field(name)
+        internal_type: str = field.get_internal_type()
+        if internal_type == "DecimalField":
+            data_type = pa.decimal128(field.max_digits, field.decimal_places)
+        elif internal_type == "DateField":
+            data_type = pa.date32()
+        elif name in ("id", "owner"):
+            data_type = pa.int64()
+        else:
+            data_type = pa.string()
+        columns.append((name, data_type))
+    return pa.schema(columns)
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compresses a byte stream into a gzip stream, chunk by chunk."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an ``Accept-Encoding`` header allows a gzip response."""
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality: re.Match | None = re.search(r"q\s*=\s*([0-9.]+)", params)
+        try:
+            return quality is None or float(quality.group(1)) > 0
+        except ValueError:
+            return False
+    return False
+
+
+Encoder = Callable[[Iterable[tuple], int], Iterator[bytes]]
+
+# Export formats and their encoders, content types and file extensions
+EXPORT_FORMATS: dict[str, tuple[Encoder, str, str]] = {
+    "csv": (encode_csv, "text/csv; charset=utf-8", "csv"),
+    "ndjson": (encode_ndjson, "application/x-ndjson", "ndjson"),
+    "parquet": (encode_parquet, "application/vnd.apache.parquet", "parquet"),
+}
@@ -0,0 +1,28 @@
+from datetime import date
+from django.db.models import DateField, Func, IntegerField, Value
+
+
+class DaysUntil(Func):
+    """Whole days from ``valuation_date`` until the date in ``expression``."""
+
+    output_field = IntegerField()
+
+    def __init__(self, expression, valuation_date: date) -> None:
+        super().__init__(expression, Value(valuation_date, output_field=DateField()))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL and Oracle subtract dates into a number of days
+        return super().as_sql(
+            compiler, connection, template="(%(expressions)s)", arg_joiner=" - "
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function="DATEDIFF")
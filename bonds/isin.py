@@ -0,0 +1,84 @@
+import string
+from typing import Iterable
+from django.core.exceptions import ValidationError
+
+FORMAT_ERROR: str = (
+    "Invalid ISIN format. ISIN must be 12 characters long, start with 2 letters, "
+    "and followed by 10 digits."
+)
+CHECK_DIGIT_ERROR: str = "Invalid ISIN check digit."
+
+
+def _digit_sum(number: int) -> int:
+    return number // 10 + number % 10
+
+
+def _luhn(characters: str, doubled_first: bool) -> int:
+    """Luhn contribution of ``characters`` whose first digit is or is not doubled."""
+    digits: str = "".join(str(int(character, 36)) for character in characters)
+    return sum(
+        _digit_sum(2 * int(digit)) if (index % 2 == 0) == doubled_first else int(digit)
+        for index, digit in enumerate(digits)
+    )
+
+
+# An ISIN is a country code of two capital letters followed by 10 digits, the
+# last of which is a Luhn check digit. Letters expand to two digits (A=10 ...
+# Z=35) and the check digit is the last of the 14 digits, so every part of an
+# ISIN has a fixed Luhn contribution. These tables hold them keyed by the
+# part's characters: a check costs five dict lookups, and a value that misses
+# the tables is malformed.
+_COUNTRY: dict[str, int] = {
+    first + second: _luhn(first + second, True)
+    for first in string.ascii_uppercase
+    for second in string.ascii_uppercase
+}
+_DOUBLED_FIRST, _PLAIN_FIRST = (
+    {f"{number:03d}": _luhn(f"{number:03d}", doubled) for number in range(1000)}
+    for doubled in (True, False)
+)
+_CHECK: dict[str, int] = {digit: int(digit) for digit in string.digits}
+
+
+def isin_error(value: str) -> str | None:
+    """Returns why ``value`` is not a valid ISIN, or None if it is one."""
+    if len(value) != 12:
+        return FORMAT_ERROR
+    try:
+        total: int = (
+            _COUNTRY[value[:2]]
+            + _DOUBLED_FIRST[value[2:5]]
+            + _PLAIN_FIRST[value[5:8]]
+            + _DOUBLED_FIRST[value[8:11]]
+            + _CHECK[value[11]]
+        )
+    except KeyError:
+        return FORMAT_ERROR
+    return None if total % 10 == 0 else CHECK_DIGIT_ERROR
+
+
+def validate_isin(value: str) -> None:
+    """Raises ValidationError unless ``value`` is a valid ISIN."""
+    error: str | None = isin_error(value)
+    if error is not None:
+        raise ValidationError(error)
+
+
+def invalid_isins(values: Iterable[str]) -> dict[str, str]:
+    """
+    Validates many ISINs in one call. Each distinct value is checked once;
+    returns the error of every invalid one.
+    """
+    errors: dict[str, str] = {}
+    for value in set(values):
+        if (error := isin_error(value)) is not None:
+            errors[value] = error
+    return errors
+
+
+def check_digit(prefix: str) -> str:
+    """Computes the check digit completing the first 11 characters of an ISIN."""
+    for digit in string.digits:
+        if isin_error(prefix + digit) is None:
+            return digit
+    raise ValueError(f"Not an ISIN prefix: {prefix!r}")
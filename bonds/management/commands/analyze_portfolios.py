@@ -0,0 +1,96 @@
+import os
+from datetime import date
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from bonds.services.batch_analysis import (
+    BatchPortfolioAnalysis,
+    BatchProgress,
+    export_csv,
+    export_parquet,
+)
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Computes the portfolio analysis of every owner as of --valuation-date "
+        "(today by default) on a pool of --workers processes and stores it in "
+        "the PortfolioAnalysisResult table. --resume skips owners already "
+        "stored for the date; --output also exports the results to a .csv or "
+        ".parquet file."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--valuation-date",
+            type=date.fromisoformat,
+            default=None,
+            help="Valuation date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Worker processes; 1 analyzes in this process.",
+        )
+        parser.add_argument(
+            "--owners-per-chunk",
+            type=int,
+            default=500,
+            help="Portfolios handed to a worker at a time.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Bond rows fetched per round trip of the database cursor.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Keep stored results of the date and analyze only the rest.",
+        )
+        parser.add_argument(
+            "--output", type=Path, help="Export the results to a .csv or .parquet file."
+        )
+
+    def handle(self, *args, **options) -> None:
+        sizes: tuple[int, ...] = (
+            options["workers"],
+            options["owners_per_chunk"],
+            options["chunk_size"],
+        )
+        if min(sizes) < 1:
+            raise CommandError(
+                "--workers, --owners-per-chunk and --chunk-size must be positive."
+            )
+        output: Path | None = options["output"]
+        if output is not None and output.suffix not in (".csv", ".parquet"):
+            raise CommandError("--output must end in .csv or .parquet.")
+        if output is not None and output.suffix == ".parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise CommandError("Parquet output requires the pyarrow package.")
+
+        valuation_date: date = options["valuation_date"] or date.today()
+        progress: BatchProgress = BatchPortfolioAnalysis(
+            valuation_date,
+            workers=options["workers"],
+            owners_per_chunk=options["owners_per_chunk"],
+            cursor_chunk_size=options["chunk_size"],
+            resume=options["resume"],
+            on_progress=lambda progress: self.stdout.write(str(progress)),
+        ).run()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Analyzed {progress.analyzed_owners} portfolios as of "
+                f"{valuation_date} ({progress.skipped_owners} resumed)."
+            )
+        )
+
+        if output is not None:
+            export = export_csv if output.suffix == ".csv" else export_parquet
+            written: int = export(output, valuation_date)
+            self.stdout.write(
+                self.style.SUCCESS(f"Exported {written} rows to {output}.")
+            )
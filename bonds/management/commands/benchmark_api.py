@@ -0,0 +1,179 @@
+import json
+import logging
+import platform
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+import django
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from benchmarks.api import (
+    SCENARIOS_FILE,
+    ApiBenchmark,
+    BenchmarkUser,
+    Scenario,
+    compare,
+    load_scenarios,
+    seed_users,
+)
+from bonds.services.cdcp_service import CDCPService
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Replays API scenarios against seeded users with CDCP stubbed out and writes "
+        "latency percentiles, queries and allocations per endpoint to a JSON file."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=20, help="Users to seed.")
+        parser.add_argument(
+            "--bonds", type=int, default=200, help="Bonds seeded per user."
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            metavar="NAME",
+            help="Scenario to run (can be repeated; default: all).",
+        )
+        parser.add_argument(
+            "--scenarios-file",
+            type=Path,
+            default=SCENARIOS_FILE,
+            help="JSON Lines file with the scenario definitions.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            help="Override the number of requests of every scenario.",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=50, help="Unmeasured requests per scenario."
+        )
+        parser.add_argument(
+            "--allocation-samples",
+            type=int,
+            default=20,
+            help="Requests per endpoint traced with tracemalloc.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=Path("benchmark_results.json"),
+            help="Where to write the results.",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            help="Earlier results to compare against; regressions fail the command.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Relative growth of p95 latency or queries reported as a regression.",
+        )
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help="Seed the configured database instead of a throwaway test database.",
+        )
+        parser.add_argument(
+            "--log-level",
+            default="WARNING",
+            help="Root log level while the benchmark runs.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            available: dict[str, Scenario] = load_scenarios(options["scenarios_file"])
+        except (OSError, ValueError, TypeError) as e:
+            raise CommandError(f"Cannot load scenarios: {e}")
+        names: list[str] = options["scenarios"] or list(available)
+        unknown: list[str] = [name for name in names if name not in available]
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(unknown)}")
+        scenarios: list[Scenario] = [available[name] for name in names]
+        if options["requests"] is not None:
+            scenarios = [
+                Scenario(
+                    scenario.name,
+                    scenario.mix,
+                    options["requests"],
+                    scenario.description,
+                )
+                for scenario in scenarios
+            ]
+
+        root: logging.Logger = logging.getLogger()
+        log_level: int = root.level
+        root.setLevel(options["log_level"])
+        old_database_name: str | None = None
+        if not options["use_current_db"]:
+            old_database_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+        try:
+            with mock.patch.object(
+                CDCPService, "is_cdcp_bond_data_matching", return_value=True
+            ):
+                results: dict = self._run(scenarios, options)
+        finally:
+            if old_database_name is not None:
+                connection.creation.destroy_test_db(old_database_name, verbosity=0)
+            root.setLevel(log_level)
+
+        options["output"].write_text(json.dumps(results, indent=2))
+        for name, scenario in results["scenarios"].items():
+            self.stdout.write(f"{name}: {scenario['throughput_rps']:.1f} requests/s")
+            for endpoint, summary in scenario["endpoints"].items():
+                latency: dict = summary["latency_ms"]
+                self.stdout.write(
+                    f"  {endpoint:<10} p50 {latency['p50']:7.2f} ms  "
+                    f"p95 {latency['p95']:7.2f} ms  p99 {latency['p99']:7.2f} ms  "
+                    f"{summary['queries']['mean']:5.1f} queries  "
+                    f"{summary['allocated_peak_kib']['mean']:8.1f} KiB  "
+                    f"{summary['errors']} errors"
+                )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options["baseline"]:
+            regressions: list[str] = compare(
+                json.loads(options["baseline"].read_text()),
+                results,
+                options["threshold"],
+            )
+            if regressions:
+                raise CommandError(
+                    "Regressions against the baseline:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(
+                self.style.SUCCESS("No regressions against the baseline.")
+            )
+
+    def _run(self, scenarios: list[Scenario], options: dict) -> dict:
+        """Seeds the database and replays every scenario."""
+        rng: random.Random = random.Random(options["seed"])
+        users: list[BenchmarkUser] = seed_users(options["users"], options["bonds"], rng)
+        benchmark: ApiBenchmark = ApiBenchmark(
+            users, rng, allocation_samples=options["allocation_samples"]
+        )
+        return {
+            "meta": {
+                "created": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "users": options["users"],
+                "bonds_per_user": options["bonds"],
+                "seed": options["seed"],
+                "warmup": options["warmup"],
+            },
+            "scenarios": {
+                scenario.name: benchmark.run(scenario, warmup=options["warmup"])
+                for scenario in scenarios
+            },
+        }
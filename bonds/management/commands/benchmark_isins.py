@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from benchmarks.isin import compare_validators
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Compares the legacy ISIN format check with the ISIN validator of "
+        "bonds.isin, one code at a time and in a batch."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--codes", type=int, default=100000, help="ISINs validated per run."
+        )
+        parser.add_argument(
+            "--distinct",
+            type=int,
+            default=10000,
+            help="Distinct ISINs the codes are drawn from.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per validator; the best is kept.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+
+    def handle(self, *args, **options) -> None:
+        if min(options["codes"], options["distinct"], options["repeat"]) < 1:
+            raise CommandError("--codes, --distinct and --repeat must be positive.")
+        try:
+            result: dict = compare_validators(
+                options["codes"],
+                options["distinct"],
+                options["repeat"],
+                options["seed"],
+            )
+        except AssertionError as e:
+            raise CommandError(str(e))
+
+        for name, seconds in result["seconds"].items():
+            self.stdout.write(
+                f"{name:<8} {seconds * 1000:9.2f} ms  "
+                f"{result['codes_per_second'][name]:12.0f} codes/s"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['invalid']} of {result['distinct']} distinct codes "
+                f"rejected."
+            )
+        )
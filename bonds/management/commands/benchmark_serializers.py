@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from benchmarks.serialization import compare_paths
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Compares BondSerializer with the fast read path on in-memory bonds and "
+        "checks that both render the same bytes."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--rows", type=int, default=10000, help="Bonds serialized per run."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs per path; the best is kept."
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+
+    def handle(self, *args, **options) -> None:
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+        try:
+            result: dict = compare_paths(
+                options["rows"], options["repeat"], options["seed"]
+            )
+        except AssertionError as e:
+            raise CommandError(str(e))
+
+        for name, seconds in result["seconds"].items():
+            self.stdout.write(
+                f"{name:<10} {seconds * 1000:9.2f} ms  "
+                f"{result['rows_per_second'][name]:12.0f} rows/s"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Identical output; fast path is {result['speedup']:.1f}x faster."
+            )
+        )
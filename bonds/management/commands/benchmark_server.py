@@ -0,0 +1,95 @@
+import json
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from benchmarks.api import BenchmarkUser, seed_users
+from benchmarks.server import DEFAULT_PATHS, ServerLoad
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Sends concurrent HTTP requests to one or more running servers, e.g. "
+        "runserver and the gunicorn profile, and compares their throughput and "
+        "latency percentiles."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "urls", nargs="+", metavar="URL", help="Base URLs of the servers."
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path to request (can be repeated; default: bond list and analysis).",
+        )
+        parser.add_argument(
+            "--token",
+            help="API token to send; by default a temporary user with bonds is "
+            "seeded in the configured database and deleted afterwards.",
+        )
+        parser.add_argument(
+            "--bonds", type=int, default=200, help="Bonds of the temporary user."
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=8, help="Concurrent clients."
+        )
+        parser.add_argument(
+            "--requests", type=int, default=1000, help="Requests per server."
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=50, help="Unmeasured requests per server."
+        )
+        parser.add_argument(
+            "--output", type=Path, help="JSON file to write the results to."
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["concurrency"] < 1 or options["requests"] < 1:
+            raise CommandError("--concurrency and --requests must be positive.")
+
+        user: BenchmarkUser | None = None
+        token: str | None = options["token"]
+        if token is None:
+            user = seed_users(1, options["bonds"], random.Random(0))[0]
+            token = user.token
+        try:
+            load: ServerLoad = ServerLoad(
+                token,
+                tuple(options["paths"] or DEFAULT_PATHS),
+                concurrency=options["concurrency"],
+            )
+            servers: dict[str, dict] = {
+                url: load.run(url, options["requests"], warmup=options["warmup"])
+                for url in options["urls"]
+            }
+        finally:
+            if user is not None:
+                User.objects.filter(auth_token__key=user.token).delete()
+
+        for url, summary in servers.items():
+            latency: dict = summary["latency_ms"]
+            self.stdout.write(
+                f"{url}: {summary['throughput_rps']:.1f} requests/s  "
+                f"p50 {latency['p50']:7.2f} ms  p95 {latency['p95']:7.2f} ms  "
+                f"p99 {latency['p99']:7.2f} ms  {summary['errors']} errors"
+            )
+        if options["output"]:
+            options["output"].write_text(
+                json.dumps(
+                    {
+                        "meta": {
+                            "created": datetime.now(timezone.utc).isoformat(),
+                            "concurrency": options["concurrency"],
+                            "paths": list(options["paths"] or DEFAULT_PATHS),
+                        },
+                        "servers": servers,
+                    },
+                    indent=2,
+                )
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"Results written to {options['output']}")
+            )
@@ -0,0 +1,64 @@
+from pathlib import Path
+from typing import Iterator
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import QuerySet
+from bonds.export import EXPORT_FORMATS, export_rows, gzip_stream, parquet_available
+from bonds.models import Bond
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Writes all bonds, or those of --owner, to a CSV, NDJSON or Parquet "
+        "file chosen by its extension (.csv, .ndjson, .parquet). A trailing "
+        ".gz compresses the file with gzip."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("output", type=Path, help="File to write.")
+        parser.add_argument("--owner", help="Export only the bonds of this username.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.BOND_EXPORT["CHUNK_SIZE"],
+            help="Rows read and encoded at a time.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        output: Path = options["output"]
+        compress: bool = output.suffix == ".gz"
+        export_format: str = (output.with_suffix("") if compress else output).suffix
+        export_format = export_format.lstrip(".")
+        if export_format not in EXPORT_FORMATS:
+            raise CommandError(
+                f"Output must end in one of: {', '.join(EXPORT_FORMATS)} "
+                "(optionally followed by .gz)."
+            )
+        if export_format == "parquet" and not parquet_available():
+            raise CommandError("Parquet output requires the pyarrow package.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        bonds: QuerySet[Bond] = Bond.objects.all()
+        if options["owner"]:
+            try:
+                owner: User = User.objects.get(username=options["owner"])
+            except User.DoesNotExist:
+                raise CommandError(f"Unknown owner: {options['owner']}")
+            bonds = bonds.filter(owner=owner)
+
+        encode = EXPORT_FORMATS[export_format][0]
+        chunks: Iterator[bytes] = encode(
+            export_rows(bonds, options["chunk_size"]), options["chunk_size"]
+        )
+        if compress:
+            chunks = gzip_stream(chunks, level=settings.BOND_EXPORT["GZIP_LEVEL"])
+        written: int = 0
+        with output.open("wb") as file:
+            for chunk in chunks:
+                written += file.write(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {written} bytes of bonds to {output}.")
+        )
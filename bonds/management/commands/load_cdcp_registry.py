@@ -0,0 +1,62 @@
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from bonds.services.cdcp_registry import (
+    DUMP_FORMATS,
+    RegistryRefresh,
+    apply_dump,
+    read_dump,
+)
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Loads a CDCP ISIN dump into the local registry used when "
+        "CDCP_REGISTRY_MODE is 'registry' or 'offline'. Only new and changed "
+        "records are written, so re-running it with a newer dump applies the delta."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "dump", type=Path, help="Path of the JSON, NDJSON or CSV dump."
+        )
+        parser.add_argument(
+            "--format",
+            choices=DUMP_FORMATS,
+            help="Dump format; taken from the file extension by default.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Remove ISINs missing from the dump. Use only with full dumps.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CDCP_REGISTRY["BATCH_SIZE"],
+            help="Records compared and written per batch.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        dump: Path = options["dump"]
+        if not dump.is_file():
+            raise CommandError(f"Dump {dump} does not exist.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        try:
+            result: RegistryRefresh = apply_dump(
+                read_dump(dump, options["format"]),
+                batch_size=options["batch_size"],
+                prune=options["prune"],
+            )
+        except (ValueError, KeyError) as e:
+            raise CommandError(f"Could not read dump {dump}: {e}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"CDCP registry: {result.inserted} inserted, {result.updated} "
+                f"updated, {result.unchanged} unchanged, {result.removed} removed, "
+                f"{result.skipped} skipped."
+            )
+        )
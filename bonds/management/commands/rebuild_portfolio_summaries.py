@@ -0,0 +1,105 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Min, QuerySet
+from bonds.models import Bond, PortfolioSummary
+
+# Fields compared between a stored summary and the Bond table
+SUMMARY_FIELDS: tuple[str, ...] = (
+    "bond_count",
+    "total_value",
+    "interest_rate_sum",
+    "weighted_rate_sum",
+    "weighted_maturity_sum",
+    "nearest_maturity_date",
+)
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Checks PortfolioSummary rows against the Bond table and rebuilds the ones "
+        "that have drifted."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drift and exit with an error if any is found.",
+        )
+        parser.add_argument(
+            "--owner",
+            action="append",
+            dest="owners",
+            metavar="USERNAME",
+            help="Limit the run to the given user (can be repeated).",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=Decimal,
+            default=Decimal("0.0001"),
+            help="Largest difference of a sum that is not reported as drift.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        owners: QuerySet[User] = User.objects.all()
+        if options["owners"]:
+            owners = owners.filter(username__in=options["owners"])
+
+        expected: dict[int, dict] = {
+            row["owner_id"]: row
+            for row in Bond.objects.filter(owner__in=owners)
+            .values("owner_id")
+            .annotate(
+                **PortfolioSummary.objects.totals_expressions(),
+                nearest_maturity_date=Min("maturity_date"),
+            )
+            .order_by()
+        }
+        stored: dict[int, PortfolioSummary] = {
+            summary.owner_id: summary
+            for summary in PortfolioSummary.objects.filter(owner__in=owners)
+        }
+
+        drifted: list[int] = []
+        for owner_id in sorted(set(expected) | set(stored)):
+            differences: list[str] = self._differences(
+                expected.get(owner_id), stored.get(owner_id), options["tolerance"]
+            )
+            if differences:
+                drifted.append(owner_id)
+                self.stdout.write(f"Owner {owner_id}: {'; '.join(differences)}")
+
+        if options["check"]:
+            if drifted:
+                raise CommandError(f"{len(drifted)} portfolio summaries have drifted.")
+            self.stdout.write(
+                self.style.SUCCESS("All portfolio summaries are current.")
+            )
+            return
+
+        for owner_id in drifted:
+            PortfolioSummary.objects.rebuild(owner_id)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(drifted)} portfolio summaries.")
+        )
+
+    @staticmethod
+    def _differences(
+        expected: dict | None, summary: PortfolioSummary | None, tolerance: Decimal
+    ) -> list[str]:
+        """Describes every field in which ``summary`` differs from ``expected``."""
+        if summary is None:
+            return ["summary is missing"]
+        differences: list[str] = []
+        for field in SUMMARY_FIELDS:
+            expected_value = (expected or {}).get(field)
+            stored_value = getattr(summary, field)
+            if field != "nearest_maturity_date":
+                expected_value = expected_value or Decimal(0)
+                if abs(Decimal(stored_value) - Decimal(expected_value)) <= tolerance:
+                    continue
+            elif stored_value == expected_value:
+                continue
+            differences.append(f"{field} is {stored_value}, expected {expected_value}")
+        return differences
@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from bonds.models import ReconciliationRun
+from bonds.services.cdcp_client import CDCPClient
+from bonds.services.cdcp_service import CDCPService
+from bonds.services.reconciliation import (
+    CDCPReconciler,
+    ReconciliationProgress,
+    enqueue_run,
+)
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Re-validates stored bonds against CDCP and records the differences. "
+        "Without --enqueue it resumes the latest unfinished run, so a crashed "
+        "worker can simply be started again; several workers may share a run."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Start a new run with one task per distinct ISIN of the stored bonds.",
+        )
+        parser.add_argument("--run", type=int, help="Work on the run with this ID.")
+        parser.add_argument(
+            "--limit", type=int, help="Stop after checking this many ISINs."
+        )
+        parser.add_argument("--rate", type=float, help="CDCP calls per second.")
+        parser.add_argument("--batch-size", type=int, help="ISINs claimed per batch.")
+        parser.add_argument(
+            "--max-attempts", type=int, help="Attempts per ISIN before giving up."
+        )
+        parser.add_argument(
+            "--api-url-template",
+            default=CDCPService.API_URL_TEMPLATE,
+            help="CDCP endpoint with {} for the ISIN, e.g. a local CDCP stub.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["enqueue"]:
+            run: ReconciliationRun = enqueue_run()
+            self.stdout.write(f"Queued run {run.pk} with {run.tasks.count()} ISINs.")
+        elif options["run"] is not None:
+            try:
+                run = ReconciliationRun.objects.get(pk=options["run"])
+            except ReconciliationRun.DoesNotExist:
+                raise CommandError(
+                    f"Reconciliation run {options['run']} does not exist."
+                )
+        else:
+            run = (
+                ReconciliationRun.objects.exclude(status=ReconciliationRun.COMPLETED)
+                .order_by("-pk")
+                .first()
+            )
+            if run is None:
+                raise CommandError(
+                    "No unfinished reconciliation run; start one with --enqueue."
+                )
+
+        client: CDCPClient | None = None
+        if options["api_url_template"] != CDCPService.API_URL_TEMPLATE:
+            client = CDCPClient.from_settings()
+        reconciler: CDCPReconciler = CDCPReconciler(
+            run,
+            client=client,
+            url_template=options["api_url_template"],
+            rate=options["rate"],
+            batch_size=options["batch_size"],
+            max_attempts=options["max_attempts"],
+        )
+        try:
+            progress: ReconciliationProgress = reconciler.process(
+                limit=options["limit"]
+            )
+        finally:
+            if client is not None:
+                client.close()
+
+        message: str = (
+            f"Run {run.pk}: checked {progress.checked} ISINs, recorded "
+            f"{progress.diffs} differences, {progress.remaining} remaining, "
+            f"{progress.failed} failed."
+        )
+        if progress.interrupted:
+            raise CommandError(f"{message} Stopped because the CDCP circuit is open.")
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,52 @@
+import os
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from bonds.services.valuation_history import backfill
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Writes daily portfolio valuation snapshots of all owners, today's by "
+        "default. --from/--to backfill a date range on --workers threads; "
+        "existing snapshots of those days are replaced."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--from",
+            dest="start",
+            type=date.fromisoformat,
+            help="First day (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--to", dest="end", type=date.fromisoformat, help="Last day (YYYY-MM-DD)."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=min(4, os.cpu_count() or 1),
+            help="Threads processing chunks of the range in parallel.",
+        )
+        parser.add_argument(
+            "--chunk-days",
+            type=int,
+            default=30,
+            help="Days per chunk handed to a worker.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        end: date = options["end"] or options["start"] or date.today()
+        start: date = options["start"] or end
+        if start > end:
+            raise CommandError("--from must not be after --to.")
+        if options["workers"] < 1 or options["chunk_days"] < 1:
+            raise CommandError("--workers and --chunk-days must be positive.")
+
+        written: int = backfill(
+            start, end, workers=options["workers"], chunk_days=options["chunk_days"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {written} portfolio snapshots for {start} to {end}."
+            )
+        )
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bonds", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bond_count", models.PositiveIntegerField(default=0)),
+                (
+                    "total_value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "interest_rate_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "weighted_rate_sum",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=30),
+                ),
+                (
+                    "weighted_maturity_sum",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=40),
+                ),
+                ("nearest_maturity_date", models.DateField(blank=True, null=True)),
+                (
+                    "nearest_bond",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="bonds.bond",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="portfolio_summary",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
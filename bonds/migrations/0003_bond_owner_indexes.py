@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bonds", "0002_portfolio_summary"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bond",
+            index=models.Index(
+                fields=["owner", "maturity_date", "id"],
+                include=("tval", "interest_rate"),
+                name="bond_owner_maturity_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="bond",
+            index=models.Index(fields=["owner", "cval"], name="bond_owner_cval_idx"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:19
+
+import bonds.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bonds", "0003_bond_owner_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="portfoliosummary",
+            name="version",
+            field=models.PositiveBigIntegerField(
+                default=bonds.models.initial_summary_version
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bonds", "0004_portfolio_summary_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CDCPRegistryEntry",
+            fields=[
+                (
+                    "cval",
+                    models.CharField(max_length=12, primary_key=True, serialize=False),
+                ),
+                ("record", models.JSONField()),
+                ("checksum", models.CharField(max_length=32)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "CDCP registry entries",
+            },
+        ),
+    ]
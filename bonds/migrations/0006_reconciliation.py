@@ -0,0 +1,137 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bonds", "0005_cdcp_registry_entry"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReconciliationDiff",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("cval", models.CharField(max_length=12)),
+                ("field", models.CharField(max_length=50)),
+                ("stored_value", models.TextField(blank=True)),
+                ("cdcp_value", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ReconciliationRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ReconciliationTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("cval", models.CharField(max_length=12)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="bond",
+            index=models.Index(fields=["cval"], name="bond_cval_idx"),
+        ),
+        migrations.AddField(
+            model_name="reconciliationdiff",
+            name="bond",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="bonds.bond",
+            ),
+        ),
+        migrations.AddField(
+            model_name="reconciliationdiff",
+            name="run",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="diffs",
+                to="bonds.reconciliationrun",
+            ),
+        ),
+        migrations.AddField(
+            model_name="reconciliationtask",
+            name="run",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to="bonds.reconciliationrun",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reconciliationtask",
+            index=models.Index(
+                fields=["run", "status", "id"], name="reconciliation_claim_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="reconciliationtask",
+            constraint=models.UniqueConstraint(
+                fields=("run", "cval"), name="reconciliation_task_run_cval_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bonds", "0006_reconciliation"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioValuationSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("valuation_date", models.DateField()),
+                ("bond_count", models.PositiveIntegerField()),
+                ("total_value", models.DecimalField(decimal_places=2, max_digits=20)),
+                (
+                    "interest_rate_sum",
+                    models.DecimalField(decimal_places=2, max_digits=20),
+                ),
+                ("future_value", models.DecimalField(decimal_places=4, max_digits=24)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["valuation_date"], name="valuation_snapshot_date_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("owner", "valuation_date"),
+                        name="valuation_snapshot_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
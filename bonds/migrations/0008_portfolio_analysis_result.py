@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bonds", "0007_portfolio_valuation_snapshot"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PortfolioAnalysisResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("valuation_date", models.DateField()),
+                ("bond_count", models.PositiveIntegerField()),
+                (
+                    "average_interest_rate",
+                    models.DecimalField(decimal_places=6, max_digits=12),
+                ),
+                ("nearest_maturity_bond", models.CharField(max_length=255)),
+                ("total_value", models.DecimalField(decimal_places=2, max_digits=20)),
+                ("future_value", models.DecimalField(decimal_places=4, max_digits=24)),
+                ("computed_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("valuation_date", "owner"), name="analysis_result_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,24 +1,41 @@
+import logging
 from datetime import date
 from decimal import Decimal
-import re
-from django.db import models
+from typing import Iterable, NamedTuple
+import secrets
+from django.db import models, transaction
+from django.db.models import Count, DecimalField, F, Q, Sum
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
-from bond_service_demonstrator.logger import logger
+from .expressions import DaysUntil
+from .isin import isin_error
+from .response_cache import response_cache
 from .services.cdcp_service import CDCPService
 
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Reference date for the maturity-weighted sums kept in PortfolioSummary
+SUMMARY_EPOCH: date = date(1970, 1, 1)
+
+
+def initial_summary_version() -> int:
+    """
+    Random starting point of a PortfolioSummary version, so a summary that is
+    recreated after a rollback or a database reset does not reuse the
+    versions, and so the cached responses, of an earlier one.
+    """
+    return secrets.randbits(48)
+
 
 def validate_cval_format(value: str) -> None:
     """
-    Validates the ISIN (cval) field to ensure it has the correct length and format.
+    Validates the ISIN (cval) field to ensure it has the correct length, format
+    and check digit.
     """
-    logger.debug(f"Validating ISIN value: {value}")
-    pattern = r"^(?P<country_code>[A-Z]{2})(?P<identifier>[0-9]{10})$"
-    if len(value) != 12 or not re.match(pattern, value):
-        logger.error(f"Invalid ISIN format for value: {value}")
-        raise ValidationError(
-            "Invalid ISIN format. ISIN must be 12 characters long, start with 2 letters, and followed by 10 digits."
-        )
+    error: str | None = isin_error(value)
+    if error is not None:
+        logger.error("Invalid ISIN %s: %s", value, error)
+        raise ValidationError(error)
     return None
 
 
@@ -62,11 +79,480 @@ class Bond(models.Model):
     interest_frequency = models.CharField(max_length=50)
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes: list[models.Index] = [
+            # Owner-scoped listing in (maturity_date, id) order and the nearest
+            # bond lookup; covers the analysis columns on PostgreSQL
+            models.Index(
+                fields=["owner", "maturity_date", "id"],
+                name="bond_owner_maturity_idx",
+                include=["tval", "interest_rate"],
+            ),
+            # Owner-scoped lookups by ISIN
+            models.Index(fields=["owner", "cval"], name="bond_owner_cval_idx"),
+            # All bonds with an ISIN, for CDCP reconciliation
+            models.Index(fields=["cval"], name="bond_cval_idx"),
+        ]
+
     def __str__(self) -> str:
         """Return the ISIN of the bond."""
         return self.ison
 
-    def save(self, *args, **kwargs):
-        """Override the save method to validate the ISIN field."""
-        self.full_clean()
-        super().save(*args, **kwargs)
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "Bond":
+        """Remember the loaded position so later writes can update the summary."""
+        instance: Bond = super().from_db(db, field_names, values)
+        instance._loaded_cval = instance.__dict__.get("cval")
+        instance._loaded_position = (
+            instance.position()
+            if not instance.get_deferred_fields() & set(BondPosition._fields)
+            else None
+        )
+        return instance
+
+    def position(self) -> "BondPosition":
+        """Returns the values of this bond that feed its owner's PortfolioSummary."""
+        return BondPosition(
+            self.pk, self.owner_id, self.tval, self.interest_rate, self.maturity_date
+        )
+
+    def stored_position(self) -> "BondPosition | None":
+        """Reads the position currently stored for this bond, if it exists."""
+        row: tuple | None = (
+            Bond.objects.filter(pk=self.pk).values_list(*BondPosition._fields).first()
+        )
+        return BondPosition(*row) if row is not None else None
+
+    def save(self, *args, validate: bool = True, **kwargs):
+        """
+        Validates the bond and saves it, keeping the owner's summary current.
+        The CDCP check of ``cval`` is skipped when it has not changed since the
+        bond was loaded. Callers that have already validated the data, such as
+        the serializers, pass ``validate=False``.
+        """
+        if validate:
+            self.full_clean(
+                exclude=(
+                    ["cval"]
+                    if self.cval == getattr(self, "_loaded_cval", None)
+                    else None
+                )
+            )
+        adding: bool = self._state.adding
+        old: BondPosition | None = getattr(self, "_loaded_position", None)
+        with transaction.atomic(savepoint=False):
+            if old is None and not adding:
+                # Loaded with deferred summary fields: read the stored position
+                old = self.stored_position()
+            super().save(*args, **kwargs)
+            new: BondPosition = self.position()
+            if old is None:
+                PortfolioSummary.objects.record_change(new.owner_id, added=[new])
+            elif old.owner_id != new.owner_id:
+                PortfolioSummary.objects.record_change(old.owner_id, removed=[old])
+                PortfolioSummary.objects.record_change(new.owner_id, added=[new])
+            elif old != new:
+                PortfolioSummary.objects.record_change(
+                    new.owner_id, added=[new], removed=[old]
+                )
+            else:
+                PortfolioSummary.objects.touch(new.owner_id)
+        self._loaded_position = new
+        self._loaded_cval = self.cval
+
+    def delete(self, *args, **kwargs):
+        """Override the delete method to keep the owner's summary up to date."""
+        position: BondPosition = (
+            getattr(self, "_loaded_position", None) or self.position()
+        )
+        with transaction.atomic(savepoint=False):
+            result: tuple[int, dict[str, int]] = super().delete(*args, **kwargs)
+            PortfolioSummary.objects.record_change(
+                position.owner_id, removed=[position]
+            )
+        self._loaded_position = None
+        return result
+
+
+class BondPosition(NamedTuple):
+    """The values of a single bond that contribute to a PortfolioSummary."""
+
+    pk: int | None
+    owner_id: int
+    tval: Decimal
+    interest_rate: Decimal
+    maturity_date: date
+
+
+class PortfolioSummaryManager(models.Manager):
+    """Keeps PortfolioSummary rows in step with the Bond table."""
+
+    def record_change(
+        self,
+        owner_id: int,
+        added: Iterable[BondPosition] = (),
+        removed: Iterable[BondPosition] = (),
+    ) -> None:
+        """
+        Applies added and removed bonds to the owner's summary with a constant
+        number of queries and bumps its version. A summary that does not exist
+        yet is built from the Bond table instead.
+        """
+        added, removed = list(added), list(removed)
+        deltas: dict[str, Decimal | int] = {
+            "bond_count": len(added) - len(removed),
+            "total_value": Decimal(0),
+            "interest_rate_sum": Decimal(0),
+            "weighted_rate_sum": Decimal(0),
+            "weighted_maturity_sum": Decimal(0),
+        }
+        for sign, positions in ((1, added), (-1, removed)):
+            for position in positions:
+                weighted_rate: Decimal = position.tval * position.interest_rate
+                deltas["total_value"] += sign * position.tval
+                deltas["interest_rate_sum"] += sign * position.interest_rate
+                deltas["weighted_rate_sum"] += sign * weighted_rate
+                deltas["weighted_maturity_sum"] += (
+                    sign
+                    * weighted_rate
+                    * Decimal((position.maturity_date - SUMMARY_EPOCH).days)
+                )
+
+        # Bonds whose maturity did not change cannot affect the nearest bond
+        unchanged: set[tuple[int | None, date]] = {
+            (position.pk, position.maturity_date) for position in added
+        } & {(position.pk, position.maturity_date) for position in removed}
+        removed_pks: list[int] = [
+            position.pk
+            for position in removed
+            if (position.pk, position.maturity_date) not in unchanged
+        ]
+        candidates: list[BondPosition] = [
+            position
+            for position in added
+            if (position.pk, position.maturity_date) not in unchanged
+        ]
+
+        with transaction.atomic(savepoint=False):
+            updated: int = self.filter(owner_id=owner_id).update(
+                version=F("version") + 1,
+                **{field: F(field) + delta for field, delta in deltas.items()},
+            )
+            if not updated:
+                self.rebuild(owner_id)
+                return
+            self.invalidate_responses(owner_id)
+
+            if (
+                removed_pks
+                and self.filter(
+                    Q(nearest_bond_id__in=removed_pks)
+                    | Q(nearest_bond__isnull=True, bond_count__gt=0),
+                    owner_id=owner_id,
+                ).exists()
+            ):
+                self.refresh_nearest(owner_id)
+            elif candidates:
+                candidate: BondPosition = min(
+                    candidates,
+                    key=lambda position: (position.maturity_date, position.pk),
+                )
+                self.filter(
+                    Q(nearest_maturity_date__isnull=True)
+                    | Q(nearest_maturity_date__gt=candidate.maturity_date)
+                    | Q(
+                        nearest_maturity_date=candidate.maturity_date,
+                        nearest_bond_id__gt=candidate.pk,
+                    ),
+                    owner_id=owner_id,
+                ).update(
+                    nearest_bond_id=candidate.pk,
+                    nearest_maturity_date=candidate.maturity_date,
+                )
+
+    def computed_totals(self, owner_id: int) -> dict[str, Decimal | int | None]:
+        """Computes the summary values for one owner from the Bond table."""
+        bonds: models.QuerySet[Bond] = Bond.objects.filter(owner_id=owner_id)
+        totals: dict = bonds.aggregate(**self.totals_expressions())
+        nearest: tuple[int, date] | None = (
+            bonds.order_by("maturity_date", "pk")
+            .values_list("pk", "maturity_date")
+            .first()
+        )
+        totals = {
+            field: value if value is not None else Decimal(0)
+            for field, value in totals.items()
+        }
+        totals["nearest_bond_id"], totals["nearest_maturity_date"] = nearest or (
+            None,
+            None,
+        )
+        return totals
+
+    @staticmethod
+    def totals_expressions() -> dict[str, models.Aggregate]:
+        """Aggregates that compute the summary sums over a Bond queryset."""
+        weighted_rate: F = F("tval") * F("interest_rate")
+        return {
+            "bond_count": Count("pk"),
+            "total_value": Sum("tval"),
+            "interest_rate_sum": Sum("interest_rate"),
+            "weighted_rate_sum": Sum(weighted_rate, output_field=DecimalField()),
+            "weighted_maturity_sum": Sum(
+                weighted_rate * DaysUntil(F("maturity_date"), SUMMARY_EPOCH),
+                output_field=DecimalField(),
+            ),
+        }
+
+    def touch(self, owner_id: int) -> None:
+        """Bumps the owner's version after a write that left the totals unchanged."""
+        if not self.filter(owner_id=owner_id).update(version=F("version") + 1):
+            self.rebuild(owner_id)
+        else:
+            self.invalidate_responses(owner_id)
+
+    @staticmethod
+    def invalidate_responses(owner_id: int) -> None:
+        """Drops the owner's cached read responses once the version bump commits."""
+        transaction.on_commit(lambda: response_cache.invalidate_owner(owner_id))
+
+    def version_of(self, owner_id: int) -> int:
+        """Returns the owner's version, 0 for owners without a summary."""
+        version: int | None = (
+            self.filter(owner_id=owner_id).values_list("version", flat=True).first()
+        )
+        return version or 0
+
+    def rebuild(self, owner_id: int) -> "PortfolioSummary":
+        """Recomputes one owner's summary from the Bond table and bumps its version."""
+        totals: dict[str, Decimal | int | None] = self.computed_totals(owner_id)
+        summary, created = self.update_or_create(
+            owner_id=owner_id,
+            defaults={**totals, "version": F("version") + 1},
+            create_defaults={**totals, "version": initial_summary_version()},
+        )
+        if not created:
+            summary.refresh_from_db(fields=["version"])
+        self.invalidate_responses(owner_id)
+        return summary
+
+    def refresh_nearest(self, owner_id: int) -> None:
+        """Re-reads the nearest maturing bond of one owner."""
+        nearest: tuple[int, date] | None = (
+            Bond.objects.filter(owner_id=owner_id)
+            .order_by("maturity_date", "pk")
+            .values_list("pk", "maturity_date")
+            .first()
+        )
+        nearest_bond_id, nearest_maturity_date = nearest or (None, None)
+        self.filter(owner_id=owner_id).update(
+            nearest_bond_id=nearest_bond_id,
+            nearest_maturity_date=nearest_maturity_date,
+        )
+
+
+class PortfolioSummary(models.Model):
+    """
+    Running totals of an owner's bonds, maintained incrementally on every bond
+    write so portfolio analysis can be answered from a single row.
+    """
+
+    owner = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="portfolio_summary"
+    )
+    bond_count = models.PositiveIntegerField(default=0)
+    total_value = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    interest_rate_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    # Sum of tval * interest_rate
+    weighted_rate_sum = models.DecimalField(max_digits=30, decimal_places=4, default=0)
+    # Sum of tval * interest_rate * (maturity_date - SUMMARY_EPOCH) in days
+    weighted_maturity_sum = models.DecimalField(
+        max_digits=40, decimal_places=4, default=0
+    )
+    nearest_bond = models.ForeignKey(
+        Bond, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    nearest_maturity_date = models.DateField(null=True, blank=True)
+    # Incremented on every write to the owner's bonds; feeds the ETags and the
+    # response cache keys of the read endpoints
+    version = models.PositiveBigIntegerField(default=initial_summary_version)
+
+    objects: PortfolioSummaryManager = PortfolioSummaryManager()
+
+    def __str__(self) -> str:
+        """Return the owner of the summary."""
+        return f"Portfolio summary of {self.owner}"
+
+    def weighted_days(self, valuation_date: date) -> Decimal:
+        """Sum of ``tval * interest_rate * days_to_maturity`` as of ``valuation_date``."""
+        return self.weighted_maturity_sum - self.weighted_rate_sum * Decimal(
+            (valuation_date - SUMMARY_EPOCH).days
+        )
+
+
+class PortfolioValuationSnapshot(models.Model):
+    """
+    One owner's portfolio valued as of ``valuation_date``: the bonds held on
+    that day, i.e. purchased on or before it and maturing on or after it.
+    Rows are written per day for all owners at once by ``snapshot_portfolios``.
+    """
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    valuation_date = models.DateField()
+    bond_count = models.PositiveIntegerField()
+    total_value = models.DecimalField(max_digits=20, decimal_places=2)
+    interest_rate_sum = models.DecimalField(max_digits=20, decimal_places=2)
+    future_value = models.DecimalField(max_digits=24, decimal_places=4)
+
+    class Meta:
+        constraints: list[models.UniqueConstraint] = [
+            # Also serves the owner-scoped date range reads of the history API
+            models.UniqueConstraint(
+                fields=["owner", "valuation_date"], name="valuation_snapshot_uniq"
+            )
+        ]
+        indexes: list[models.Index] = [
+            # Replacing all snapshots of one day
+            models.Index(fields=["valuation_date"], name="valuation_snapshot_date_idx")
+        ]
+
+    def __str__(self) -> str:
+        """Return the owner and date of the snapshot."""
+        return f"Portfolio of {self.owner_id} on {self.valuation_date}"
+
+
+class PortfolioAnalysisResult(models.Model):
+    """
+    Portfolio metrics of one owner as of ``valuation_date``, written in bulk by
+    the ``analyze_portfolios`` batch command.
+    """
+
+    valuation_date = models.DateField()
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    bond_count = models.PositiveIntegerField()
+    average_interest_rate = models.DecimalField(max_digits=12, decimal_places=6)
+    nearest_maturity_bond = models.CharField(max_length=255)
+    total_value = models.DecimalField(max_digits=20, decimal_places=2)
+    future_value = models.DecimalField(max_digits=24, decimal_places=4)
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints: list[models.UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["valuation_date", "owner"], name="analysis_result_uniq"
+            )
+        ]
+
+    def __str__(self) -> str:
+        """Return the owner and date of the result."""
+        return f"Analysis of {self.owner_id} on {self.valuation_date}"
+
+
+class CDCPRegistryEntry(models.Model):
+    """
+    A CDCP ISIN record loaded from a registry dump by ``load_cdcp_registry``,
+    so ISINs can be validated with a primary key lookup instead of a CDCP
+    API call.
+    """
+
+    cval = models.CharField(max_length=12, primary_key=True)
+    # The record as served in ``vydaneisiny`` by the CDCP API
+    record = models.JSONField()
+    # Digest of ``record``; lets a refresh find changed rows without reading them
+    checksum = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural: str = "CDCP registry entries"
+
+    def __str__(self) -> str:
+        """Return the ISIN of the entry."""
+        return self.cval
+
+
+class ReconciliationRun(models.Model):
+    """One pass of re-validating every stored bond against CDCP."""
+
+    PENDING: str = "pending"
+    RUNNING: str = "running"
+    COMPLETED: str = "completed"
+    STATUS_CHOICES: list[tuple[str, str]] = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (COMPLETED, "Completed"),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """Return the run number and status."""
+        return f"Reconciliation run {self.pk} ({self.status})"
+
+
+class ReconciliationTask(models.Model):
+    """
+    A queued CDCP check of one ISIN within a run. Tasks are unique per run and
+    ISIN, so bonds sharing an ISIN cost one CDCP call. The status of each task
+    is the run's checkpoint: a restarted worker picks up pending tasks and
+    running tasks whose lease has expired.
+    """
+
+    PENDING: str = "pending"
+    RUNNING: str = "running"
+    DONE: str = "done"
+    FAILED: str = "failed"
+    STATUS_CHOICES: list[tuple[str, str]] = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    run = models.ForeignKey(
+        ReconciliationRun, on_delete=models.CASCADE, related_name="tasks"
+    )
+    cval = models.CharField(max_length=12)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        constraints: list[models.UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["run", "cval"], name="reconciliation_task_run_cval_uniq"
+            )
+        ]
+        indexes: list[models.Index] = [
+            # Claiming the next batch of a run
+            models.Index(
+                fields=["run", "status", "id"], name="reconciliation_claim_idx"
+            )
+        ]
+
+    def __str__(self) -> str:
+        """Return the ISIN and status of the task."""
+        return f"{self.cval} ({self.status})"
+
+
+class ReconciliationDiff(models.Model):
+    """A field of a stored bond that differs from the current CDCP record."""
+
+    # Field name recorded when CDCP no longer lists the ISIN
+    MISSING_FIELD: str = "cval"
+
+    run = models.ForeignKey(
+        ReconciliationRun, on_delete=models.CASCADE, related_name="diffs"
+    )
+    bond = models.ForeignKey(Bond, on_delete=models.CASCADE, related_name="+")
+    cval = models.CharField(max_length=12)
+    field = models.CharField(max_length=50)
+    stored_value = models.TextField(blank=True)
+    cdcp_value = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        """Return the ISIN and field of the difference."""
+        return f"{self.cval}.{self.field}"
@@ -0,0 +1,101 @@
+import base64
+import binascii
+import json
+from datetime import date
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from .models import Bond
+
+
+class BondKeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over ``(maturity_date, id)``.
+
+    The cursor encodes the sort key of the last row of a page, so every page is
+    read with an index range scan no matter how deep the client has paged.
+    Pagination is opt-in: without ``cursor`` or ``page_size`` in the query
+    string the list is returned unpaginated.
+    """
+
+    cursor_query_param: str = "cursor"
+    page_size_query_param: str = "page_size"
+    invalid_cursor_message: str = "Invalid cursor"
+
+    def __init__(self) -> None:
+        config: dict = getattr(settings, "BOND_LIST", {})
+        self.page_size: int = config.get("PAGE_SIZE", 100)
+        self.max_page_size: int = config.get("MAX_PAGE_SIZE", 1000)
+        self.next_url: str | None = None
+
+    def paginate_queryset(
+        self, queryset: QuerySet[Bond], request: Request, view=None
+    ) -> list[Bond] | None:
+        """Returns one page of ``queryset``, or None if the client did not ask for paging."""
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+
+        page_size: int = self.get_page_size(request)
+        queryset = queryset.order_by("maturity_date", "id")
+        cursor: str | None = params.get(self.cursor_query_param)
+        if cursor:
+            maturity_date, last_id = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(maturity_date__gt=maturity_date)
+                | Q(maturity_date=maturity_date, id__gt=last_id)
+            )
+
+        page: list[Bond] = list(queryset[: page_size + 1])
+        if len(page) > page_size:
+            page = page[:page_size]
+            self.next_url = replace_query_param(
+                request.build_absolute_uri(),
+                self.cursor_query_param,
+                self.encode_cursor(page[-1]),
+            )
+        return page
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response({"next": self.next_url, "results": data})
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request: Request) -> int:
+        """Reads ``page_size`` from the query string, capped at ``max_page_size``."""
+        try:
+            page_size: int = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    @staticmethod
+    def encode_cursor(bond: Bond) -> str:
+        """Encodes the sort key of ``bond`` as an opaque cursor."""
+        payload: bytes = json.dumps(
+            [bond.maturity_date.isoformat(), bond.pk], separators=(",", ":")
+        ).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor: str) -> tuple[date, int]:
+        """Decodes a cursor produced by ``encode_cursor``."""
+        try:
+            maturity_date, last_id = json.loads(base64.urlsafe_b64decode(cursor))
+            return date.fromisoformat(maturity_date), int(last_id)
+        except (binascii.Error, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
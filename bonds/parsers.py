@@ -0,0 +1,28 @@
+import json
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from django.conf import settings
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON (one JSON document per line) into a list.
+    Blank lines are ignored.
+    """
+
+    media_type: str = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None) -> list:
+        """Reads the request body line by line and decodes each line separately."""
+        parser_context = parser_context or {}
+        encoding: str = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        rows: list = []
+        for line_number, raw_line in enumerate(stream, start=1):
+            line: str = raw_line.decode(encoding).strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                raise ParseError(f"NDJSON parse error on line {line_number}: {e}")
+        return rows
@@ -0,0 +1,52 @@
+from typing import Any
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed. The output is
+    byte-for-byte that of JSONRenderer for data made of strings, integers,
+    booleans, None, lists and dicts, such as BondSerializer rows. Data with
+    values orjson would encode differently, such as Decimals and datetimes,
+    is rendered by JSONRenderer, as is indented output. Floats may be
+    formatted differently, so use it only where the data has none.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            rendered: bytes = orjson.dumps(
+                data,
+                default=self._fallback,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer escapes these separators for JavaScript compatibility
+        return rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+    @staticmethod
+    def _fallback(value: Any) -> Any:
+        # Values JSONEncoder would turn into floats could be formatted
+        # differently by orjson, so they are rendered by JSONRenderer instead
+        raise TypeError(f"{type(value).__name__} is rendered by JSONRenderer")
@@ -0,0 +1,78 @@
+from django.conf import settings
+from rest_framework.response import Response
+from bond_service_demonstrator.cache import TieredCache
+
+
+class ResponseCache(TieredCache):
+    """
+    Short-lived cache of rendered read responses.
+
+    Entries are keyed by the response ETag, which already encodes the
+    owner's portfolio version, the request path and query string and the
+    negotiated media type, within a namespace per owner. A bond write bumps
+    the version, so stale entries are never served, and ``invalidate_owner``
+    drops the owner's namespace once the write commits, so they do not linger
+    in the cache until they expire after ``ttl`` seconds.
+    A ``ttl`` of 0 disables the cache.
+    """
+
+    KEY_PREFIX: str = "bonds:response:"
+
+    def __init__(
+        self,
+        ttl: int = 30,
+        local_ttl: int = 5,
+        max_entries: int = 256,
+        alias: str = "default",
+    ) -> None:
+        super().__init__(
+            self.KEY_PREFIX,
+            ttl=ttl,
+            local_ttl=local_ttl,
+            max_entries=max_entries,
+            alias=alias,
+        )
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        """Builds the cache from the ``BOND_RESPONSE_CACHE`` setting."""
+        config: dict = getattr(settings, "BOND_RESPONSE_CACHE", {})
+        return cls(
+            ttl=config.get("TTL", 30),
+            local_ttl=config.get("LOCAL_TTL", 5),
+            max_entries=config.get("MAX_ENTRIES", 256),
+            alias=config.get("ALIAS", "default"),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, owner_id: int, etag: str) -> tuple[bytes, str] | None:
+        """Returns the cached ``(content, content_type)`` pair, or None on a miss."""
+        if not self.enabled:
+            return None
+        return super().get(etag.strip('"'), namespace=owner_id)
+
+    def store_on_render(self, owner_id: int, etag: str, response: Response) -> None:
+        """Caches the body of ``response`` once DRF has rendered it."""
+        if not self.enabled:
+            return
+
+        def store(rendered: Response) -> None:
+            self.set(
+                etag.strip('"'),
+                (rendered.content, rendered["Content-Type"]),
+                namespace=owner_id,
+            )
+
+        response.add_post_render_callback(store)
+
+    def invalidate_owner(self, owner_id: int) -> None:
+        """Drops every cached response of one owner."""
+        if self.enabled:
+            self.invalidate_namespace(owner_id)
+
+
+# Process-wide instance shared by the read endpoints
+response_cache: ResponseCache = ResponseCache.from_settings()
@@ -1,14 +1,217 @@
+import decimal
 from datetime import date
-from decimal import Decimal
-from django.shortcuts import get_object_or_404
-from rest_framework import serializers
+from functools import cached_property
+from typing import Callable, Iterable
+from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Model, QuerySet
+from rest_framework import ISO_8601, relations, serializers
+from .isin import validate_isin
 from .models import Bond
 from .services.cdcp_service import CDCPService
-from bond_service_demonstrator.logger import logger
 
 
 class BondSerializer(serializers.ModelSerializer):
+    """
+    Validates a bond once and saves it without running ``full_clean`` again.
+    The ISIN is checked against CDCP only when it is new or has changed.
+    """
+
     class Meta:
         model = Bond
         fields: str = "__all__"
         read_only_fields: list[str] = ["owner"]
+        extra_kwargs: dict[str, dict] = {"cval": {"validators": [validate_isin]}}
+
+    def validate_cval(self, value: str) -> str:
+        if self.instance is not None and self.instance.cval == value:
+            return value
+        try:
+            CDCPService().is_cdcp_bond_data_matching(value)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return value
+
+    def create(self, validated_data: dict) -> Bond:
+        bond: Bond = Bond(**validated_data)
+        bond.save(validate=False)
+        return bond
+
+    def update(self, bond: Bond, validated_data: dict) -> Bond:
+        for field, value in validated_data.items():
+            setattr(bond, field, value)
+        bond.save(validate=False)
+        return bond
+
+
+class AsyncBondSerializer(BondSerializer):
+    """
+    Serializer for async views. Field validation does no I/O; the CDCP check
+    of ``cval`` is awaited by ``ais_valid`` instead of blocking in
+    ``validate_cval``.
+    """
+
+    def validate_cval(self, value: str) -> str:
+        return value
+
+    async def ais_valid(self) -> bool:
+        """
+        Runs ``is_valid`` and then awaits the CDCP check of a new ISIN, which
+        is skipped when the payload already failed validation.
+        """
+        self.is_valid()
+        if (
+            self.errors
+            or not isinstance(self.initial_data, dict)
+            or "cval" not in self.initial_data
+        ):
+            return not self.errors
+        cval: str = self.fields["cval"].to_internal_value(self.initial_data["cval"])
+        if self.instance is not None and self.instance.cval == cval:
+            return not self.errors
+        try:
+            await CDCPService().ais_cdcp_bond_data_matching(cval)
+        except DjangoValidationError as e:
+            self._errors = {**self.errors, "cval": e.messages}
+            self._validated_data = {}
+        return not self.errors
+
+
+class BondImportSerializer(BondSerializer):
+    """
+    Serializer for bulk imports. ISINs are not checked here: the importer
+    validates all of them in one batch and resolves each distinct valid ISIN
+    against CDCP once.
+    """
+
+    class Meta(BondSerializer.Meta):
+        extra_kwargs: dict[str, dict] = {"cval": {"validators": []}}
+
+    def validate_cval(self, value: str) -> str:
+        return value
+
+
+def _identity(value: object) -> object:
+    return value
+
+
+def _decimal_converter(field: serializers.DecimalField) -> Callable:
+    """``DecimalField.to_representation`` with its exponent and context built once."""
+    if (
+        not getattr(field, "coerce_to_string", True)
+        or field.localize
+        or field.normalize_output
+    ):
+        return field.to_representation
+    if field.decimal_places is None:
+        return lambda value: f"{value:f}"
+    exponent: decimal.Decimal = decimal.Decimal(".1") ** field.decimal_places
+    context: decimal.Context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding: str | None = field.rounding
+    return lambda value: f"{value.quantize(exponent, rounding, context):f}"
+
+
+def field_converter(field: serializers.Field) -> Callable:
+    """
+    Returns a function mapping a database value to the representation of
+    ``field``; plain values are passed through where DRF would not change them.
+    """
+    field_type: type = type(field)
+    if field_type in (serializers.CharField, serializers.IntegerField):
+        return _identity
+    if field_type is serializers.DecimalField:
+        return _decimal_converter(field)
+    if field_type is serializers.DateField:
+        if getattr(field, "format", ISO_8601) == ISO_8601:
+            return date.isoformat
+        return field.to_representation
+    if field_type is relations.PrimaryKeyRelatedField and field.pk_field is None:
+        return _identity
+    if isinstance(field, (relations.RelatedField, serializers.SerializerMethodField)):
+        raise ImproperlyConfigured(
+            f"{field_type.__name__} {field.field_name!r} has no fast representation."
+        )
+    return field.to_representation
+
+
+class FastRowSerializer:
+    """
+    Read-only counterpart of a ModelSerializer that builds the same
+    representation straight from ``values_list`` tuples or model attributes.
+    Each field gets a converter compiled once from its serializer field, so
+    rows skip DRF's per-field attribute lookup and ``to_representation``
+    dispatch. Only fields backed by a single model column are supported.
+    """
+
+    def __init__(self, serializer_class: type[serializers.ModelSerializer]) -> None:
+        self.serializer_class: type[serializers.ModelSerializer] = serializer_class
+
+    @cached_property
+    def _compiled(self) -> tuple[tuple[str, ...], tuple[str, ...], tuple]:
+        """
+        Output names and model attribute names of the readable fields, and
+        ``(position, converter)`` of those whose values need converting.
+        """
+        model: type[Model] = self.serializer_class.Meta.model
+        names: list[str] = []
+        attnames: list[str] = []
+        conversions: list[tuple[int, Callable]] = []
+        for field in self.serializer_class().fields.values():
+            if field.write_only:
+                continue
+            if field.source == "*" or "." in field.source:
+                raise ImproperlyConfigured(
+                    f"Field {field.field_name!r} is not backed by a model column."
+                )
+            converter: Callable = field_converter(field)
+            if converter is not _identity:
+                conversions.append((len(names), converter))
+            names.append(field.field_name)
+            attnames.append(model._meta.get_field(field.source).attname)
+        return tuple(names), tuple(attnames), tuple(conversions)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Model columns to pass to ``values_list`` for ``from_values``."""
+        return self._compiled[1]
+
+    def from_values(self, row: tuple) -> dict:
+        """Represents one ``values_list(*columns)`` tuple."""
+        names, _, conversions = self._compiled
+        values: list = list(row)
+        for position, convert in conversions:
+            value = values[position]
+            if value is not None:
+                values[position] = convert(value)
+        return dict(zip(names, values))
+
+    def from_instance(self, instance: Model) -> dict:
+        """Represents one model instance."""
+        _, attnames, _ = self._compiled
+        return self.from_values(tuple(getattr(instance, name) for name in attnames))
+
+    def rows(self, queryset: QuerySet, chunk_size: int | None = None) -> Iterable[dict]:
+        """
+        Represents every row of ``queryset``; with ``chunk_size`` the rows are
+        streamed through a database cursor instead of fetched at once.
+        """
+        values: QuerySet = queryset.values_list(*self.columns)
+        if chunk_size is not None:
+            return map(self.from_values, values.iterator(chunk_size=chunk_size))
+        return [self.from_values(row) for row in values]
+
+    async def arows(self, queryset: QuerySet, chunk_size: int = 2000) -> list[dict]:
+        """Asynchronous variant of ``rows`` reading chunks with ``aiterator``."""
+        # Named rows: plain values_list() runs its query as soon as the
+        # iterator is created, which aiterator() does on the event loop
+        values: QuerySet = queryset.values_list(*self.columns, named=True)
+        return [
+            self.from_values(row)
+            async for row in values.aiterator(chunk_size=chunk_size)
+        ]
+
+
+# Fast read path of BondSerializer for list responses
+bond_rows: FastRowSerializer = FastRowSerializer(BondSerializer)
@@ -0,0 +1,231 @@
+"""
+Columnar, vectorized portfolio analytics.
+
+Bonds are loaded once as NumPy arrays (tval, interest_rate, purchase and
+maturity dates, owner and id). Metrics are then computed for a whole
+portfolio, or for every portfolio at once, with array operations instead of
+one Decimal calculation per bond.
+
+Precision
+---------
+The engine works in IEEE 754 double precision (unit roundoff
+``u = 2**-53 ≈ 1.1e-16``). Converting tval and interest_rate to floats and
+computing one future value costs at most about ``8u`` relative error per
+bond. ``np.sum`` uses pairwise summation, so for a portfolio of ``n`` bonds
+
+    |future_value_sum - Decimal path| <= (8 + ceil(log2(n))) * u * sum(|FV_i|)
+
+For 10 million positions this is below ``4e-15`` of the portfolio value,
+which is far below a cent for any realistic portfolio. Per-owner totals from
+``by_owner`` are accumulated sequentially with ``np.bincount``. The
+``log2(n)`` term then becomes the number of bonds of that owner.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+import numpy as np
+from django.db.models import QuerySet
+from ..models import Bond
+
+DAYS_PER_YEAR: float = 365.0
+
+# Columns read from the database, in the order of ``values_list``
+COLUMNS: tuple[str, ...] = (
+    "id",
+    "owner_id",
+    "tval",
+    "interest_rate",
+    "purchase_date",
+    "maturity_date",
+)
+
+
+@dataclass(frozen=True)
+class PortfolioColumns:
+    """Bond data of one or more portfolios stored as parallel arrays."""
+
+    ids: np.ndarray
+    owner_ids: np.ndarray
+    tval: np.ndarray
+    interest_rate: np.ndarray
+    purchase_date: np.ndarray
+    maturity_date: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "PortfolioColumns":
+        """Builds the arrays from ``(id, owner_id, tval, rate, purchase, maturity)`` tuples."""
+        columns: list[tuple] = list(zip(*rows)) or [()] * len(COLUMNS)
+        return cls(
+            ids=np.array(columns[0], dtype=np.int64),
+            owner_ids=np.array(columns[1], dtype=np.int64),
+            tval=np.array(columns[2], dtype=np.float64),
+            interest_rate=np.array(columns[3], dtype=np.float64),
+            purchase_date=np.array(columns[4], dtype="datetime64[D]"),
+            maturity_date=np.array(columns[5], dtype="datetime64[D]"),
+        )
+
+    @classmethod
+    def from_queryset(
+        cls, bonds: QuerySet[Bond], chunk_size: int = 10000
+    ) -> "PortfolioColumns":
+        """Loads the arrays from a queryset, streaming rows without building models."""
+        return cls.concatenate(
+            cls.from_rows(chunk)
+            for chunk in _chunked(
+                bonds.values_list(*COLUMNS).iterator(chunk_size=chunk_size),
+                chunk_size,
+            )
+        )
+
+    @classmethod
+    def from_bonds(cls, bonds: Iterable[Bond]) -> "PortfolioColumns":
+        """Builds the arrays from already loaded Bond instances."""
+        return cls.from_rows(
+            (
+                bond.pk,
+                bond.owner_id,
+                bond.tval,
+                bond.interest_rate,
+                bond.purchase_date,
+                bond.maturity_date,
+            )
+            for bond in bonds
+        )
+
+    @classmethod
+    def concatenate(cls, parts: Iterable["PortfolioColumns"]) -> "PortfolioColumns":
+        """Joins several column sets into one."""
+        parts = list(parts)
+        if not parts:
+            return cls.from_rows(())
+        return cls(
+            **{
+                field: np.concatenate([getattr(part, field) for part in parts])
+                for field in cls.__dataclass_fields__
+            }
+        )
+
+
+class VectorizedPortfolioEngine:
+    """
+    Computes portfolio metrics over ``PortfolioColumns`` as of ``valuation_date``
+    (today by default). ``rate_shift`` adds percentage points to every
+    interest rate for what-if scenarios.
+    """
+
+    def __init__(
+        self,
+        columns: PortfolioColumns,
+        valuation_date: date | None = None,
+        rate_shift: float = 0.0,
+    ) -> None:
+        self.columns: PortfolioColumns = columns
+        self.valuation_date: date = valuation_date or date.today()
+        self.rate_shift: float = rate_shift
+        self._valuation_day: np.datetime64 = np.datetime64(self.valuation_date, "D")
+
+    @property
+    def rates(self) -> np.ndarray:
+        """Interest rates as fractions, including the scenario shift."""
+        return (self.columns.interest_rate + self.rate_shift) / 100.0
+
+    def days_to_maturity(self) -> np.ndarray:
+        """Signed days from the valuation date to maturity of every bond."""
+        return (self.columns.maturity_date - self._valuation_day).astype(np.int64)
+
+    def future_values(self) -> np.ndarray:
+        """Future value of every bond, using the same formula as the Decimal path."""
+        return self.columns.tval * (
+            1.0 + self.rates * (self.days_to_maturity() / DAYS_PER_YEAR)
+        )
+
+    def accrued_interest(self) -> np.ndarray:
+        """Simple interest accrued from purchase to the valuation date, capped at maturity."""
+        held_days: np.ndarray = np.clip(
+            (self._valuation_day - self.columns.purchase_date).astype(np.int64),
+            0,
+            (self.columns.maturity_date - self.columns.purchase_date).astype(np.int64),
+        )
+        return self.columns.tval * self.rates * (held_days / DAYS_PER_YEAR)
+
+    def durations(self) -> np.ndarray:
+        """
+        Macaulay duration in years. Each bond pays once at maturity, so this is
+        the remaining time to maturity (zero for matured bonds).
+        """
+        return np.maximum(self.days_to_maturity(), 0) / DAYS_PER_YEAR
+
+    def summary(self) -> dict[str, float | int]:
+        """Metrics of all loaded bonds taken as a single portfolio."""
+        tval: np.ndarray = self.columns.tval
+        count: int = len(tval)
+        total_value: float = float(np.sum(tval))
+        return {
+            "bond_count": count,
+            "total_value": total_value,
+            "average_interest_rate": (
+                float(np.mean(self.columns.interest_rate)) if count else 0.0
+            ),
+            "future_value": float(np.sum(self.future_values())),
+            "accrued_interest": float(np.sum(self.accrued_interest())),
+            "duration": (
+                float(np.sum(tval * self.durations()) / total_value)
+                if total_value
+                else 0.0
+            ),
+        }
+
+    def by_owner(self) -> dict[int, dict[str, float | int]]:
+        """Metrics of every owner's portfolio, computed in one pass over the arrays."""
+        owners, index = np.unique(self.columns.owner_ids, return_inverse=True)
+        tval: np.ndarray = self.columns.tval
+        counts: np.ndarray = np.bincount(index, minlength=len(owners))
+        totals: np.ndarray = np.bincount(index, tval, minlength=len(owners))
+        rate_sums: np.ndarray = np.bincount(
+            index, self.columns.interest_rate, minlength=len(owners)
+        )
+        future_values: np.ndarray = np.bincount(
+            index, self.future_values(), minlength=len(owners)
+        )
+        accrued: np.ndarray = np.bincount(
+            index, self.accrued_interest(), minlength=len(owners)
+        )
+        weighted_durations: np.ndarray = np.bincount(
+            index, tval * self.durations(), minlength=len(owners)
+        )
+        return {
+            int(owner): {
+                "bond_count": int(counts[i]),
+                "total_value": float(totals[i]),
+                "average_interest_rate": float(rate_sums[i] / counts[i]),
+                "future_value": float(future_values[i]),
+                "accrued_interest": float(accrued[i]),
+                "duration": (
+                    float(weighted_durations[i] / totals[i]) if totals[i] else 0.0
+                ),
+            }
+            for i, owner in enumerate(owners)
+        }
+
+    def nearest_bond_id(self) -> int | None:
+        """Id of the bond with the nearest maturity (lowest id on ties)."""
+        if not len(self.columns):
+            return None
+        order: np.ndarray = np.lexsort((self.columns.ids, self.columns.maturity_date))
+        return int(self.columns.ids[order[0]])
+
+
+def _chunked(rows: Iterable[tuple], size: int) -> Iterable[list[tuple]]:
+    """Groups an iterable of rows into lists of at most ``size`` rows."""
+    chunk: list[tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
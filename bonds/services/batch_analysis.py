@@ -0,0 +1,268 @@
+import csv
+import logging
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+import django
+from django.db import transaction
+from ..models import Bond, PortfolioAnalysisResult
+from .portfolio_analysis import PortfolioAnalysisService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Bond columns streamed to the workers, in the order of ``values_list``
+ROW_COLUMNS: tuple[str, ...] = (
+    "owner_id",
+    "ison",
+    "tval",
+    "interest_rate",
+    "maturity_date",
+)
+
+# Result columns, in the order they are exported
+RESULT_COLUMNS: tuple[str, ...] = (
+    "owner_id",
+    "bond_count",
+    "average_interest_rate",
+    "nearest_maturity_bond",
+    "total_value",
+    "future_value",
+)
+
+OwnerRows = tuple[int, list[tuple]]
+
+
+def analyze_owner_rows(
+    owner_id: int, rows: list[tuple], valuation_date: date
+) -> dict[str, int | str | Decimal]:
+    """
+    Computes the four portfolio metrics of one owner with the same Decimal
+    arithmetic as ``PortfolioAnalysisService``. ``rows`` are ordered by
+    maturity, so the first one is the nearest maturing bond.
+    """
+    total_value: Decimal = Decimal(0)
+    interest_rate_sum: Decimal = Decimal(0)
+    future_value: Decimal = Decimal(0)
+    for _, _, tval, interest_rate, maturity_date in rows:
+        total_value += tval
+        interest_rate_sum += interest_rate
+        future_value += PortfolioAnalysisService.future_value(
+            tval, interest_rate, maturity_date, valuation_date
+        )
+    return {
+        "owner_id": owner_id,
+        "bond_count": len(rows),
+        "average_interest_rate": interest_rate_sum / Decimal(len(rows)),
+        "nearest_maturity_bond": rows[0][1],
+        "total_value": total_value,
+        "future_value": future_value,
+    }
+
+
+def analyze_chunk(chunk: list[OwnerRows], valuation_date: date) -> list[dict]:
+    """Analyzes a chunk of owners; runs in a worker process."""
+    return [
+        analyze_owner_rows(owner_id, rows, valuation_date) for owner_id, rows in chunk
+    ]
+
+
+def owner_chunks(
+    rows: Iterable[tuple], owners_per_chunk: int, skip: set[int] = frozenset()
+) -> Iterator[list[OwnerRows]]:
+    """Groups rows ordered by owner into chunks of whole portfolios."""
+    chunk: list[OwnerRows] = []
+    for owner_id, owner_rows in groupby(rows, key=itemgetter(0)):
+        if owner_id in skip:
+            continue
+        chunk.append((owner_id, list(owner_rows)))
+        if len(chunk) >= owners_per_chunk:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class BatchProgress:
+    """Progress of an ``analyze_portfolios`` run."""
+
+    total_owners: int = 0
+    skipped_owners: int = 0
+    analyzed_owners: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def done(self) -> int:
+        return self.skipped_owners + self.analyzed_owners
+
+    def __str__(self) -> str:
+        elapsed: float = time.monotonic() - self.started_at
+        rate: float = self.analyzed_owners / elapsed if elapsed else 0.0
+        percent: float = (
+            100 * self.done / self.total_owners if self.total_owners else 100.0
+        )
+        return (
+            f"{self.done}/{self.total_owners} owners ({percent:.1f}%), "
+            f"{rate:.0f} owners/s, {elapsed:.1f}s elapsed"
+        )
+
+
+class BatchPortfolioAnalysis:
+    """
+    Computes portfolio metrics of every owner as of one valuation date.
+
+    Bonds are streamed ordered by owner and maturity through a server-side
+    cursor and grouped into chunks of whole portfolios that a process pool
+    analyzes. Results are written to PortfolioAnalysisResult in bulk as
+    chunks complete, so with ``resume`` a restarted run skips the owners
+    already stored for the date. At most two chunks per worker are in flight,
+    which bounds memory however many bonds there are.
+    """
+
+    def __init__(
+        self,
+        valuation_date: date,
+        workers: int = 1,
+        owners_per_chunk: int = 500,
+        cursor_chunk_size: int = 5000,
+        resume: bool = False,
+        on_progress: Callable[[BatchProgress], None] | None = None,
+    ) -> None:
+        self.valuation_date: date = valuation_date
+        self.workers: int = workers
+        self.owners_per_chunk: int = owners_per_chunk
+        self.cursor_chunk_size: int = cursor_chunk_size
+        self.resume: bool = resume
+        self.on_progress: Callable[[BatchProgress], None] = on_progress or (
+            lambda progress: None
+        )
+
+    def run(self) -> BatchProgress:
+        results = PortfolioAnalysisResult.objects.filter(
+            valuation_date=self.valuation_date
+        )
+        done: set[int] = set()
+        if self.resume:
+            done = set(results.values_list("owner_id", flat=True))
+        else:
+            results.delete()
+
+        progress: BatchProgress = BatchProgress(
+            total_owners=Bond.objects.values("owner_id").distinct().count(),
+            skipped_owners=len(done),
+        )
+        rows: Iterator[tuple] = (
+            Bond.objects.order_by("owner_id", "maturity_date", "id")
+            .values_list(*ROW_COLUMNS)
+            .iterator(chunk_size=self.cursor_chunk_size)
+        )
+        chunks: Iterator[list[OwnerRows]] = owner_chunks(
+            rows, self.owners_per_chunk, skip=done
+        )
+
+        if self.workers <= 1:
+            for chunk in chunks:
+                self.store(analyze_chunk(chunk, self.valuation_date), progress)
+        else:
+            self.run_pool(chunks, progress)
+        logger.info(
+            "Analyzed %d portfolios as of %s, %d already stored",
+            progress.analyzed_owners,
+            self.valuation_date,
+            progress.skipped_owners,
+        )
+        return progress
+
+    def run_pool(
+        self, chunks: Iterator[list[OwnerRows]], progress: BatchProgress
+    ) -> None:
+        # Spawned workers do not inherit the parent's open database connections
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as executor:
+            pending: set[Future] = set()
+            for chunk in chunks:
+                pending.add(executor.submit(analyze_chunk, chunk, self.valuation_date))
+                if len(pending) >= 2 * self.workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self.store(future.result(), progress)
+            for future in pending:
+                self.store(future.result(), progress)
+
+    def store(self, results: list[dict], progress: BatchProgress) -> None:
+        """Writes the results of one chunk and reports progress."""
+        with transaction.atomic():
+            PortfolioAnalysisResult.objects.bulk_create(
+                [
+                    PortfolioAnalysisResult(
+                        valuation_date=self.valuation_date, **result
+                    )
+                    for result in results
+                ],
+                batch_size=1000,
+            )
+        progress.analyzed_owners += len(results)
+        self.on_progress(progress)
+
+
+def export_csv(path: Path, valuation_date: date) -> int:
+    """Writes the stored results of ``valuation_date`` to a CSV file."""
+    count: int = 0
+    with path.open("w", newline="", encoding="utf-8") as output:
+        writer = csv.writer(output)
+        writer.writerow(RESULT_COLUMNS)
+        for row in _result_rows(valuation_date):
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def export_parquet(path: Path, valuation_date: date, batch_size: int = 10000) -> int:
+    """Writes the stored results of ``valuation_date`` to a Parquet file (needs pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    def decimal_type(name: str) -> "pa.DataType":
+        model_field = PortfolioAnalysisResult._meta.get_field(name)
+        return pa.decimal128(model_field.max_digits, model_field.decimal_places)
+
+    schema: pa.Schema = pa.schema(
+        [
+            ("owner_id", pa.int64()),
+            ("bond_count", pa.int32()),
+            ("average_interest_rate", decimal_type("average_interest_rate")),
+            ("nearest_maturity_bond", pa.string()),
+            ("total_value", decimal_type("total_value")),
+            ("future_value", decimal_type("future_value")),
+        ]
+    )
+    count: int = 0
+    rows: Iterator[tuple] = _result_rows(valuation_date)
+    with pq.ParquetWriter(path, schema) as writer:
+        while batch := [row for _, row in zip(range(batch_size), rows)]:
+            writer.write_batch(
+                pa.RecordBatch.from_arrays(
+                    [pa.array(column) for column in zip(*batch)], schema=schema
+                )
+            )
+            count += len(batch)
+    return count
+
+
+def _result_rows(valuation_date: date) -> Iterator[tuple]:
+    return (
+        PortfolioAnalysisResult.objects.filter(valuation_date=valuation_date)
+        .order_by("owner_id")
+        .values_list(*RESULT_COLUMNS)
+        .iterator(chunk_size=5000)
+    )
@@ -0,0 +1,150 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from ..isin import invalid_isins
+from ..models import Bond, PortfolioSummary
+from ..serializers import BondImportSerializer
+from .cdcp_service import CDCPService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkImportResult:
+    """Outcome of a bulk import: number of bonds written and per-row errors."""
+
+    created: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+
+class BondBulkImportService:
+    """
+    Imports many bonds for one owner in a single transaction.
+
+    Rows are validated locally first, with the ISINs of all rows checked in
+    one batch, then every distinct valid ISIN is resolved against CDCP
+    exactly once, concurrently. Bonds
+    are written with ``bulk_create`` only if every row is valid.
+    """
+
+    def __init__(
+        self,
+        owner: User,
+        batch_size: int | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        config: dict = getattr(settings, "BOND_BULK_IMPORT", {})
+        self.owner: User = owner
+        self.batch_size: int = batch_size or config.get("BATCH_SIZE", 500)
+        self.max_workers: int = max_workers or config.get("MAX_WORKERS", 8)
+        self.max_rows: int = config.get("MAX_ROWS", 10000)
+
+    def import_rows(self, rows: list) -> BulkImportResult:
+        """Validates all rows and creates the bonds if none of them has errors."""
+        if len(rows) > self.max_rows:
+            return BulkImportResult(
+                errors=[
+                    {
+                        "row": None,
+                        "errors": [
+                            f"At most {self.max_rows} rows can be imported at once."
+                        ],
+                    }
+                ]
+            )
+
+        # Stripped like the serializer's CharField strips them
+        cvals: list[str | None] = [
+            (
+                row["cval"].strip()
+                if isinstance(row, dict) and isinstance(row.get("cval"), str)
+                else None
+            )
+            for row in rows
+        ]
+        isin_errors: dict[str, str] = invalid_isins(
+            cval for cval in cvals if cval is not None
+        )
+        errors: dict[int, dict] = {}
+        valid_rows: dict[int, dict] = {}
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                errors[index] = {"non_field_errors": ["Expected a JSON object."]}
+                continue
+            serializer: BondImportSerializer = BondImportSerializer(data=row)
+            row_errors: dict = {} if serializer.is_valid() else dict(serializer.errors)
+            isin_error: str | None = isin_errors.get(cvals[index])
+            if isin_error is not None and "cval" not in row_errors:
+                row_errors["cval"] = [isin_error]
+            if row_errors:
+                errors[index] = row_errors
+            else:
+                valid_rows[index] = serializer.validated_data
+
+        cdcp_errors: dict[str, list[str]] = self._resolve_isins(
+            {data["cval"] for data in valid_rows.values()}
+        )
+        for index, data in valid_rows.items():
+            if data["cval"] in cdcp_errors:
+                errors[index] = {"cval": cdcp_errors[data["cval"]]}
+
+        if errors:
+            logger.info(
+                "Bulk import for user %s rejected: %d of %d rows are invalid",
+                self.owner,
+                len(errors),
+                len(rows),
+            )
+            return BulkImportResult(
+                errors=[
+                    {"row": index, "errors": errors[index]} for index in sorted(errors)
+                ]
+            )
+
+        bonds: list[Bond] = [
+            Bond(owner=self.owner, **data) for data in valid_rows.values()
+        ]
+        with transaction.atomic():
+            Bond.objects.bulk_create(bonds, batch_size=self.batch_size)
+            PortfolioSummary.objects.record_change(
+                self.owner.pk, added=[bond.position() for bond in bonds]
+            )
+        logger.info("Bulk import created %d bonds for user %s", len(bonds), self.owner)
+        return BulkImportResult(created=len(bonds))
+
+    def _resolve_isins(self, cvals: set[str]) -> dict[str, list[str]]:
+        """Checks each distinct ISIN against CDCP once and returns the failures."""
+        if not cvals:
+            return {}
+        logger.debug("Resolving %d distinct ISINs against CDCP", len(cvals))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Each worker call runs in a copy of this context so that its CDCP
+            # calls are attributed to the current request's metrics
+            results: list[list[str] | None] = [
+                future.result()
+                for future in [
+                    executor.submit(copy_context().run, self._resolve_isin, cval)
+                    for cval in sorted(cvals)
+                ]
+            ]
+        return {
+            cval: messages
+            for cval, messages in zip(sorted(cvals), results)
+            if messages is not None
+        }
+
+    @staticmethod
+    def _resolve_isin(cval: str) -> list[str] | None:
+        """Runs the CDCP check for one ISIN in a worker thread."""
+        try:
+            CDCPService().is_cdcp_bond_data_matching(cval)
+            return None
+        except ValidationError as e:
+            return e.messages
+        finally:
+            connections.close_all()
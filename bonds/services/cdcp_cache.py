@@ -0,0 +1,71 @@
+from django.conf import settings
+from bond_service_demonstrator.cache import TieredCache
+
+
+class CDCPCache(TieredCache):
+    """
+    Cache of CDCP API responses keyed by ISIN.
+
+    Lookups hit an in-process LRU first and then the shared Django cache, so
+    results are reused across requests and worker processes. Responses for
+    ISINs unknown to CDCP are cached too (negative caching) with a shorter TTL.
+    ``get_or_set`` calls the API once for concurrent lookups of an ISIN
+    that is not cached.
+    """
+
+    KEY_PREFIX: str = "cdcp:isin:"
+    COUNTERS: tuple[str, ...] = TieredCache.COUNTERS + ("negative_hits",)
+
+    def __init__(
+        self,
+        ttl: int = 3600,
+        negative_ttl: int = 300,
+        max_entries: int = 1024,
+        alias: str = "default",
+        lock_timeout: float = 30.0,
+    ) -> None:
+        self.negative_ttl: int = negative_ttl
+        super().__init__(
+            self.KEY_PREFIX,
+            ttl=ttl,
+            max_entries=max_entries,
+            alias=alias,
+            lock_timeout=lock_timeout,
+        )
+
+    @classmethod
+    def from_settings(cls) -> "CDCPCache":
+        """Builds the cache from the ``CDCP_CACHE`` setting."""
+        config: dict = getattr(settings, "CDCP_CACHE", {})
+        return cls(
+            ttl=config.get("TTL", 3600),
+            negative_ttl=config.get("NEGATIVE_TTL", 300),
+            max_entries=config.get("MAX_ENTRIES", 1024),
+            alias=config.get("ALIAS", "default"),
+            lock_timeout=config.get("LOCK_TIMEOUT", 30),
+        )
+
+    @staticmethod
+    def is_negative(data: dict) -> bool:
+        """Returns True if the CDCP payload holds no record for the ISIN."""
+        return not data.get("vydaneisiny")
+
+    def ttl_for(self, data: dict) -> int:
+        return self.negative_ttl if self.is_negative(data) else self.ttl
+
+    def _hit(self, tier: str, data: dict) -> None:
+        super()._hit(tier, data)
+        if self.is_negative(data):
+            self._count("negative_hits")
+
+    def invalidate(self, cval: str) -> None:
+        """Drops a single ISIN from both cache tiers."""
+        self.delete_many([cval])
+
+    def invalidate_many(self, cvals: list[str]) -> None:
+        """Drops several ISINs from both cache tiers with one shared-tier call."""
+        self.delete_many(cvals)
+
+
+# Process-wide instance shared by all CDCPService objects
+cdcp_cache: CDCPCache = CDCPCache.from_settings()
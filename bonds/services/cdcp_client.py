@@ -0,0 +1,322 @@
+import logging
+import asyncio
+import random
+import threading
+import time
+import weakref
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from bond_service_demonstrator.metrics import track_cdcp_call
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Response statuses worth retrying: throttling and transient upstream failures
+RETRYABLE_STATUSES: frozenset[int] = frozenset({429, 502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised when the circuit breaker rejects a call without contacting CDCP."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream once ``failure_threshold`` consecutive
+    calls have failed. After ``reset_timeout`` seconds a single trial call is
+    let through (half-open). It closes the circuit again if it succeeds.
+    """
+
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self._failures: int = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Returns the current state of the circuit."""
+        with self._lock:
+            return self._state()
+
+    def allow_request(self) -> str | None:
+        """
+        Returns the state a call is admitted in, CLOSED or HALF_OPEN for the
+        single trial call, or None if it may not be made now. Only the trial
+        call passes ``trial=True`` to ``record_success``/``record_failure``
+        and calls ``release_trial``.
+        """
+        with self._lock:
+            state: str = self._state()
+            if state == self.CLOSED:
+                return state
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return state
+            return None
+
+    def record_success(self, trial: bool = False) -> None:
+        """Closes the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            if trial:
+                self._trial_in_flight = False
+
+    def record_failure(self, trial: bool = False) -> None:
+        """Counts a failed call and opens the circuit once the threshold is hit."""
+        with self._lock:
+            self._failures += 1
+            if trial:
+                self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Frees the half-open trial slot of a trial call that recorded no outcome."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+
+class CDCPClient:
+    """
+    HTTP client for the CDCP API built on a pooled, keep-alive ``requests.Session``.
+
+    Every call has connect/read timeouts. Transient failures are retried a
+    bounded number of times with exponential backoff and full jitter. The
+    number of calls in flight is capped by a semaphore, and a circuit breaker
+    fails fast while CDCP is down.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        max_concurrency: int = 10,
+        pool_maxsize: int = 10,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.timeout: tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.max_concurrency: int = max_concurrency
+        self.breaker: CircuitBreaker = breaker or CircuitBreaker()
+        self._semaphore: threading.BoundedSemaphore = threading.BoundedSemaphore(
+            max_concurrency
+        )
+        self.session: requests.Session = requests.Session()
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_settings(cls) -> "CDCPClient":
+        """Builds the client from the ``CDCP_CLIENT`` setting."""
+        config: dict = getattr(settings, "CDCP_CLIENT", {})
+        return cls(
+            connect_timeout=config.get("CONNECT_TIMEOUT", 3.05),
+            read_timeout=config.get("READ_TIMEOUT", 10.0),
+            max_retries=config.get("MAX_RETRIES", 2),
+            backoff_base=config.get("BACKOFF_BASE", 0.2),
+            backoff_max=config.get("BACKOFF_MAX", 2.0),
+            max_concurrency=config.get("MAX_CONCURRENCY", 10),
+            pool_maxsize=config.get("POOL_MAXSIZE", 10),
+            breaker=CircuitBreaker(
+                failure_threshold=config.get("BREAKER_FAILURE_THRESHOLD", 5),
+                reset_timeout=config.get("BREAKER_RESET_TIMEOUT", 30.0),
+            ),
+        )
+
+    def get_json(self, url: str) -> dict:
+        """Fetches ``url`` and returns the decoded JSON body."""
+        admitted: str | None = self.breaker.allow_request()
+        if admitted is None:
+            raise CircuitOpenError(f"CDCP circuit is open, not calling {url}")
+        trial: bool = admitted == CircuitBreaker.HALF_OPEN
+        try:
+            data: dict = self._get_with_retries(url)
+        except requests.exceptions.RequestException as e:
+            self.record_outcome(e, trial)
+            raise
+        except Exception:
+            # E.g. a body that is not JSON
+            self.breaker.record_failure(trial)
+            raise
+        else:
+            self.breaker.record_success(trial)
+            return data
+        finally:
+            if trial:
+                self.breaker.release_trial()
+
+    def _get_with_retries(self, url: str) -> dict:
+        attempt: int = 0
+        while True:
+            try:
+                # Held per attempt, so backoff sleeps do not use up a slot
+                with self._semaphore:
+                    return self.request_once(url)
+            except requests.exceptions.RequestException as e:
+                if not self.is_retryable(e) or attempt >= self.max_retries:
+                    raise
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    def request_once(self, url: str) -> dict:
+        """Performs a single GET without retries."""
+        with track_cdcp_call():
+            response: requests.Response = self.session.get(url, timeout=self.timeout)
+            logger.debug("CDCP API response status: %s", response.status_code)
+            response.raise_for_status()
+            return response.json()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Returns the sleep before retry ``attempt + 1`` (exponential, full jitter)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    @staticmethod
+    def is_retryable(error: requests.exceptions.RequestException) -> bool:
+        """Returns True for connection errors, timeouts and transient statuses."""
+        if isinstance(error, requests.exceptions.HTTPError):
+            return error.response is not None and (
+                error.response.status_code in RETRYABLE_STATUSES
+            )
+        return isinstance(
+            error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        )
+
+    def record_outcome(
+        self, error: requests.exceptions.RequestException, trial: bool = False
+    ) -> None:
+        """Feeds a failed call into the breaker; client errors (4xx) do not count."""
+        response: requests.Response | None = getattr(error, "response", None)
+        status_code: int | None = response.status_code if response is not None else None
+        if status_code is not None and 400 <= status_code < 500 and status_code != 429:
+            self.breaker.record_success(trial)
+        else:
+            self.breaker.record_failure(trial)
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.session.close()
+
+
+class AsyncCDCPClient:
+    """
+    Asyncio front-end for ``CDCPClient`` used by ASGI deployments.
+
+    This is not an asyncio HTTP client: each request is a blocking call of
+    the shared ``requests.Session`` run with ``asyncio.to_thread`` on the
+    loop's default executor. The event loop stays free while CDCP answers,
+    but the number of lookups waiting at once is capped by the executor's
+    thread count as well as by ``max_concurrency``. Each event loop gets its
+    own ``asyncio.Semaphore``. Retries, backoff and the circuit breaker are
+    shared with the synchronous client.
+    """
+
+    def __init__(self, client: CDCPClient) -> None:
+        self.client: CDCPClient = client
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock: threading.Lock = threading.Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Returns the semaphore of the running event loop, creating it on first use."""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore: asyncio.Semaphore | None = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.client.max_concurrency)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    async def get_json(self, url: str) -> dict:
+        """Fetches ``url`` and returns the decoded JSON body."""
+        admitted: str | None = self.client.breaker.allow_request()
+        if admitted is None:
+            raise CircuitOpenError(f"CDCP circuit is open, not calling {url}")
+        trial: bool = admitted == CircuitBreaker.HALF_OPEN
+        try:
+            data: dict = await self._get_with_retries(url)
+        except requests.exceptions.RequestException as e:
+            self.client.record_outcome(e, trial)
+            raise
+        except Exception:
+            self.client.breaker.record_failure(trial)
+            raise
+        else:
+            self.client.breaker.record_success(trial)
+            return data
+        finally:
+            # Also reached when the awaiting task is cancelled
+            if trial:
+                self.client.breaker.release_trial()
+
+    async def _get_with_retries(self, url: str) -> dict:
+        attempt: int = 0
+        while True:
+            try:
+                async with self._semaphore():
+                    return await asyncio.to_thread(self.client.request_once, url)
+            except requests.exceptions.RequestException as e:
+                if (
+                    not self.client.is_retryable(e)
+                    or attempt >= self.client.max_retries
+                ):
+                    raise
+            await asyncio.sleep(self.client.backoff_delay(attempt))
+            attempt += 1
+
+
+_client: CDCPClient | None = None
+_async_client: AsyncCDCPClient | None = None
+_client_lock: threading.Lock = threading.Lock()
+
+
+def get_cdcp_client() -> CDCPClient:
+    """Returns the process-wide CDCP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = CDCPClient.from_settings()
+        return _client
+
+
+def get_async_cdcp_client() -> AsyncCDCPClient:
+    """Returns the process-wide asyncio CDCP client, creating it on first use."""
+    global _async_client
+    client: CDCPClient = get_cdcp_client()
+    with _client_lock:
+        if _async_client is None:
+            _async_client = AsyncCDCPClient(client)
+        return _async_client
+
+
+def reset_cdcp_client() -> None:
+    """
+    Closes and drops the process-wide clients, so the next call builds them
+    again with a fresh circuit breaker, e.g. between tests.
+    """
+    global _client, _async_client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _async_client = None
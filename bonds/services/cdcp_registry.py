@@ -0,0 +1,161 @@
+import csv
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+from django.db import transaction
+from django.utils import timezone
+from bonds.models import CDCPRegistryEntry
+from .cdcp_cache import cdcp_cache
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Dump formats understood by read_dump; by default taken from the file extension
+DUMP_FORMATS: tuple[str, ...] = ("json", "ndjson", "csv")
+
+
+@dataclass
+class RegistryRefresh:
+    """Row counts of one registry refresh."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    skipped: int = 0
+
+
+def record_checksum(record: dict) -> str:
+    """Returns a digest of ``record`` that does not depend on key order."""
+    canonical: str = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def read_dump(path: Path, dump_format: str | None = None) -> Iterator[dict]:
+    """
+    Yields the records of a CDCP ISIN dump. ``json`` dumps hold an array of
+    records or a CDCP API response (``{"vydaneisiny": [...]}``), ``ndjson``
+    dumps one record per line and ``csv`` dumps one record per row with the
+    CDCP field names as the header. NDJSON and CSV dumps are streamed.
+    """
+    dump_format = dump_format or path.suffix.lstrip(".").lower()
+    if dump_format == "jsonl":
+        dump_format = "ndjson"
+    if dump_format not in DUMP_FORMATS:
+        raise ValueError(f"Unsupported dump format: {dump_format}")
+
+    with path.open(encoding="utf-8", newline="") as dump:
+        if dump_format == "csv":
+            yield from csv.DictReader(dump)
+        elif dump_format == "ndjson":
+            yield from (json.loads(line) for line in dump if line.strip())
+        else:
+            data: list | dict = json.load(dump)
+            yield from data["vydaneisiny"] if isinstance(data, dict) else data
+
+
+def apply_dump(
+    records: Iterable[dict], batch_size: int = 1000, prune: bool = False
+) -> RegistryRefresh:
+    """
+    Brings the registry in line with ``records``, writing only the delta:
+    new ISINs are inserted, ISINs whose record changed are updated and, with
+    ``prune``, ISINs missing from a full dump are removed. Each batch costs
+    one lookup of the stored checksums; unchanged rows are not written. CDCP
+    cache entries of every changed ISIN are invalidated.
+    """
+    result: RegistryRefresh = RegistryRefresh()
+    seen: set[str] = set()
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        entries: dict[str, CDCPRegistryEntry] = {}
+        for record in batch:
+            cval: str = str(record.get("cval") or "").strip()
+            if not cval or len(cval) > 12:
+                result.skipped += 1
+                continue
+            entries[cval] = CDCPRegistryEntry(
+                cval=cval, record=record, checksum=record_checksum(record)
+            )
+        seen.update(entries)
+        _apply_batch(entries, result)
+
+    if prune:
+        _prune(seen, batch_size, result)
+    logger.info(
+        "CDCP registry refreshed: %d inserted, %d updated, %d unchanged, "
+        "%d removed, %d skipped",
+        result.inserted,
+        result.updated,
+        result.unchanged,
+        result.removed,
+        result.skipped,
+    )
+    return result
+
+
+def _apply_batch(
+    entries: dict[str, CDCPRegistryEntry], result: RegistryRefresh
+) -> None:
+    stored: dict[str, str] = dict(
+        CDCPRegistryEntry.objects.filter(cval__in=entries).values_list(
+            "cval", "checksum"
+        )
+    )
+    inserted: list[CDCPRegistryEntry] = [
+        entry for cval, entry in entries.items() if cval not in stored
+    ]
+    updated: list[CDCPRegistryEntry] = [
+        entry
+        for cval, entry in entries.items()
+        if cval in stored and stored[cval] != entry.checksum
+    ]
+    # bulk_update does not apply auto_now
+    now = timezone.now()
+    for entry in updated:
+        entry.updated_at = now
+    with transaction.atomic():
+        CDCPRegistryEntry.objects.bulk_create(inserted)
+        CDCPRegistryEntry.objects.bulk_update(
+            updated, ["record", "checksum", "updated_at"]
+        )
+    cdcp_cache.invalidate_many([entry.cval for entry in inserted + updated])
+    result.inserted += len(inserted)
+    result.updated += len(updated)
+    result.unchanged += len(entries) - len(inserted) - len(updated)
+
+
+def _prune(seen: set[str], batch_size: int, result: RegistryRefresh) -> None:
+    stale: list[str] = [
+        cval
+        for cval in CDCPRegistryEntry.objects.values_list("cval", flat=True).iterator(
+            chunk_size=batch_size
+        )
+        if cval not in seen
+    ]
+    for start in range(0, len(stale), batch_size):
+        chunk: list[str] = stale[start : start + batch_size]
+        CDCPRegistryEntry.objects.filter(cval__in=chunk).delete()
+        cdcp_cache.invalidate_many(chunk)
+    result.removed += len(stale)
+
+
+def lookup(cval: str) -> dict | None:
+    """Returns the registry record of ``cval``, or None if it is not listed."""
+    return (
+        CDCPRegistryEntry.objects.filter(cval=cval)
+        .values_list("record", flat=True)
+        .first()
+    )
+
+
+async def alookup(cval: str) -> dict | None:
+    """Asynchronous variant of ``lookup``."""
+    return (
+        await CDCPRegistryEntry.objects.filter(cval=cval)
+        .values_list("record", flat=True)
+        .afirst()
+    )
@@ -1,49 +1,126 @@
+import logging
 import requests
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from bond_service_demonstrator.logger import logger
+from ..isin import validate_isin
+from .cdcp_cache import cdcp_cache
+from .cdcp_client import get_async_cdcp_client, get_cdcp_client
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 class CDCPService:
+    """
+    Checks ISINs against CDCP. With ``CDCP_REGISTRY["MODE"]`` set to
+    ``"registry"`` the local registry loaded by ``load_cdcp_registry`` is
+    consulted first and only unlisted ISINs reach the CDCP API; ``"offline"``
+    treats unlisted ISINs as unknown without calling the API. The default,
+    ``"remote"``, always asks the API. Malformed ISINs and ISINs with a wrong
+    check digit are rejected with a ValidationError before any lookup.
+    """
+
     API_URL_TEMPLATE = "https://www.cdcp.cz/isbpublicjson/api/VydaneISINy?isin={}"
+    REGISTRY_MODES: tuple[str, ...] = ("remote", "registry", "offline")
+
+    @staticmethod
+    def registry_mode() -> str:
+        mode: str = getattr(settings, "CDCP_REGISTRY", {}).get("MODE", "remote")
+        if mode not in CDCPService.REGISTRY_MODES:
+            raise ValueError(f"Unknown CDCP registry mode: {mode}")
+        return mode
 
     def is_cdcp_bond_data_matching(self, cval: str) -> bool:
         """
         Fetch bond data from the CDCP API for a given ISIN and compare if the cval matches.
         """
+        validate_isin(cval)
         data: dict = self._fetch_cdcp_data(cval)
         return self._is_cval_matching(data, cval)
 
     def _fetch_cdcp_data(self, cval: str) -> dict:
         """
-        Fetch data from the CDCP API.
-        """
-        api_url: str = self.API_URL_TEMPLATE.format(cval)
-        logger.debug(f"Calling CDCP API to acquire data for ISIN: {cval}")
-        try:
-            response: requests.Response = requests.get(api_url)
-            logger.debug(f"CDCP API response status: {response.status_code}")
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error occurred while fetching data for ISIN {cval}: {e}")
-            raise ValidationError(
-                f"Error occurred while fetching data from CDCP API for ISIN {cval}."
-            )
+        Fetch data from the CDCP API, serving repeated lookups from the cache.
+        """
+        mode: str = self.registry_mode()
+        if mode != "remote":
+            # Imported lazily: bonds.models imports this module
+            from .cdcp_registry import lookup
+
+            record: dict | None = lookup(cval)
+            if record is not None or mode == "offline":
+                logger.debug("CDCP registry lookup for ISIN: %s", cval)
+                return {"vydaneisiny": [record] if record else []}
+
+        def call_api() -> dict:
+            api_url: str = self.API_URL_TEMPLATE.format(cval)
+            logger.debug("Calling CDCP API to acquire data for ISIN: %s", cval)
+            try:
+                return get_cdcp_client().get_json(api_url)
+            except requests.exceptions.RequestException as e:
+                raise self._fetch_error(cval, e)
+
+        # Concurrent lookups of an uncached ISIN share a single API call
+        return cdcp_cache.get_or_set(cval, call_api)
+
+    async def ais_cdcp_bond_data_matching(self, cval: str) -> bool:
+        """
+        Asynchronous variant of ``is_cdcp_bond_data_matching`` for ASGI views.
+        """
+        validate_isin(cval)
+        data: dict = await self._afetch_cdcp_data(cval)
+        return self._is_cval_matching(data, cval)
+
+    async def _afetch_cdcp_data(self, cval: str) -> dict:
+        """
+        Fetch data from the CDCP API without blocking the event loop.
+        """
+        mode: str = self.registry_mode()
+        if mode != "remote":
+            from .cdcp_registry import alookup
+
+            record: dict | None = await alookup(cval)
+            if record is not None or mode == "offline":
+                logger.debug("CDCP registry lookup for ISIN: %s", cval)
+                return {"vydaneisiny": [record] if record else []}
+
+        async def call_api() -> dict:
+            api_url: str = self.API_URL_TEMPLATE.format(cval)
+            logger.debug("Calling CDCP API asynchronously for ISIN: %s", cval)
+            try:
+                return await get_async_cdcp_client().get_json(api_url)
+            except requests.exceptions.RequestException as e:
+                raise self._fetch_error(cval, e)
+
+        return await cdcp_cache.aget_or_set(cval, call_api)
+
+    @staticmethod
+    def _fetch_error(cval: str, error: Exception) -> ValidationError:
+        """
+        Log a failed CDCP call and build the validation error reported for it.
+        """
+        logger.error("Error occurred while fetching data for ISIN %s: %s", cval, error)
+        return ValidationError(
+            f"Error occurred while fetching data from CDCP API for ISIN {cval}."
+        )
 
     def _is_cval_matching(self, data: dict, cval: str) -> bool:
         """
         Check if the cval from the response matches the given cval.
         """
         if "vydaneisiny" in data and data["vydaneisiny"]:
-            logger.debug(f"CDCP data found for ISIN {cval}: {data['vydaneisiny'][0]}")
+            logger.debug(
+                "CDCP data found for ISIN %s: %s", cval, data["vydaneisiny"][0]
+            )
             fetched_cval = data["vydaneisiny"][0].get("cval")
             if fetched_cval == cval:
                 return True
             else:
                 logger.error(
-                    f"Fetched cval {fetched_cval} does not match provided cval {cval}."
+                    "Fetched cval %s does not match provided cval %s.",
+                    fetched_cval,
+                    cval,
                 )
                 return False
         else:
-            logger.error(f"ISIN {cval} not found in CDCP data.")
+            logger.error("ISIN %s not found in CDCP data.", cval)
             return False
@@ -1,21 +1,47 @@
 from decimal import Decimal
 from datetime import date
-from django.db.models import QuerySet
-from ..models import Bond
+from asgiref.sync import sync_to_async
+from django.db.models import Count, DecimalField, F, Min, QuerySet, Sum
+from ..expressions import DaysUntil
+from django.contrib.auth.models import User
+from ..models import Bond, PortfolioSummary
+from .analytics_engine import PortfolioColumns, VectorizedPortfolioEngine
+
+# Analysis result returned when the portfolio holds no bonds
+EMPTY_ANALYSIS: dict[str, Decimal | None] = {
+    "average_interest_rate": Decimal(0),
+    "nearest_maturity_bond": None,
+    "total_value": Decimal(0),
+    "future_value": Decimal(0),
+}
 
 
 class PortfolioAnalysisService:
 
     @staticmethod
     def future_value(
-        value: Decimal, interest_rate: Decimal, maturity_date: date
+        value: Decimal,
+        interest_rate: Decimal,
+        maturity_date: date,
+        valuation_date: date | None = None,
     ) -> Decimal:
-        """Calculates the future value of a bond based on interest rate and maturity."""
+        """
+        Calculates the future value of a bond based on interest rate and maturity,
+        as of ``valuation_date`` (today by default).
+        """
         time_to_maturity: Decimal = Decimal(
-            (maturity_date - date.today()).days
+            (maturity_date - (valuation_date or date.today())).days
         ) / Decimal(365.0)
         return value * (Decimal(1) + (interest_rate / Decimal(100)) * time_to_maturity)
 
+    @staticmethod
+    def future_value_from_sums(total_value: Decimal, weighted_days: Decimal) -> Decimal:
+        """
+        Calculates the future value of a portfolio from its total value and the
+        sum of ``tval * interest_rate * days_to_maturity`` over its bonds.
+        """
+        return total_value + weighted_days / Decimal(36500)
+
     @staticmethod
     def average_interest_rate(bonds) -> Decimal:
         """Calculates the average interest rate for the portfolio."""
@@ -35,14 +61,190 @@ class PortfolioAnalysisService:
         return sum((Decimal(bond.tval) for bond in bonds), start=Decimal(0))
 
     @staticmethod
-    def future_value_sum(bonds: QuerySet) -> Decimal:
-        """Calculates the sum of the future values of the bonds."""
+    def future_value_sum(
+        bonds: QuerySet,
+        valuation_date: date | None = None,
+        vectorized: bool = False,
+    ) -> Decimal | float:
+        """
+        Calculates the sum of the future values of the bonds. With
+        ``vectorized=True`` the columnar engine is used and a float is returned.
+        """
+        if vectorized:
+            return VectorizedPortfolioEngine(
+                PortfolioAnalysisService._columns(bonds), valuation_date
+            ).summary()["future_value"]
+        valuation_date = valuation_date or date.today()
         return sum(
             (
                 PortfolioAnalysisService.future_value(
-                    bond.tval, bond.interest_rate, bond.maturity_date
+                    bond.tval, bond.interest_rate, bond.maturity_date, valuation_date
                 )
                 for bond in bonds
             ),
             start=Decimal(0),
         )
+
+    @staticmethod
+    def _columns(bonds) -> PortfolioColumns:
+        """Loads bonds into columns, reading querysets without building models."""
+        if isinstance(bonds, QuerySet):
+            return PortfolioColumns.from_queryset(bonds)
+        return PortfolioColumns.from_bonds(bonds)
+
+    @staticmethod
+    def analyze(
+        bonds: QuerySet[Bond], mode: str = "aggregate"
+    ) -> dict[str, Decimal | str | None]:
+        """
+        Computes all portfolio metrics with a single SQL aggregate
+        (``mode="aggregate"``), row by row in Python (``mode="python"``) or
+        with the columnar engine (``mode="vectorized"``).
+        """
+        if mode == "python":
+            return PortfolioAnalysisService.python_analysis(bonds)
+        if mode == "aggregate":
+            return PortfolioAnalysisService.aggregate_analysis(bonds)
+        if mode == "vectorized":
+            return PortfolioAnalysisService.vectorized_analysis(bonds)
+        raise ValueError(f"Unknown portfolio analysis mode: {mode}")
+
+    @staticmethod
+    def analyze_owner(
+        owner: User, mode: str = "summary"
+    ) -> dict[str, Decimal | str | None]:
+        """
+        Computes all portfolio metrics of one owner. ``mode="summary"`` reads
+        the materialized PortfolioSummary row; other modes are passed to ``analyze``.
+        """
+        if mode == "summary":
+            return PortfolioAnalysisService.summary_analysis(owner)
+        return PortfolioAnalysisService.analyze(
+            Bond.objects.filter(owner=owner), mode=mode
+        )
+
+    @staticmethod
+    def summary_analysis(owner: User) -> dict[str, Decimal | str | None]:
+        """Computes all portfolio metrics from the owner's PortfolioSummary row."""
+        summary: PortfolioSummary | None = (
+            PortfolioSummary.objects.select_related("nearest_bond")
+            .filter(owner=owner)
+            .first()
+        )
+        if summary is None or (summary.bond_count and summary.nearest_bond is None):
+            summary = PortfolioSummary.objects.rebuild(owner.pk)
+        return PortfolioAnalysisService.summary_metrics(summary)
+
+    @staticmethod
+    async def aanalyze_owner(
+        owner: User, mode: str = "summary"
+    ) -> dict[str, Decimal | str | None]:
+        """
+        Asynchronous variant of ``analyze_owner`` for async views. The summary
+        is read with the async ORM; other modes run ``analyze`` in a thread.
+        """
+        if mode != "summary":
+            return await sync_to_async(PortfolioAnalysisService.analyze_owner)(
+                owner, mode
+            )
+        summaries: QuerySet[PortfolioSummary] = PortfolioSummary.objects.select_related(
+            "nearest_bond"
+        ).filter(owner=owner)
+        summary: PortfolioSummary | None = await summaries.afirst()
+        if summary is None or (summary.bond_count and summary.nearest_bond is None):
+            await sync_to_async(PortfolioSummary.objects.rebuild)(owner.pk)
+            # Reloaded with its nearest bond, which must not be fetched lazily
+            summary = await summaries.afirst()
+        return PortfolioAnalysisService.summary_metrics(summary)
+
+    @staticmethod
+    def summary_metrics(summary: PortfolioSummary) -> dict[str, Decimal | str | None]:
+        """Computes all portfolio metrics from a loaded PortfolioSummary row."""
+        if not summary.bond_count:
+            return dict(EMPTY_ANALYSIS)
+
+        return {
+            "average_interest_rate": summary.interest_rate_sum
+            / Decimal(summary.bond_count),
+            "nearest_maturity_bond": summary.nearest_bond.ison,
+            "total_value": summary.total_value,
+            "future_value": PortfolioAnalysisService.future_value_from_sums(
+                summary.total_value, summary.weighted_days(date.today())
+            ),
+        }
+
+    @staticmethod
+    def python_analysis(bonds: QuerySet[Bond]) -> dict[str, Decimal | str | None]:
+        """Computes all portfolio metrics in Python from a single evaluation of ``bonds``."""
+        bond_list: list[Bond] = list(bonds)
+        if not bond_list:
+            return dict(EMPTY_ANALYSIS)
+        return {
+            "average_interest_rate": PortfolioAnalysisService.average_interest_rate(
+                bond_list
+            ),
+            "nearest_maturity_bond": PortfolioAnalysisService.nearest_bond(
+                bond_list
+            ).ison,
+            "total_value": PortfolioAnalysisService.total_value(bond_list),
+            "future_value": PortfolioAnalysisService.future_value_sum(bond_list),
+        }
+
+    @staticmethod
+    def vectorized_analysis(
+        bonds: QuerySet[Bond], valuation_date: date | None = None
+    ) -> dict[str, Decimal | str | None]:
+        """Computes all portfolio metrics with the columnar NumPy engine."""
+        engine: VectorizedPortfolioEngine = VectorizedPortfolioEngine(
+            PortfolioColumns.from_queryset(bonds), valuation_date
+        )
+        nearest_bond_id: int | None = engine.nearest_bond_id()
+        if nearest_bond_id is None:
+            return dict(EMPTY_ANALYSIS)
+
+        summary: dict[str, float | int] = engine.summary()
+        return {
+            "average_interest_rate": Decimal(repr(summary["average_interest_rate"])),
+            "nearest_maturity_bond": Bond.objects.values_list("ison", flat=True).get(
+                pk=nearest_bond_id
+            ),
+            "total_value": Decimal(repr(summary["total_value"])),
+            "future_value": Decimal(repr(summary["future_value"])),
+        }
+
+    @staticmethod
+    def aggregate_analysis(bonds: QuerySet[Bond]) -> dict[str, Decimal | str | None]:
+        """
+        Computes all portfolio metrics in one ``aggregate()`` query.
+        The name of the nearest maturing bond is then read with one indexed lookup.
+        """
+        totals: dict = bonds.aggregate(
+            bond_count=Count("pk"),
+            total_value=Sum("tval"),
+            interest_rate_sum=Sum("interest_rate"),
+            nearest_maturity_date=Min("maturity_date"),
+            weighted_days=Sum(
+                F("tval")
+                * F("interest_rate")
+                * DaysUntil(F("maturity_date"), date.today()),
+                output_field=DecimalField(),
+            ),
+        )
+        if not totals["bond_count"]:
+            return dict(EMPTY_ANALYSIS)
+
+        nearest_maturity_bond: str | None = (
+            bonds.filter(maturity_date=totals["nearest_maturity_date"])
+            .order_by("pk")
+            .values_list("ison", flat=True)
+            .first()
+        )
+        return {
+            "average_interest_rate": totals["interest_rate_sum"]
+            / Decimal(totals["bond_count"]),
+            "nearest_maturity_bond": nearest_maturity_bond,
+            "total_value": totals["total_value"],
+            "future_value": PortfolioAnalysisService.future_value_from_sums(
+                totals["total_value"], totals["weighted_days"]
+            ),
+        }
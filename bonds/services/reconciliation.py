@@ -0,0 +1,306 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import islice
+from typing import Callable, Iterator
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet
+from django.utils import timezone
+from bonds.models import (
+    Bond,
+    ReconciliationDiff,
+    ReconciliationRun,
+    ReconciliationTask,
+)
+from .cdcp_cache import cdcp_cache
+from .cdcp_client import CDCPClient, CircuitOpenError, get_cdcp_client
+from .cdcp_service import CDCPService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Bond fields that mirror CDCP data and may change after the bond is stored
+RECONCILED_FIELDS: tuple[str, ...] = ("ison", "ename", "pdcp", "eico", "elei")
+
+
+class RateLimiter:
+    """
+    Token bucket allowing ``rate`` calls per second on average and bursts of
+    up to ``burst`` calls. ``acquire`` sleeps until a token is available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate: float = rate
+        self.burst: int = burst
+        self._clock: Callable[[], float] = clock
+        self._sleep: Callable[[float], None] = sleep
+        self._tokens: float = float(burst)
+        self._updated_at: float = clock()
+        self._lock: threading.Lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now: float = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            wait: float = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            self._tokens -= 1
+        if wait:
+            self._sleep(wait)
+
+
+@dataclass
+class ReconciliationProgress:
+    """Task counts of a run after a worker pass."""
+
+    checked: int = 0
+    diffs: int = 0
+    interrupted: bool = False
+    remaining: int = 0
+    failed: int = 0
+
+
+def enqueue_run(batch_size: int = 1000) -> ReconciliationRun:
+    """
+    Creates a run with one task per distinct ISIN of the stored bonds.
+    ISINs are streamed from the database and inserted in batches.
+    """
+    run: ReconciliationRun = ReconciliationRun.objects.create()
+    cvals: Iterator[str] = (
+        Bond.objects.order_by("cval")
+        .values_list("cval", flat=True)
+        .distinct()
+        .iterator(chunk_size=batch_size)
+    )
+    queued: int = 0
+    while batch := list(islice(cvals, batch_size)):
+        ReconciliationTask.objects.bulk_create(
+            [ReconciliationTask(run=run, cval=cval) for cval in batch],
+            ignore_conflicts=True,
+        )
+        queued += len(batch)
+    logger.info("Reconciliation run %s queued %d ISINs", run.pk, queued)
+    return run
+
+
+class CDCPReconciler:
+    """
+    Worker draining the task queue of one reconciliation run.
+
+    Batches are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so several
+    workers can share a run. Each task fetches the ISIN from CDCP at most
+    ``rate`` times per second, writes the differences of every bond with
+    that ISIN and marks itself done in one transaction, so a crash never
+    loses or duplicates the work of a finished task. Tasks left running by
+    a crashed or stalled worker are claimed again once their lease expires;
+    a worker whose lease was taken over discards its result.
+    """
+
+    def __init__(
+        self,
+        run: ReconciliationRun,
+        client: CDCPClient | None = None,
+        url_template: str = CDCPService.API_URL_TEMPLATE,
+        rate: float | None = None,
+        batch_size: int | None = None,
+        max_attempts: int | None = None,
+        lease: float | None = None,
+    ) -> None:
+        config: dict = getattr(settings, "CDCP_RECONCILIATION", {})
+        self.run: ReconciliationRun = run
+        self.client: CDCPClient = client or get_cdcp_client()
+        self.url_template: str = url_template
+        self.rate_limiter: RateLimiter = RateLimiter(
+            config.get("RATE", 5.0) if rate is None else rate
+        )
+        self.batch_size: int = batch_size or config.get("BATCH_SIZE", 100)
+        self.max_attempts: int = max_attempts or config.get("MAX_ATTEMPTS", 3)
+        self.lease: timedelta = timedelta(
+            seconds=lease or config.get("LEASE_SECONDS", 300)
+        )
+
+    def process(self, limit: int | None = None) -> ReconciliationProgress:
+        """Works through the run until it is drained or ``limit`` tasks are done."""
+        progress: ReconciliationProgress = ReconciliationProgress()
+        ReconciliationRun.objects.filter(
+            pk=self.run.pk, status=ReconciliationRun.PENDING
+        ).update(status=ReconciliationRun.RUNNING)
+
+        while limit is None or progress.checked < limit:
+            size: int = self.batch_size
+            if limit is not None:
+                size = min(size, limit - progress.checked)
+            tasks: list[ReconciliationTask] = self.claim(size)
+            if not tasks:
+                break
+            for index, task in enumerate(tasks):
+                try:
+                    progress.diffs += self.reconcile(task)
+                except CircuitOpenError:
+                    logger.warning("CDCP circuit is open, pausing reconciliation")
+                    self.release(tasks[index:])
+                    progress.interrupted = True
+                    break
+                progress.checked += 1
+            if progress.interrupted:
+                break
+
+        self.finish(progress)
+        return progress
+
+    def claim(self, size: int) -> list[ReconciliationTask]:
+        """Leases the next ``size`` pending or expired tasks to this worker."""
+        now = timezone.now()
+        with transaction.atomic():
+            tasks: list[ReconciliationTask] = list(
+                ReconciliationTask.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=ReconciliationTask.PENDING)
+                    | Q(
+                        status=ReconciliationTask.RUNNING,
+                        locked_at__lt=now - self.lease,
+                    ),
+                    run=self.run,
+                )
+                .order_by("id")[:size]
+            )
+            ReconciliationTask.objects.filter(
+                pk__in=[task.pk for task in tasks]
+            ).update(
+                status=ReconciliationTask.RUNNING,
+                locked_at=now,
+                attempts=F("attempts") + 1,
+            )
+        for task in tasks:
+            task.status = ReconciliationTask.RUNNING
+            task.locked_at = now
+            task.attempts += 1
+        return tasks
+
+    @staticmethod
+    def leased(task: ReconciliationTask) -> QuerySet:
+        """
+        The task row while this worker still holds the lease taken by ``claim``;
+        empty once the lease expired and another worker claimed the task.
+        """
+        return ReconciliationTask.objects.filter(
+            pk=task.pk, status=ReconciliationTask.RUNNING, locked_at=task.locked_at
+        )
+
+    def reconcile(self, task: ReconciliationTask) -> int:
+        """Checks one ISIN against CDCP and returns the number of differences."""
+        self.rate_limiter.acquire()
+        try:
+            data: dict = self.client.get_json(self.url_template.format(task.cval))
+        except CircuitOpenError:
+            raise
+        except requests.exceptions.RequestException as e:
+            self.fail(task, e)
+            return 0
+        if self.url_template == CDCPService.API_URL_TEMPLATE:
+            # Only answers of the real API may serve later ISIN validation
+            cdcp_cache.set(task.cval, data)
+
+        records: list[dict] = data.get("vydaneisiny") or []
+        record: dict | None = next(
+            (item for item in records if item.get("cval") == task.cval), None
+        )
+        diffs: list[ReconciliationDiff] = [
+            ReconciliationDiff(
+                run=self.run,
+                bond_id=bond["pk"],
+                cval=task.cval,
+                field=field,
+                stored_value=stored,
+                cdcp_value=fetched,
+            )
+            for bond in Bond.objects.filter(cval=task.cval).values(
+                "pk", *RECONCILED_FIELDS
+            )
+            for field, stored, fetched in self.differences(bond, record)
+        ]
+        with transaction.atomic():
+            if not self.leased(task).update(
+                status=ReconciliationTask.DONE, locked_at=None, error=""
+            ):
+                logger.warning(
+                    "Lease on ISIN %s expired before it was reconciled, "
+                    "discarding the result",
+                    task.cval,
+                )
+                return 0
+            ReconciliationDiff.objects.bulk_create(diffs)
+        return len(diffs)
+
+    @staticmethod
+    def differences(
+        bond: dict, record: dict | None
+    ) -> Iterator[tuple[str, str, str | None]]:
+        """Yields ``(field, stored, cdcp)`` for every field that differs."""
+        if record is None:
+            yield ReconciliationDiff.MISSING_FIELD, "", None
+            return
+        for field in RECONCILED_FIELDS:
+            if field not in record:
+                continue
+            stored: str = str(bond[field] or "").strip()
+            fetched: str = str(record[field] or "").strip()
+            if stored != fetched:
+                yield field, stored, fetched
+
+    def fail(self, task: ReconciliationTask, error: Exception) -> None:
+        """Re-queues a failed task, or gives up once it ran out of attempts."""
+        logger.error("Reconciliation of ISIN %s failed: %s", task.cval, error)
+        self.leased(task).update(
+            status=(
+                ReconciliationTask.FAILED
+                if task.attempts >= self.max_attempts
+                else ReconciliationTask.PENDING
+            ),
+            locked_at=None,
+            error=str(error),
+        )
+
+    def release(self, tasks: list[ReconciliationTask]) -> None:
+        """Returns claimed tasks to the queue without counting the attempt."""
+        ReconciliationTask.objects.filter(
+            pk__in=[task.pk for task in tasks],
+            status=ReconciliationTask.RUNNING,
+            locked_at__in={task.locked_at for task in tasks},
+        ).update(
+            status=ReconciliationTask.PENDING,
+            locked_at=None,
+            attempts=F("attempts") - 1,
+        )
+
+    def finish(self, progress: ReconciliationProgress) -> None:
+        """Counts what is left of the run and completes it once it is drained."""
+        counts: dict[str, int] = dict(
+            self.run.tasks.values_list("status").annotate(count=Count("pk")).order_by()
+        )
+        progress.failed = counts.get(ReconciliationTask.FAILED, 0)
+        progress.remaining = counts.get(ReconciliationTask.PENDING, 0) + counts.get(
+            ReconciliationTask.RUNNING, 0
+        )
+        if not progress.remaining:
+            ReconciliationRun.objects.filter(pk=self.run.pk).update(
+                status=ReconciliationRun.COMPLETED, finished_at=timezone.now()
+            )
+            logger.info(
+                "Reconciliation run %s completed with %d failed ISINs",
+                self.run.pk,
+                progress.failed,
+            )
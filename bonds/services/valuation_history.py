@@ -0,0 +1,126 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterator
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, QuerySet, Sum
+from ..expressions import DaysUntil
+from ..models import Bond, PortfolioValuationSnapshot
+from .portfolio_analysis import PortfolioAnalysisService
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def date_range(start: date, end: date) -> Iterator[date]:
+    """Yields every day from ``start`` to ``end`` inclusive."""
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+def held_on(valuation_date: date) -> QuerySet[Bond]:
+    """Bonds held on ``valuation_date``: already purchased and not yet matured."""
+    return Bond.objects.filter(
+        purchase_date__lte=valuation_date, maturity_date__gte=valuation_date
+    )
+
+
+def snapshot_day(valuation_date: date) -> int:
+    """
+    Values every owner's portfolio as of ``valuation_date`` with one
+    ``GROUP BY owner`` query and replaces that day's snapshots with the
+    result. Returns the number of snapshots written.
+    """
+    rows: QuerySet = (
+        held_on(valuation_date)
+        .values("owner_id")
+        .annotate(
+            bond_count=Count("pk"),
+            total_value=Sum("tval"),
+            interest_rate_sum=Sum("interest_rate"),
+            weighted_days=Sum(
+                F("tval")
+                * F("interest_rate")
+                * DaysUntil(F("maturity_date"), valuation_date),
+                output_field=DecimalField(),
+            ),
+        )
+        .order_by()
+    )
+    snapshots: list[PortfolioValuationSnapshot] = [
+        PortfolioValuationSnapshot(
+            owner_id=row["owner_id"],
+            valuation_date=valuation_date,
+            bond_count=row["bond_count"],
+            total_value=row["total_value"],
+            interest_rate_sum=row["interest_rate_sum"],
+            future_value=PortfolioAnalysisService.future_value_from_sums(
+                row["total_value"], Decimal(row["weighted_days"])
+            ),
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        PortfolioValuationSnapshot.objects.filter(
+            valuation_date=valuation_date
+        ).delete()
+        PortfolioValuationSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+    return len(snapshots)
+
+
+def backfill(start: date, end: date, workers: int = 1, chunk_days: int = 30) -> int:
+    """
+    Snapshots every day of ``start``..``end``. The range is split into chunks
+    of ``chunk_days`` that run on ``workers`` threads, each with its own
+    database connection. SQLite allows a single writer, so there the chunks
+    run one after another. Returns the number of snapshots written.
+    """
+    if connection.vendor == "sqlite":
+        workers = 1
+    chunks: list[tuple[date, date]] = [
+        (
+            start + timedelta(days=offset),
+            min(start + timedelta(days=offset + chunk_days - 1), end),
+        )
+        for offset in range(0, (end - start).days + 1, chunk_days)
+    ]
+    if workers <= 1 or len(chunks) == 1:
+        written: int = sum(snapshot_day(day) for day in date_range(start, end))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            written = sum(executor.map(lambda chunk: _snapshot_chunk(*chunk), chunks))
+    logger.info("Wrote %d portfolio snapshots for %s to %s", written, start, end)
+    return written
+
+
+def _snapshot_chunk(start: date, end: date) -> int:
+    """Runs on a worker thread, which owns its database connection."""
+    try:
+        return sum(snapshot_day(day) for day in date_range(start, end))
+    finally:
+        connection.close()
+
+
+def history(owner_id: int, start: date, end: date) -> list[dict]:
+    """Returns the owner's stored snapshots from ``start`` to ``end`` by date."""
+    return [
+        {
+            "date": row["valuation_date"],
+            "bond_count": row["bond_count"],
+            "total_value": row["total_value"],
+            "average_interest_rate": row["interest_rate_sum"]
+            / Decimal(row["bond_count"]),
+            "future_value": row["future_value"],
+        }
+        for row in PortfolioValuationSnapshot.objects.filter(
+            owner_id=owner_id, valuation_date__range=(start, end)
+        )
+        .order_by("valuation_date")
+        .values(
+            "valuation_date",
+            "bond_count",
+            "total_value",
+            "interest_rate_sum",
+            "future_value",
+        )
+    ]
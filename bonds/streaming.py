@@ -0,0 +1,48 @@
+import json
+from typing import Iterable, Iterator
+from rest_framework.utils.encoders import JSONEncoder
+
+# Same encoding options as rest_framework.renderers.JSONRenderer
+_encoder: JSONEncoder = JSONEncoder(
+    ensure_ascii=False, allow_nan=False, separators=(",", ":")
+)
+
+
+def _chunks(rows: Iterable[dict], chunk_size: int) -> Iterator[list[str]]:
+    """Encodes rows to JSON strings and groups them into lists of ``chunk_size``."""
+    chunk: list[str] = []
+    for row in rows:
+        # JSONRenderer escapes these separators for JavaScript compatibility
+        chunk.append(
+            _encoder.encode(row)
+            .replace("\u2028", "\\u2028")
+            .replace("\u2029", "\\u2029")
+        )
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_json_array(rows: Iterable[dict], chunk_size: int = 500) -> Iterator[bytes]:
+    """Streams ``rows`` as a single JSON array, one chunk of rows at a time."""
+    yield b"["
+    separator: str = ""
+    for chunk in _chunks(rows, chunk_size):
+        yield (separator + ",".join(chunk)).encode()
+        separator = ","
+    yield b"]"
+
+
+def stream_ndjson(rows: Iterable[dict], chunk_size: int = 500) -> Iterator[bytes]:
+    """Streams ``rows`` as newline-delimited JSON, one chunk of rows at a time."""
+    for chunk in _chunks(rows, chunk_size):
+        yield ("\n".join(chunk) + "\n").encode()
+
+
+# Streaming formats accepted by ``?stream=`` and their content types
+STREAM_FORMATS: dict[str, tuple] = {
+    "json": (stream_json_array, "application/json"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+}
@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class CDCPStubServer:
+    """
+    Local HTTP server imitating the CDCP ``VydaneISINy`` endpoint for tests.
+
+    By default every ISIN is known. ``records`` overrides the record returned
+    for an ISIN (``None`` means unknown). ``script`` queues (status, delay)
+    responses that are served before falling back to the default behaviour.
+    """
+
+    def __init__(self) -> None:
+        self.records: dict[str, dict | None] = {}
+        self.script: deque[tuple[int, float]] = deque()
+        self.request_count: int = 0
+        self.connections: set[int] = set()
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer(
+            ("127.0.0.1", 0), self._handler_class()
+        )
+        self._server.daemon_threads = True
+        self._thread: threading.Thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def url_template(self) -> str:
+        """URL template compatible with ``CDCPService.API_URL_TEMPLATE``."""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/isbpublicjson/api/VydaneISINy?isin={{}}"
+
+    def __enter__(self) -> "CDCPStubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def record_for(self, isin: str) -> dict | None:
+        """Returns the CDCP record served for ``isin``."""
+        if isin in self.records:
+            return self.records[isin]
+        return {"cval": isin, "ison": f"Bond {isin}", "ename": "Issuer", "pdcp": "list"}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        stub: CDCPStubServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version: str = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                with stub._lock:
+                    stub.request_count += 1
+                    stub.connections.add(self.client_address[1])
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    status, delay = stub.script.popleft() if stub.script else (200, 0)
+                try:
+                    time.sleep(delay)
+                    isin: str = parse_qs(urlparse(self.path).query).get("isin", [""])[0]
+                    record: dict | None = stub.record_for(isin)
+                    body: bytes = json.dumps(
+                        {"vydaneisiny": [record] if record else []}
+                    ).encode()
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
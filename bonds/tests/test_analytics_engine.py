@@ -0,0 +1,124 @@
+import math
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.test import TestCase
+from bonds.models import Bond
+from bonds.services.analytics_engine import PortfolioColumns, VectorizedPortfolioEngine
+from bonds.services.portfolio_analysis import PortfolioAnalysisService
+from bonds.tests.test_portfolio_analysis import seed_bonds
+
+VALUATION_DATE: date = date(2025, 6, 1)
+UNIT_ROUNDOFF: float = 2.0**-53
+
+
+def error_bound(future_values: list[Decimal]) -> float:
+    """Documented bound of the engine's future value sum."""
+    count: int = max(len(future_values), 1)
+    return (
+        (8 + math.ceil(math.log2(count)))
+        * UNIT_ROUNDOFF
+        * float(sum(abs(value) for value in future_values))
+    )
+
+
+class VectorizedPortfolioEngineTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner: User = User.objects.create_user(username="owner", password="x")
+        cls.other: User = User.objects.create_user(username="other", password="x")
+        seed_bonds(cls.owner, 300, start=date(2024, 1, 1))
+        seed_bonds(cls.other, 50, start=date(2026, 1, 1))
+
+    def decimal_future_values(self, bonds) -> list[Decimal]:
+        return [
+            PortfolioAnalysisService.future_value(
+                bond.tval, bond.interest_rate, bond.maturity_date, VALUATION_DATE
+            )
+            for bond in bonds
+        ]
+
+    def test_future_value_sum_matches_decimal_path(self):
+        bonds = Bond.objects.filter(owner=self.owner)
+        future_values: list[Decimal] = self.decimal_future_values(bonds)
+
+        vectorized: float = PortfolioAnalysisService.future_value_sum(
+            bonds, VALUATION_DATE, vectorized=True
+        )
+
+        self.assertLessEqual(
+            abs(Decimal(repr(vectorized)) - sum(future_values)),
+            Decimal(repr(error_bound(future_values))),
+        )
+
+    def test_analysis_matches_python_mode(self):
+        bonds = Bond.objects.filter(owner=self.owner)
+        expected: dict = PortfolioAnalysisService.python_analysis(bonds)
+
+        result: dict = PortfolioAnalysisService.analyze(bonds, mode="vectorized")
+
+        self.assertEqual(
+            result["nearest_maturity_bond"], expected["nearest_maturity_bond"]
+        )
+        for key in ("average_interest_rate", "total_value", "future_value"):
+            self.assertAlmostEqual(result[key], expected[key], places=6)
+
+    def test_by_owner_matches_single_portfolios(self):
+        engine: VectorizedPortfolioEngine = VectorizedPortfolioEngine(
+            PortfolioColumns.from_queryset(Bond.objects.all()), VALUATION_DATE
+        )
+
+        by_owner: dict = engine.by_owner()
+
+        self.assertEqual(set(by_owner), {self.owner.pk, self.other.pk})
+        for owner in (self.owner, self.other):
+            single: dict = VectorizedPortfolioEngine(
+                PortfolioColumns.from_queryset(Bond.objects.filter(owner=owner)),
+                VALUATION_DATE,
+            ).summary()
+            self.assertEqual(by_owner[owner.pk]["bond_count"], single["bond_count"])
+            for key in ("total_value", "future_value", "duration"):
+                self.assertAlmostEqual(
+                    by_owner[owner.pk][key], single[key], delta=1e-9 * single[key]
+                )
+
+    def test_valuation_date_and_rate_shift(self):
+        bond: Bond = Bond.objects.filter(
+            owner=self.owner, maturity_date__gt=VALUATION_DATE
+        ).first()
+        columns: PortfolioColumns = PortfolioColumns.from_bonds([bond])
+        later: date = VALUATION_DATE + timedelta(days=30)
+
+        today_value: float = VectorizedPortfolioEngine(
+            columns, VALUATION_DATE
+        ).future_values()[0]
+        later_value: float = VectorizedPortfolioEngine(columns, later).future_values()[
+            0
+        ]
+        shifted_value: float = VectorizedPortfolioEngine(
+            columns, VALUATION_DATE, rate_shift=1.0
+        ).future_values()[0]
+
+        self.assertAlmostEqual(
+            today_value,
+            float(
+                PortfolioAnalysisService.future_value(
+                    bond.tval, bond.interest_rate, bond.maturity_date, VALUATION_DATE
+                )
+            ),
+        )
+        self.assertLess(later_value, today_value)
+        self.assertGreater(shifted_value, today_value)
+
+    def test_empty_portfolio(self):
+        engine: VectorizedPortfolioEngine = VectorizedPortfolioEngine(
+            PortfolioColumns.from_queryset(Bond.objects.none())
+        )
+
+        self.assertEqual(engine.summary()["bond_count"], 0)
+        self.assertEqual(engine.by_owner(), {})
+        self.assertIsNone(engine.nearest_bond_id())
+        self.assertEqual(
+            PortfolioAnalysisService.analyze(Bond.objects.none(), mode="vectorized"),
+            PortfolioAnalysisService.python_analysis(Bond.objects.none()),
+        )
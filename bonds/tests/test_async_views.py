@@ -0,0 +1,176 @@
+import asyncio
+import json
+import time
+from datetime import date
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from bonds.models import Bond
+from bonds.services.cdcp_service import CDCPService
+from bonds.tests.test_portfolio_analysis import seed_bonds
+from users.token_cache import token_cache
+
+ASYNC_URL: str = "/api/bonds/async/"
+
+# Seconds the stubbed CDCP lookup takes
+CDCP_DELAY: float = 0.2
+
+BOND_DATA: dict[str, str] = {
+    "cval": "CZ0003551251",
+    "ison": "Rentico Invest/11.23 DEB 20260531",
+    "tval": "100.00",
+    "pdcp": "list",
+    "regdt": "2023-05-24",
+    "eico": "0019319703",
+    "ename": "Rentico Invest s.r.o.",
+    "elei": "315700PZ559GOUR26559",
+    "interest_rate": "5.00",
+    "purchase_date": "2023-01-01",
+    "maturity_date": "2025-05-31",
+    "interest_frequency": "Semiannual",
+}
+
+
+async def slow_cdcp_lookup(self, cval: str) -> dict:
+    await asyncio.sleep(CDCP_DELAY)
+    return {"vydaneisiny": [{"cval": cval}]}
+
+
+class AsyncBondViewsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user: User = User.objects.create_user(username="owner", password="x")
+        self.bonds: list[Bond] = seed_bonds(self.user, 6, start=date(2024, 1, 1))
+        seed_bonds(User.objects.create_user(username="other", password="x"), 2)
+        self.token: Token = Token.objects.create(user=self.user)
+        self.auth: dict[str, str] = {"Authorization": f"Token {self.token.key}"}
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    async def test_reads_match_the_sync_endpoints(self):
+        bond_id: int = self.bonds[0].pk
+        for async_path, sync_path in (
+            ("manage/", "/api/bonds/manage/"),
+            (f"manage/{bond_id}/", f"/api/bonds/manage/{bond_id}/"),
+            ("analysis/", "/api/bonds/analysis/"),
+        ):
+            with self.subTest(path=async_path):
+                response = await self.async_client.get(
+                    ASYNC_URL + async_path, headers=self.auth
+                )
+                expected = await sync_to_async(self.api_client.get)(sync_path)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, expected.content)
+
+    async def test_retrieve_is_scoped_to_the_owner_and_conditional(self):
+        other_bond: Bond = await Bond.objects.exclude(owner=self.user).afirst()
+        response = await self.async_client.get(
+            f"{ASYNC_URL}manage/{other_bond.pk}/", headers=self.auth
+        )
+        self.assertEqual(response.status_code, 404)
+
+        url: str = f"{ASYNC_URL}manage/{self.bonds[0].pk}/"
+        etag: str = (await self.async_client.get(url, headers=self.auth))["ETag"]
+        response = await self.async_client.get(
+            url, headers={**self.auth, "If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_requires_a_valid_token(self):
+        response = await self.async_client.get(ASYNC_URL + "manage/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+        response = await self.async_client.get(
+            ASYNC_URL + "manage/", headers={"Authorization": "Token nope"}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"detail": "Invalid token."})
+
+    @mock.patch.object(CDCPService, "_afetch_cdcp_data", slow_cdcp_lookup)
+    async def test_concurrent_creates_overlap_their_cdcp_calls(self):
+        count: int = 5
+        started: float = time.perf_counter()
+        responses: list = await asyncio.gather(
+            *(
+                self.async_client.post(
+                    ASYNC_URL + "manage/",
+                    {**BOND_DATA, "ison": f"Bond {index}"},
+                    content_type="application/json",
+                    headers=self.auth,
+                )
+                for index in range(count)
+            )
+        )
+        elapsed: float = time.perf_counter() - started
+
+        self.assertEqual(
+            [response.status_code for response in responses], [201] * count
+        )
+        self.assertLess(elapsed, count * CDCP_DELAY)
+        self.assertEqual(
+            await Bond.objects.filter(owner=self.user, ison__startswith="Bond ")
+            .exclude(pk__in=[bond.pk for bond in self.bonds])
+            .acount(),
+            count,
+        )
+        analysis: dict = (
+            await self.async_client.get(ASYNC_URL + "analysis/", headers=self.auth)
+        ).json()
+        self.assertEqual(
+            analysis["total_value"],
+            float(sum(bond.tval for bond in self.bonds)) + count * 100,
+        )
+
+    async def test_create_reports_validation_and_cdcp_errors(self):
+        response = await self.async_client.post(
+            ASYNC_URL + "manage/",
+            {**BOND_DATA, "cval": "CZ0003551252", "tval": "x"},
+            content_type="application/json",
+            headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"cval", "tval"})
+
+        with mock.patch.object(
+            CDCPService,
+            "_afetch_cdcp_data",
+            side_effect=ValidationError("CDCP is down."),
+        ):
+            response = await self.async_client.post(
+                ASYNC_URL + "manage/",
+                BOND_DATA,
+                content_type="application/json",
+                headers=self.auth,
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"cval": ["CDCP is down."]})
+
+    async def test_create_rejects_a_body_that_is_not_an_object(self):
+        response = await self.async_client.post(
+            ASYNC_URL + "manage/",
+            json.dumps("cvalue"),
+            content_type="application/json",
+            headers=self.auth,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.json())
+
+    async def test_invalid_payload_skips_the_cdcp_check(self):
+        with mock.patch.object(CDCPService, "_afetch_cdcp_data") as fetch:
+            response = await self.async_client.post(
+                ASYNC_URL + "manage/",
+                {**BOND_DATA, "tval": "x"},
+                content_type="application/json",
+                headers=self.auth,
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"tval"})
+        fetch.assert_not_called()
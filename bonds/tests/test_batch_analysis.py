@@ -0,0 +1,122 @@
+import csv
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from bonds.models import Bond, PortfolioAnalysisResult
+from bonds.services.batch_analysis import BatchPortfolioAnalysis, owner_chunks
+from bonds.services.portfolio_analysis import PortfolioAnalysisService
+from bonds.tests.test_portfolio_analysis import seed_bonds
+
+VALUATION_DATE: date = date(2025, 3, 1)
+
+
+class BatchPortfolioAnalysisTestCase(TestCase):
+    def setUp(self):
+        self.owners: list[User] = [
+            User.objects.create_user(username=f"owner{index}", password="x")
+            for index in range(5)
+        ]
+        for index, owner in enumerate(self.owners):
+            seed_bonds(owner, 5 + 7 * index, start=date(2024, 1, 1))
+
+    def test_results_match_the_per_owner_analysis(self):
+        progress = BatchPortfolioAnalysis(VALUATION_DATE, owners_per_chunk=2).run()
+
+        self.assertEqual((progress.analyzed_owners, progress.total_owners), (5, 5))
+        for owner in self.owners:
+            bonds: list[Bond] = list(Bond.objects.filter(owner=owner))
+            result: PortfolioAnalysisResult = PortfolioAnalysisResult.objects.get(
+                owner=owner, valuation_date=VALUATION_DATE
+            )
+            self.assertEqual(result.bond_count, len(bonds))
+            self.assertEqual(
+                result.total_value, PortfolioAnalysisService.total_value(bonds)
+            )
+            self.assertAlmostEqual(
+                result.average_interest_rate,
+                PortfolioAnalysisService.average_interest_rate(bonds),
+                delta=Decimal("0.000001"),
+            )
+            self.assertAlmostEqual(
+                result.future_value,
+                PortfolioAnalysisService.future_value_sum(bonds, VALUATION_DATE),
+                delta=Decimal("0.0001"),
+            )
+            self.assertEqual(
+                result.nearest_maturity_bond,
+                PortfolioAnalysisService.nearest_bond(bonds).ison,
+            )
+
+    def test_resume_skips_stored_owners(self):
+        BatchPortfolioAnalysis(VALUATION_DATE).run()
+        PortfolioAnalysisResult.objects.filter(owner__in=self.owners[3:]).delete()
+        kept: list[int] = list(
+            PortfolioAnalysisResult.objects.order_by("pk").values_list("pk", flat=True)
+        )
+
+        progress = BatchPortfolioAnalysis(VALUATION_DATE, resume=True).run()
+
+        self.assertEqual((progress.skipped_owners, progress.analyzed_owners), (3, 2))
+        self.assertEqual(PortfolioAnalysisResult.objects.count(), 5)
+        self.assertEqual(PortfolioAnalysisResult.objects.filter(pk__in=kept).count(), 3)
+
+    def test_rerun_without_resume_replaces_the_date(self):
+        BatchPortfolioAnalysis(VALUATION_DATE).run()
+        Bond.objects.filter(owner=self.owners[0]).delete()
+
+        progress = BatchPortfolioAnalysis(VALUATION_DATE).run()
+
+        self.assertEqual(progress.analyzed_owners, 4)
+        self.assertFalse(
+            PortfolioAnalysisResult.objects.filter(owner=self.owners[0]).exists()
+        )
+
+    def test_command_reports_progress_and_exports_csv(self):
+        output: StringIO = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "results.csv"
+            call_command(
+                "analyze_portfolios",
+                "--valuation-date",
+                VALUATION_DATE.isoformat(),
+                "--workers",
+                "1",
+                "--owners-per-chunk",
+                "2",
+                "--output",
+                str(path),
+                stdout=output,
+            )
+            with path.open(newline="") as exported:
+                rows: list[dict] = list(csv.DictReader(exported))
+
+        self.assertIn("5/5 owners", output.getvalue())
+        self.assertIn("Exported 5 rows", output.getvalue())
+        self.assertEqual(
+            [int(row["owner_id"]) for row in rows], [owner.pk for owner in self.owners]
+        )
+        stored: PortfolioAnalysisResult = PortfolioAnalysisResult.objects.get(
+            owner=self.owners[0]
+        )
+        self.assertEqual(Decimal(rows[0]["total_value"]), stored.total_value)
+
+    def test_command_rejects_unknown_output_formats(self):
+        with self.assertRaises(CommandError):
+            call_command("analyze_portfolios", "--output", "results.xlsx")
+
+
+class OwnerChunksTestCase(SimpleTestCase):
+    def test_chunks_hold_whole_portfolios(self):
+        rows: list[tuple] = [(1, "a"), (1, "b"), (2, "c"), (3, "d"), (3, "e")]
+
+        chunks = list(owner_chunks(rows, owners_per_chunk=2, skip={2}))
+
+        self.assertEqual(
+            chunks,
+            [[(1, [(1, "a"), (1, "b")]), (3, [(3, "d"), (3, "e")])]],
+        )
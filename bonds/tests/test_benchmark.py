@@ -0,0 +1,102 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase
+from benchmarks.api import compare, load_scenarios, percentile
+
+
+class BenchmarkApiCommandTestCase(TestCase):
+    def setUp(self):
+        self.output: Path = Path(tempfile.mkdtemp()) / "results.json"
+
+    def run_benchmark(self, **options) -> dict:
+        call_command(
+            "benchmark_api",
+            users=2,
+            bonds=5,
+            requests=30,
+            warmup=0,
+            allocation_samples=1,
+            use_current_db=True,
+            output=self.output,
+            stdout=StringIO(),
+            **options,
+        )
+        return json.loads(self.output.read_text())
+
+    def test_reports_every_endpoint_of_the_scenario(self):
+        results: dict = self.run_benchmark(scenarios=["mixed"])
+
+        scenario: dict = results["scenarios"]["mixed"]
+        self.assertEqual(set(scenario["endpoints"]), set(load_scenarios()["mixed"].mix))
+        self.assertEqual(
+            sum(endpoint["count"] for endpoint in scenario["endpoints"].values()), 30
+        )
+        for endpoint in scenario["endpoints"].values():
+            self.assertEqual(endpoint["errors"], 0)
+            self.assertEqual(
+                set(endpoint["latency_ms"]), {"mean", "p50", "p95", "p99", "max"}
+            )
+            if endpoint["count"]:
+                self.assertGreater(endpoint["queries"]["mean"], 0)
+                self.assertGreater(endpoint["allocated_peak_kib"]["max"], 0)
+
+    def test_baseline_regression_fails(self):
+        baseline: dict = self.run_benchmark(scenarios=["analysis"])
+        for endpoint in baseline["scenarios"]["analysis"]["endpoints"].values():
+            endpoint["queries"]["mean"] /= 10
+        baseline_file: Path = self.output.with_name("baseline.json")
+        baseline_file.write_text(json.dumps(baseline))
+
+        with self.assertRaisesMessage(CommandError, "queries mean"):
+            self.run_benchmark(scenarios=["analysis"], baseline=baseline_file)
+
+    def test_unknown_scenario(self):
+        with self.assertRaisesMessage(CommandError, "Unknown scenarios: nope"):
+            self.run_benchmark(scenarios=["nope"])
+
+
+class BenchmarkHelpersTestCase(SimpleTestCase):
+    def test_percentile(self):
+        values: list[float] = [float(value) for value in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.5)
+        self.assertAlmostEqual(percentile(values, 99), 99.01)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_compare_ignores_unchanged_results(self):
+        results: dict = {
+            "scenarios": {
+                "mixed": {
+                    "endpoints": {
+                        "list": {"latency_ms": {"p95": 5.0}, "queries": {"mean": 2.0}}
+                    }
+                }
+            }
+        }
+        self.assertEqual(compare(results, results, 0.25), [])
+
+
+class BenchmarkServerCommandTestCase(LiveServerTestCase):
+    def test_loads_the_server_with_a_temporary_user(self):
+        output: Path = Path(tempfile.mkdtemp()) / "server.json"
+
+        call_command(
+            "benchmark_server",
+            self.live_server_url,
+            bonds=5,
+            concurrency=2,
+            requests=20,
+            warmup=2,
+            output=output,
+            stdout=StringIO(),
+        )
+
+        summary: dict = json.loads(output.read_text())["servers"][self.live_server_url]
+        self.assertEqual(summary["requests"], 20)
+        self.assertEqual(summary["errors"], 0)
+        self.assertGreater(summary["throughput_rps"], 0)
+        self.assertFalse(User.objects.exists())
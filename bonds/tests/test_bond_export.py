@@ -0,0 +1,101 @@
+import csv
+import gzip
+import io
+import json
+import tempfile
+import unittest
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from bonds.export import accepts_gzip, parquet_available
+from bonds.tests.test_portfolio_analysis import seed_bonds
+
+EXPORT_URL: str = "/api/bonds/export/{}/"
+
+
+class BondExportTestCase(TestCase):
+    def setUp(self):
+        self.user: User = User.objects.create_user(username="owner", password="x")
+        seed_bonds(self.user, 25, start=date(2024, 1, 1))
+        seed_bonds(User.objects.create_user(username="other", password="x"), 5)
+        token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.listed: list[dict] = sorted(
+            self.api_client.get("/api/bonds/manage/").json(), key=lambda row: row["id"]
+        )
+
+    def export(self, export_format: str, **headers) -> StreamingHttpResponse:
+        response = self.api_client.get(EXPORT_URL.format(export_format), **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response
+
+    def test_ndjson_rows_match_the_list_endpoint(self):
+        response = self.export("ndjson")
+
+        rows: list[dict] = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).split(b"\n")
+            if line
+        ]
+        self.assertEqual(rows, self.listed)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_csv_is_gzipped_when_accepted(self):
+        response = self.export("csv", HTTP_ACCEPT_ENCODING="br, gzip;q=0.8")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn('filename="bonds.csv"', response["Content-Disposition"])
+        text: str = gzip.decompress(b"".join(response.streaming_content)).decode()
+        rows: list[dict] = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(
+            rows,
+            [{key: str(value) for key, value in row.items()} for row in self.listed],
+        )
+
+    @unittest.skipUnless(parquet_available(), "pyarrow is not installed")
+    def test_parquet_export(self):
+        import pyarrow.parquet as pq
+
+        response = self.export("parquet")
+
+        table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(
+            table.column("id").to_pylist(), [row["id"] for row in self.listed]
+        )
+        self.assertEqual(
+            [str(value) for value in table.column("tval").to_pylist()],
+            [row["tval"] for row in self.listed],
+        )
+
+    def test_unknown_format(self):
+        response = self.api_client.get(EXPORT_URL.format("xlsx"))
+        self.assertEqual(response.status_code, 404)
+
+    def test_command_writes_a_gzipped_file(self):
+        output: StringIO = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "bonds.ndjson.gz"
+            call_command("export_bonds", str(path), "--owner", "owner", stdout=output)
+            with gzip.open(path, "rt") as exported:
+                rows: list[dict] = [json.loads(line) for line in exported]
+
+        self.assertEqual(rows, self.listed)
+        self.assertIn("Wrote", output.getvalue())
+
+
+class AcceptEncodingTestCase(SimpleTestCase):
+    def test_gzip_negotiation(self):
+        self.assertTrue(accepts_gzip("gzip, deflate"))
+        self.assertTrue(accepts_gzip("*"))
+        self.assertFalse(accepts_gzip("gzip;q=0, br"))
+        self.assertFalse(accepts_gzip("identity"))
+        self.assertFalse(accepts_gzip(""))
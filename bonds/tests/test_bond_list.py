@@ -0,0 +1,81 @@
+import json
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from bonds.models import Bond
+from bonds.tests.test_portfolio_analysis import seed_bonds
+
+
+class BondListTestCase(TestCase):
+    def setUp(self):
+        self.user: User = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        # Many bonds share a maturity date so pages split inside ties
+        seed_bonds(self.user, 45, start=date.today())
+        Bond.objects.filter(pk__in=Bond.objects.values("pk")[:20]).update(
+            maturity_date=date.today() + timedelta(days=30)
+        )
+        other: User = User.objects.create_user(username="other", password="password")
+        seed_bonds(other, 5)
+
+    def expected_ids(self) -> list[int]:
+        return list(
+            Bond.objects.filter(owner=self.user)
+            .order_by("maturity_date", "id")
+            .values_list("id", flat=True)
+        )
+
+    def test_unpaginated_list_is_ordered_by_maturity(self):
+        response: Response = self.api_client.get("/api/bonds/manage/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()], self.expected_ids())
+
+    def test_keyset_pagination_walks_all_pages(self):
+        ids: list[int] = []
+        url: str | None = "/api/bonds/manage/?page_size=7"
+        pages: int = 0
+        while url:
+            response: Response = self.api_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body: dict = response.json()
+            self.assertLessEqual(len(body["results"]), 7)
+            ids.extend(row["id"] for row in body["results"])
+            url = body["next"]
+            pages += 1
+        self.assertEqual(ids, self.expected_ids())
+        self.assertEqual(pages, 7)
+
+    def test_invalid_cursor(self):
+        response: Response = self.api_client.get("/api/bonds/manage/?cursor=bogus")
+        self.assertEqual(response.status_code, 404)
+
+    def test_stream_json_matches_regular_response(self):
+        regular: Response = self.api_client.get("/api/bonds/manage/")
+        streamed: StreamingHttpResponse = self.api_client.get(
+            "/api/bonds/manage/?stream=json"
+        )
+        self.assertEqual(streamed.status_code, 200)
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(b"".join(streamed.streaming_content), regular.content)
+
+    def test_stream_ndjson(self):
+        streamed: StreamingHttpResponse = self.api_client.get(
+            "/api/bonds/manage/?stream=ndjson"
+        )
+        self.assertEqual(streamed["Content-Type"], "application/x-ndjson")
+        lines: list[bytes] = b"".join(streamed.streaming_content).splitlines()
+        self.assertEqual(
+            [json.loads(line)["id"] for line in lines], self.expected_ids()
+        )
+
+    def test_stream_rejects_unknown_format(self):
+        response: Response = self.api_client.get("/api/bonds/manage/?stream=xml")
+        self.assertEqual(response.status_code, 400)
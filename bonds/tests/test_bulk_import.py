@@ -0,0 +1,116 @@
+import json
+import re
+import responses
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework.response import Response
+from rest_framework.authtoken.models import Token
+from bonds.models import Bond
+from bonds.services.cdcp_cache import cdcp_cache
+from bonds.services.cdcp_client import reset_cdcp_client
+
+
+class BondBulkImportTestCase(TestCase):
+    def setUp(self):
+        cdcp_cache.clear()
+        reset_cdcp_client()
+        cache.clear()
+        self.user: User = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+        self.row: dict[str, str] = {
+            "cval": "CZ0003551269",
+            "ison": "Rentico Invest/11.23 DEB 20260531",
+            "tval": "100.00",
+            "pdcp": "list",
+            "regdt": "2023-05-24",
+            "eico": "0019319703",
+            "ename": "Rentico Invest s.r.o.",
+            "elei": "315700PZ559GOUR26559",
+            "interest_rate": "5.00",
+            "purchase_date": "2023-01-01",
+            "maturity_date": "2025-05-31",
+            "interest_frequency": "Semiannual",
+        }
+        responses.start()
+        responses.get(
+            re.compile(r"https://www\.cdcp\.cz/.*"),
+            json={"vydaneisiny": [{"cval": "CZ0003551269"}]},
+        )
+        self.addCleanup(responses.reset)
+        self.addCleanup(responses.stop)
+
+    def _rows(self, *cvals: str) -> list[dict[str, str]]:
+        return [{**self.row, "cval": cval} for cval in cvals]
+
+    def test_bulk_import_json_array(self):
+        rows: list[dict[str, str]] = self._rows(
+            "CZ0003551269", "CZ0003551269", "CZ0003551277"
+        )
+        response: Response = self.api_client.post(
+            "/api/bonds/manage/bulk/?batch_size=2", rows, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"created": 3, "errors": []})
+        self.assertEqual(Bond.objects.filter(owner=self.user).count(), 3)
+        # One CDCP call per distinct ISIN
+        self.assertEqual(len(responses.calls), 2)
+
+    def test_bulk_import_ndjson(self):
+        body: str = "\n".join(
+            json.dumps(row) for row in self._rows("CZ0003551269", "CZ0003551285")
+        )
+        response: Response = self.api_client.post(
+            "/api/bonds/manage/bulk/",
+            data=body + "\n",
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Bond.objects.count(), 2)
+
+    def test_bulk_import_reports_errors_per_row(self):
+        rows: list[dict[str, str]] = self._rows(
+            "CZ0003551269", "INVALIDISIN", "CZ0003551277"
+        )
+        del rows[2]["ison"]
+        response: Response = self.api_client.post(
+            "/api/bonds/manage/bulk/", rows, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        errors: list[dict] = response.json()["errors"]
+        self.assertEqual([error["row"] for error in errors], [1, 2])
+        self.assertIn("cval", errors[0]["errors"])
+        self.assertIn("ison", errors[1]["errors"])
+        self.assertEqual(Bond.objects.count(), 0)
+        # Malformed rows never reach CDCP
+        self.assertEqual(len(responses.calls), 1)
+
+    def test_bulk_import_rejects_wrong_check_digits_before_cdcp(self):
+        rows: list[dict[str, str]] = self._rows("CZ0003551250", " CZ0003551250 ")
+        response: Response = self.api_client.post(
+            "/api/bonds/manage/bulk/", rows, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [error["errors"] for error in response.json()["errors"]],
+            [{"cval": ["Invalid ISIN check digit."]}] * 2,
+        )
+        self.assertEqual(len(responses.calls), 0)
+
+    def test_bulk_import_rejects_non_list(self):
+        response: Response = self.api_client.post(
+            "/api/bonds/manage/bulk/", self.row, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_import_rejects_invalid_batch_size(self):
+        response: Response = self.api_client.post(
+            "/api/bonds/manage/bulk/?batch_size=0", self._rows(), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,55 @@
+import responses
+from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from bonds.services.cdcp_cache import cdcp_cache
+from bonds.services.cdcp_client import reset_cdcp_client
+from bonds.services.cdcp_service import CDCPService
+
+
+class CDCPCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cdcp_cache.clear()
+        reset_cdcp_client()
+        cdcp_cache.reset_stats()
+        cache.clear()
+        self.service: CDCPService = CDCPService()
+        self.cval: str = "CZ0003551251"
+        self.url: str = CDCPService.API_URL_TEMPLATE.format(self.cval)
+
+    @responses.activate
+    def test_repeated_lookup_is_served_from_cache(self):
+        responses.get(self.url, json={"vydaneisiny": [{"cval": self.cval}]})
+        self.assertTrue(self.service.is_cdcp_bond_data_matching(self.cval))
+        self.assertTrue(self.service.is_cdcp_bond_data_matching(self.cval))
+        self.assertEqual(len(responses.calls), 1)
+        stats: dict = cdcp_cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["local_hits"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    @responses.activate
+    def test_shared_tier_survives_local_eviction(self):
+        responses.get(self.url, json={"vydaneisiny": [{"cval": self.cval}]})
+        self.service.is_cdcp_bond_data_matching(self.cval)
+        cdcp_cache.clear()
+        self.service.is_cdcp_bond_data_matching(self.cval)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(cdcp_cache.stats()["shared_hits"], 1)
+
+    @responses.activate
+    def test_unknown_isin_is_cached_negatively(self):
+        responses.get(self.url, json={"vydaneisiny": []})
+        self.assertFalse(self.service.is_cdcp_bond_data_matching(self.cval))
+        self.assertFalse(self.service.is_cdcp_bond_data_matching(self.cval))
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(cdcp_cache.stats()["negative_hits"], 1)
+
+    @responses.activate
+    def test_errors_are_not_cached(self):
+        responses.get(self.url, status=500)
+        responses.get(self.url, json={"vydaneisiny": [{"cval": self.cval}]})
+        with self.assertRaises(ValidationError):
+            self.service.is_cdcp_bond_data_matching(self.cval)
+        self.assertTrue(self.service.is_cdcp_bond_data_matching(self.cval))
+        self.assertEqual(len(responses.calls), 2)
@@ -0,0 +1,180 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import requests
+from django.test import SimpleTestCase
+from bonds.services.cdcp_client import (
+    AsyncCDCPClient,
+    CDCPClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    get_cdcp_client,
+    reset_cdcp_client,
+)
+from bonds.tests.cdcp_stub import CDCPStubServer
+
+
+class CDCPClientTestCase(SimpleTestCase):
+    def setUp(self):
+        self.stub: CDCPStubServer = CDCPStubServer()
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+        self.client: CDCPClient = CDCPClient(
+            connect_timeout=1,
+            read_timeout=0.5,
+            max_retries=2,
+            backoff_base=0.001,
+            backoff_max=0.01,
+            max_concurrency=2,
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.2),
+        )
+        self.addCleanup(self.client.close)
+
+    def url(self, isin: str = "CZ0003551251") -> str:
+        return self.stub.url_template.format(isin)
+
+    def test_reuses_pooled_connection(self):
+        for _ in range(3):
+            data: dict = self.client.get_json(self.url())
+        self.assertEqual(data["vydaneisiny"][0]["cval"], "CZ0003551251")
+        self.assertEqual(self.stub.request_count, 3)
+        self.assertEqual(len(self.stub.connections), 1)
+
+    def test_retries_transient_errors(self):
+        self.stub.script.extend([(503, 0), (502, 0)])
+        data: dict = self.client.get_json(self.url())
+        self.assertEqual(data["vydaneisiny"][0]["cval"], "CZ0003551251")
+        self.assertEqual(self.stub.request_count, 3)
+
+    def test_does_not_retry_client_errors(self):
+        self.stub.script.append((404, 0))
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.client.get_json(self.url())
+        self.assertEqual(self.stub.request_count, 1)
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_read_timeout_is_bounded(self):
+        self.stub.script.extend([(200, 1.0)] * 3)
+        started: float = time.monotonic()
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.client.get_json(self.url())
+        self.assertLess(time.monotonic() - started, 3)
+        self.assertEqual(self.stub.request_count, 3)
+
+    def test_circuit_opens_and_recovers(self):
+        self.stub.script.extend([(500, 0), (500, 0)])
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.client.get_json(self.url())
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_json(self.url())
+        self.assertEqual(self.stub.request_count, 2)
+
+        time.sleep(0.25)
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.client.get_json(self.url())
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_unexpected_errors_do_not_wedge_the_half_open_circuit(self):
+        self.stub.script.extend([(500, 0), (500, 0)])
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.client.get_json(self.url())
+        time.sleep(0.25)
+
+        with mock.patch.object(
+            CDCPClient, "request_once", side_effect=ValueError("not JSON")
+        ):
+            with self.assertRaises(ValueError):
+                self.client.get_json(self.url())
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.25)
+        self.client.get_json(self.url())
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_backoff_does_not_hold_a_concurrency_slot(self):
+        client: CDCPClient = CDCPClient(max_retries=1, max_concurrency=1)
+        self.addCleanup(client.close)
+        self.stub.script.append((503, 0))
+
+        with mock.patch.object(client, "backoff_delay", return_value=0.5):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                retrying = executor.submit(client.get_json, self.url())
+                time.sleep(0.1)
+                started: float = time.monotonic()
+                client.get_json(self.url())
+                elapsed: float = time.monotonic() - started
+                retrying.result()
+
+        self.assertLess(elapsed, 0.3)
+
+    def test_concurrency_is_limited(self):
+        self.stub.script.extend([(200, 0.05)] * 8)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: self.client.get_json(self.url()), range(8)))
+        self.assertEqual(self.stub.request_count, 8)
+        self.assertLessEqual(self.stub.max_in_flight, 2)
+
+    def test_async_client_limits_concurrency(self):
+        self.stub.script.extend([(503, 0)] + [(200, 0.05)] * 8)
+        async_client: AsyncCDCPClient = AsyncCDCPClient(self.client)
+
+        async def fetch_all() -> list[dict]:
+            return await asyncio.gather(
+                *(async_client.get_json(self.url(f"CZ000355125{i}")) for i in range(8))
+            )
+
+        results: list[dict] = asyncio.run(fetch_all())
+        self.assertEqual(len(results), 8)
+        self.assertEqual(self.stub.request_count, 9)
+        self.assertLessEqual(self.stub.max_in_flight, 2)
+
+    def test_async_client_works_across_event_loops(self):
+        self.stub.script.extend([(200, 0.02)] * 8)
+        async_client: AsyncCDCPClient = AsyncCDCPClient(self.client)
+
+        async def fetch_all() -> list[dict]:
+            return await asyncio.gather(
+                *(async_client.get_json(self.url()) for _ in range(4))
+            )
+
+        # Contention binds a semaphore to its loop; each run gets its own
+        for _ in range(2):
+            self.assertEqual(len(asyncio.run(fetch_all())), 4)
+        self.assertLessEqual(self.stub.max_in_flight, 2)
+
+
+class CircuitBreakerTestCase(SimpleTestCase):
+    def test_late_call_does_not_free_the_trial_slot(self):
+        breaker: CircuitBreaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=0.05
+        )
+        self.assertEqual(breaker.allow_request(), CircuitBreaker.CLOSED)
+        breaker.record_failure()
+        time.sleep(0.1)
+        self.assertEqual(breaker.allow_request(), CircuitBreaker.HALF_OPEN)
+
+        # The call admitted while the circuit was closed fails after the trial began
+        breaker.record_failure(trial=False)
+        time.sleep(0.1)
+        self.assertIsNone(breaker.allow_request())
+
+        breaker.record_success(trial=True)
+        self.assertEqual(breaker.allow_request(), CircuitBreaker.CLOSED)
+
+
+class CDCPClientSingletonTestCase(SimpleTestCase):
+    def test_reset_builds_a_client_with_a_fresh_breaker(self):
+        self.addCleanup(reset_cdcp_client)
+        client: CDCPClient = get_cdcp_client()
+        for _ in range(client.breaker.failure_threshold):
+            client.breaker.record_failure()
+        self.assertEqual(get_cdcp_client().breaker.state, CircuitBreaker.OPEN)
+
+        reset_cdcp_client()
+
+        self.assertIsNot(get_cdcp_client(), client)
+        self.assertEqual(get_cdcp_client().breaker.state, CircuitBreaker.CLOSED)
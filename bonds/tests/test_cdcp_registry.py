@@ -0,0 +1,123 @@
+import csv
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+import responses
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from bonds.models import CDCPRegistryEntry
+from bonds.services.cdcp_cache import cdcp_cache
+from bonds.services.cdcp_client import reset_cdcp_client
+from bonds.services.cdcp_registry import apply_dump
+from bonds.services.cdcp_service import CDCPService
+
+
+def registry_record(cval: str, ison: str = "Bond") -> dict:
+    return {"cval": cval, "ison": f"{ison} {cval}", "ename": "Issuer", "pdcp": "list"}
+
+
+class LoadCDCPRegistryTestCase(TestCase):
+    def setUp(self):
+        directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory: Path = Path(directory.name)
+
+    def load(self, name: str, *args: str) -> str:
+        output: StringIO = StringIO()
+        call_command(
+            "load_cdcp_registry", str(self.directory / name), *args, stdout=output
+        )
+        return output.getvalue()
+
+    def test_json_and_csv_dumps(self):
+        (self.directory / "dump.json").write_text(
+            json.dumps({"vydaneisiny": [registry_record("CZ0003551251")]})
+        )
+        with (self.directory / "dump.csv").open("w", newline="") as dump:
+            writer: csv.DictWriter = csv.DictWriter(
+                dump, fieldnames=list(registry_record("").keys())
+            )
+            writer.writeheader()
+            writer.writerow(registry_record("CZ0003551269"))
+
+        self.assertIn("1 inserted", self.load("dump.json"))
+        self.assertIn("1 inserted", self.load("dump.csv"))
+        self.assertEqual(
+            CDCPRegistryEntry.objects.get(cval="CZ0003551269").record,
+            registry_record("CZ0003551269"),
+        )
+
+    def test_refresh_writes_only_the_delta(self):
+        records: list[dict] = [
+            registry_record(f"CZ000355{index:04d}") for index in range(5)
+        ]
+        apply_dump(records)
+        records[1] = registry_record(records[1]["cval"], ison="Renamed")
+        records.append(registry_record("CZ0003559999"))
+        dump: Path = self.directory / "delta.ndjson"
+        dump.write_text("\n".join(json.dumps(record) for record in records[1:]))
+
+        output: str = self.load("delta.ndjson", "--prune", "--batch-size", "2")
+
+        self.assertIn(
+            "1 inserted, 1 updated, 3 unchanged, 1 removed, 0 skipped", output
+        )
+        self.assertFalse(
+            CDCPRegistryEntry.objects.filter(cval=records[0]["cval"]).exists()
+        )
+        self.assertEqual(
+            CDCPRegistryEntry.objects.get(cval=records[1]["cval"]).record["ison"],
+            f"Renamed {records[1]['cval']}",
+        )
+
+    def test_records_without_isin_are_skipped(self):
+        result = apply_dump([{"ison": "No ISIN"}, registry_record("CZ0003551251")])
+        self.assertEqual((result.inserted, result.skipped), (1, 1))
+
+
+class CDCPServiceRegistryModeTestCase(TestCase):
+    def setUp(self):
+        cdcp_cache.clear()
+        reset_cdcp_client()
+        cache.clear()
+        self.service: CDCPService = CDCPService()
+        apply_dump([registry_record("CZ0003551251")])
+
+    @responses.activate
+    @override_settings(CDCP_REGISTRY={"MODE": "registry"})
+    def test_listed_isin_skips_the_api(self):
+        self.assertTrue(self.service.is_cdcp_bond_data_matching("CZ0003551251"))
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    @override_settings(CDCP_REGISTRY={"MODE": "registry"})
+    def test_unlisted_isin_falls_back_to_the_api(self):
+        cval: str = "CZ0003551269"
+        responses.get(
+            CDCPService.API_URL_TEMPLATE.format(cval),
+            json={"vydaneisiny": [{"cval": cval}]},
+        )
+        self.assertTrue(self.service.is_cdcp_bond_data_matching(cval))
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    @override_settings(CDCP_REGISTRY={"MODE": "offline"})
+    def test_offline_mode_never_calls_the_api(self):
+        self.assertFalse(self.service.is_cdcp_bond_data_matching("CZ0003551269"))
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    @override_settings(CDCP_REGISTRY={"MODE": "registry"})
+    def test_loading_an_isin_drops_its_negative_cache_entry(self):
+        cval: str = "CZ0003551269"
+        responses.get(
+            CDCPService.API_URL_TEMPLATE.format(cval), json={"vydaneisiny": []}
+        )
+        self.assertFalse(self.service.is_cdcp_bond_data_matching(cval))
+
+        apply_dump([registry_record(cval)])
+
+        self.assertIsNone(cdcp_cache.get(cval))
+        self.assertTrue(self.service.is_cdcp_bond_data_matching(cval))
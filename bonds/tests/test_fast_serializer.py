@@ -0,0 +1,95 @@
+import json
+from datetime import date
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from benchmarks.serialization import compare_paths
+from bonds.models import Bond
+from bonds.renderers import FastJSONRenderer
+from bonds.serializers import BondSerializer, bond_rows
+from bonds.tests.test_portfolio_analysis import seed_bonds
+
+LIST_URL: str = "/api/bonds/manage/"
+
+
+def serializer_settings(fast: bool) -> override_settings:
+    return override_settings(BOND_LIST={**settings.BOND_LIST, "FAST_SERIALIZER": fast})
+
+
+class FastSerializerTestCase(TestCase):
+    def setUp(self):
+        self.user: User = User.objects.create_user(username="owner", password="x")
+        seed_bonds(self.user, 12, start=date(2024, 1, 1))
+        # Values JSONRenderer escapes or formats specially
+        Bond.objects.filter(pk=Bond.objects.values("pk")[:1]).update(
+            ison='Bond "Ž" \u2028 / \\ \t', tval=Decimal("5"), ename="€ issuer"
+        )
+        token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def content(self, url: str, fast: bool) -> bytes:
+        cache.clear()
+        with serializer_settings(fast):
+            response = self.api_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        if response.streaming:
+            return b"".join(response.streaming_content)
+        return response.content
+
+    def test_responses_are_byte_for_byte_identical(self):
+        for url in (
+            LIST_URL,
+            LIST_URL + "?page_size=5",
+            LIST_URL + "?stream=json",
+            LIST_URL + "?stream=ndjson",
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.content(url, True), self.content(url, False))
+
+    def test_rows_match_the_serializer(self):
+        bonds: list[Bond] = list(Bond.objects.order_by("id"))
+
+        self.assertEqual(
+            bond_rows.rows(Bond.objects.order_by("id")),
+            BondSerializer(bonds, many=True).data,
+        )
+        self.assertEqual(
+            [bond_rows.from_instance(bond) for bond in bonds],
+            BondSerializer(bonds, many=True).data,
+        )
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    def test_matches_json_renderer(self):
+        data: dict = {
+            "text": "a\u2029b \x00 é",
+            "number": 3,
+            "nested": [
+                None,
+                True,
+                {"amount": Decimal("1.50"), "day": date(2025, 1, 2)},
+            ],
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render(data))["nested"][2]["amount"], 1.5
+        )
+
+    def test_indented_output_is_left_to_json_renderer(self):
+        rendered: bytes = FastJSONRenderer().render(
+            {"a": 1}, "application/json; indent=2"
+        )
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+    def test_microbenchmark_checks_both_paths(self):
+        result: dict = compare_paths(rows=50, repeat=1)
+
+        self.assertEqual(set(result["seconds"]), {"serializer", "fast"})
+        self.assertGreater(result["speedup"], 0)
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import skipUnless
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from bonds.models import Bond
+from bonds.services.portfolio_analysis import PortfolioAnalysisService
+
+OWNERS: int = 200
+BONDS_PER_OWNER: int = 100
+
+
+@skipUnless(
+    connection.vendor in ("postgresql", "sqlite"),
+    "EXPLAIN output is only interpreted for PostgreSQL and SQLite",
+)
+class OwnerScopedQueryPlanTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owners: list[User] = User.objects.bulk_create(
+            User(username=f"owner{index}") for index in range(OWNERS)
+        )
+        Bond.objects.bulk_create(
+            (
+                Bond(
+                    owner=owner,
+                    cval=f"CZ{index:010d}",
+                    ison=f"Bond {index}",
+                    tval=Decimal(100 + index % 50),
+                    pdcp="list",
+                    regdt=date(2023, 5, 24),
+                    eico="0019319703",
+                    ename="Issuer",
+                    elei="315700PZ559GOUR26559",
+                    interest_rate=Decimal(index % 9 + 1),
+                    purchase_date=date(2023, 1, 1),
+                    maturity_date=date(2025, 1, 1) + timedelta(days=index % 1500),
+                    interest_frequency="Semiannual",
+                )
+                for owner in owners
+                for index in range(BONDS_PER_OWNER)
+            ),
+            batch_size=2000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.owner: User = owners[OWNERS // 2]
+
+    def explain(self, sql: str) -> str:
+        prefix: str = (
+            "EXPLAIN" if connection.vendor == "postgresql" else "EXPLAIN QUERY PLAN"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}")
+            return "\n".join(str(row) for row in cursor.fetchall())
+
+    def assertNoSequentialScan(self, queries: CaptureQueriesContext) -> None:
+        bond_queries: list[str] = [
+            query["sql"] for query in queries if "bonds_bond" in query["sql"]
+        ]
+        self.assertTrue(bond_queries)
+        for sql in bond_queries:
+            plan: str = self.explain(sql)
+            if connection.vendor == "postgresql":
+                self.assertNotIn("Seq Scan on bonds_bond", plan, msg=sql)
+            else:
+                for line in plan.splitlines():
+                    if "SCAN bonds_bond" in line:
+                        self.assertIn("INDEX", line, msg=sql)
+
+    def test_owner_scoped_list_uses_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(Bond.objects.filter(owner=self.owner).order_by("maturity_date", "id"))
+        self.assertNoSequentialScan(queries)
+
+    def test_owner_scoped_retrieve_uses_index(self):
+        bond: Bond = Bond.objects.filter(owner=self.owner).first()
+        with CaptureQueriesContext(connection) as queries:
+            Bond.objects.get(pk=bond.pk, owner=self.owner)
+        self.assertNoSequentialScan(queries)
+
+    def test_analysis_uses_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            PortfolioAnalysisService.aggregate_analysis(
+                Bond.objects.filter(owner=self.owner)
+            )
+        self.assertNoSequentialScan(queries)
+
+    def test_cval_lookup_uses_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(Bond.objects.filter(owner=self.owner, cval="CZ0000000042"))
+        self.assertNoSequentialScan(queries)
@@ -0,0 +1,91 @@
+import os
+from unittest import mock
+import psycopg2
+from psycopg2 import sql
+from django.db.migrations.executor import MigrationExecutor
+from django.core.management.base import CommandError
+from django.test import TestCase
+from init_db import PostgresDatabaseManager, main
+
+ENVIRONMENT: dict[str, str] = {
+    "POSTGRES_USER": "bond_user",
+    "POSTGRES_PASSWORD": "bond_password",
+    "POSTGRES_HOST": "postgres",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "bond_db",
+}
+
+
+class PostgresDatabaseManagerTestCase(TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, ENVIRONMENT):
+            self.manager: PostgresDatabaseManager = PostgresDatabaseManager()
+
+    @mock.patch("init_db.time.sleep")
+    @mock.patch("init_db.psycopg2.connect")
+    def test_waits_with_exponential_backoff(self, connect, sleep):
+        conn: mock.Mock = mock.Mock()
+        connect.side_effect = [psycopg2.OperationalError()] * 3 + [conn]
+
+        self.assertIs(self.manager.wait_for_postgres(timeout=60), conn)
+        self.assertEqual(
+            [call.args[0] for call in sleep.call_args_list], [0.1, 0.2, 0.4]
+        )
+        self.assertEqual(connect.call_args.kwargs["dbname"], "postgres")
+
+    @mock.patch("init_db.time.sleep")
+    @mock.patch("init_db.psycopg2.connect", side_effect=psycopg2.OperationalError())
+    def test_gives_up_after_the_timeout(self, connect, sleep):
+        self.assertIsNone(self.manager.wait_for_postgres(timeout=0))
+        sleep.assert_not_called()
+
+    @mock.patch("init_db.call_command")
+    def test_skips_migrate_when_the_schema_is_current(self, call_command):
+        self.manager.run_django_migrations()
+
+        self.assertEqual(
+            [call.args[0] for call in call_command.call_args_list], ["makemigrations"]
+        )
+
+    @mock.patch("init_db.call_command")
+    def test_migrates_pending_migrations(self, call_command):
+        with mock.patch.object(
+            MigrationExecutor, "migration_plan", return_value=[mock.Mock()]
+        ), self.settings(PRODUCTION=True):
+            self.manager.run_django_migrations()
+
+        self.assertEqual(
+            [call.args[0] for call in call_command.call_args_list], ["migrate"]
+        )
+
+    def test_database_names_are_quoted(self):
+        cursor: mock.Mock = mock.Mock()
+        self.manager.dbname = 'bond"db'
+
+        self.manager.create_database(cursor)
+
+        for call in cursor.execute.call_args_list:
+            self.assertIn(sql.Identifier('bond"db'), call.args[0].seq)
+
+    @mock.patch("init_db.django.setup")
+    @mock.patch("init_db.setup_logging")
+    @mock.patch("init_db.call_command", side_effect=CommandError("migration failed"))
+    @mock.patch.object(
+        PostgresDatabaseManager, "check_database_exists", return_value=True
+    )
+    @mock.patch.object(PostgresDatabaseManager, "wait_for_postgres")
+    def test_failing_migration_gives_a_non_zero_exit(self, wait, *_):
+        with mock.patch.dict(os.environ, ENVIRONMENT), mock.patch.object(
+            MigrationExecutor, "migration_plan", return_value=[mock.Mock()]
+        ), self.settings(PRODUCTION=True):
+            status: int = main()
+
+        self.assertEqual(status, 1)
+        wait.return_value.close.assert_called_once()
+
+    @mock.patch("init_db.django.setup")
+    @mock.patch("init_db.setup_logging")
+    @mock.patch.object(PostgresDatabaseManager, "wait_for_postgres", return_value=None)
+    def test_unavailable_server_gives_a_non_zero_exit(self, *_):
+        with mock.patch.dict(os.environ, ENVIRONMENT):
+            self.assertEqual(main(), 1)
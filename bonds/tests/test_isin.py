@@ -0,0 +1,60 @@
+import asyncio
+from unittest import mock
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from benchmarks.isin import compare_validators
+from bonds.isin import (
+    CHECK_DIGIT_ERROR,
+    FORMAT_ERROR,
+    check_digit,
+    invalid_isins,
+    isin_error,
+    validate_isin,
+)
+from bonds.services.cdcp_service import CDCPService
+
+
+class IsinTestCase(SimpleTestCase):
+    def test_check_digit(self):
+        for isin in ("CZ0003551251", "CZ0003551269", "US0378331005"):
+            self.assertIsNone(isin_error(isin))
+            self.assertEqual(check_digit(isin[:11]), isin[11])
+
+    def test_errors(self):
+        self.assertEqual(isin_error("CZ0003551250"), CHECK_DIGIT_ERROR)
+        for value in (
+            "",
+            "CZ000355125",
+            "cz0003551251",
+            "CZ00035512511",
+            "CZ00035512A1",
+        ):
+            self.assertEqual(isin_error(value), FORMAT_ERROR, value)
+        with self.assertRaisesMessage(ValidationError, CHECK_DIGIT_ERROR):
+            validate_isin("US0378331006")
+
+    def test_batch_reports_each_distinct_invalid_isin(self):
+        values: list[str] = ["CZ0003551251", "CZ0003551250", "bad"] * 1000
+
+        self.assertEqual(
+            invalid_isins(values),
+            {"CZ0003551250": CHECK_DIGIT_ERROR, "bad": FORMAT_ERROR},
+        )
+
+    @mock.patch("bonds.services.cdcp_service.get_async_cdcp_client")
+    @mock.patch("bonds.services.cdcp_service.get_cdcp_client")
+    def test_cdcp_is_not_called_for_invalid_isins(self, client, async_client):
+        service: CDCPService = CDCPService()
+        with self.assertRaisesMessage(ValidationError, CHECK_DIGIT_ERROR):
+            service.is_cdcp_bond_data_matching("CZ0003551250")
+        with self.assertRaisesMessage(ValidationError, FORMAT_ERROR):
+            asyncio.run(service.ais_cdcp_bond_data_matching("INVALIDISIN"))
+
+        client.assert_not_called()
+        async_client.assert_not_called()
+
+    def test_microbenchmark_agrees_with_the_legacy_format_check(self):
+        result: dict = compare_validators(count=500, distinct=50, repeat=1)
+
+        self.assertEqual(set(result["seconds"]), {"legacy", "single", "batch"})
+        self.assertLessEqual(result["distinct"], 50)
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from django.conf import settings
+from django.test import SimpleTestCase
+from bond_service_demonstrator import logger as logging_pipeline
+
+
+class CountingArgument:
+    """Log argument that counts how often it is rendered."""
+
+    def __init__(self) -> None:
+        self.renders: int = 0
+
+    def __str__(self) -> str:
+        self.renders += 1
+        return "rendered"
+
+
+class LoggingPipelineTestCase(SimpleTestCase):
+    def setUp(self):
+        self.directory: str = tempfile.mkdtemp()
+        self.log_file: str = os.path.join(self.directory, "bsd_main.log")
+        self.addCleanup(logging_pipeline.setup_logging, settings.LOGGING)
+
+    def configure(self, **config) -> None:
+        logging_pipeline.setup_logging(
+            {
+                "FORMAT": "json",
+                "LEVEL": "INFO",
+                "DIRECTORY": self.directory,
+                "CONSOLE": False,
+                **config,
+            }
+        )
+
+    def read_entries(self) -> list[dict]:
+        logging_pipeline.stop_logging()
+        with open(self.log_file, encoding="utf-8") as log_file:
+            return [json.loads(line) for line in log_file]
+
+    def test_queue_mode_writes_json_on_listener_thread(self):
+        self.configure(MODE="queue")
+        file_handler: logging.Handler = logging_pipeline._listener.handlers[0]
+        emitting_threads: list[threading.Thread] = []
+        emit = file_handler.emit
+        file_handler.emit = lambda record: (
+            emitting_threads.append(threading.current_thread()),
+            emit(record),
+        )
+        test_logger: logging.Logger = logging.getLogger("bonds.tests.pipeline")
+
+        test_logger.info("Imported %d bonds", 3, extra={"owner_id": 7})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            test_logger.exception("Import failed")
+
+        entries: list[dict] = self.read_entries()
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0]["message"], "Imported 3 bonds")
+        self.assertEqual(entries[0]["level"], "INFO")
+        self.assertEqual(entries[0]["logger"], "bonds.tests.pipeline")
+        self.assertEqual(entries[0]["owner_id"], 7)
+        self.assertIn("ValueError: boom", entries[1]["exc_info"])
+        self.assertTrue(emitting_threads)
+        self.assertNotIn(threading.current_thread(), emitting_threads)
+
+    def test_per_module_levels(self):
+        self.configure(
+            MODE="sync",
+            LEVELS={"bonds.tests.quiet": "WARNING", "bonds.tests.verbose": "DEBUG"},
+        )
+
+        logging.getLogger("bonds.tests.quiet").info("hidden")
+        logging.getLogger("bonds.tests.quiet").warning("shown")
+        logging.getLogger("bonds.tests.verbose").debug("shown")
+        logging.getLogger("bonds.tests.other").debug("hidden")
+
+        messages: list[str] = [entry["message"] for entry in self.read_entries()]
+        self.assertEqual(messages, ["shown", "shown"])
+
+    def test_disabled_levels_do_not_render_arguments(self):
+        self.configure(MODE="queue")
+        argument: CountingArgument = CountingArgument()
+
+        logging.getLogger("bonds.tests.lazy").debug("Value: %s", argument)
+        self.assertEqual(argument.renders, 0)
+
+        logging.getLogger("bonds.tests.lazy").info("Value: %s", argument)
+        self.assertEqual(argument.renders, 1)
+        self.assertEqual(self.read_entries()[0]["message"], "Value: rendered")
+
+    def test_setup_is_idempotent(self):
+        self.configure(MODE="queue")
+        self.configure(MODE="queue")
+
+        logging.getLogger("bonds.tests.pipeline").warning("once")
+
+        self.assertEqual(len(self.read_entries()), 1)
@@ -0,0 +1,140 @@
+import responses
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from bond_service_demonstrator import metrics
+from bonds.services.cdcp_cache import cdcp_cache
+from bonds.services.cdcp_client import reset_cdcp_client
+from bonds.services.cdcp_service import CDCPService
+from bonds.tests.test_portfolio_analysis import seed_bonds
+
+
+class HistogramTestCase(SimpleTestCase):
+    def test_render_cumulative_buckets(self):
+        histogram: metrics.Histogram = metrics.Histogram(
+            "test_seconds", "Test histogram.", ("view",), buckets=(0.1, 1.0)
+        )
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, "bond-list")
+
+        lines: list[str] = histogram.render()
+
+        self.assertEqual(lines[1], "# TYPE test_seconds histogram")
+        self.assertIn('test_seconds_bucket{view="bond-list",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{view="bond-list",le="1.0"} 3', lines)
+        self.assertIn('test_seconds_bucket{view="bond-list",le="+Inf"} 4', lines)
+        self.assertIn('test_seconds_sum{view="bond-list"} 6.05', lines)
+        self.assertIn('test_seconds_count{view="bond-list"} 4', lines)
+
+    def test_label_values_are_escaped(self):
+        counter: metrics.Counter = metrics.Counter("test_total", "Test.", ("path",))
+        counter.inc('a"b\\c')
+        self.assertIn('test_total{path="a\\"b\\\\c"} 1', counter.render())
+
+
+class RequestMetricsMiddlewareTestCase(TestCase):
+    def setUp(self):
+        cdcp_cache.clear()
+        reset_cdcp_client()
+        cache.clear()
+        self.user: User = User.objects.create_user(username="owner", password="x")
+        token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        seed_bonds(self.user, 5)
+
+    def test_records_requests_queries_and_size(self):
+        labels: tuple[str, str] = ("bond-list", "GET")
+        requests_before: float = metrics.requests_total.value(*labels, "200")
+        queries_before: float = metrics.request_db_queries.total(*labels)
+        size_before: float = metrics.response_size.total(*labels)
+
+        response = self.api_client.get("/api/bonds/manage/")
+
+        self.assertEqual(
+            metrics.requests_total.value(*labels, "200"), requests_before + 1
+        )
+        self.assertGreaterEqual(
+            metrics.request_db_queries.total(*labels) - queries_before, 2
+        )
+        self.assertEqual(
+            metrics.response_size.total(*labels) - size_before, len(response.content)
+        )
+
+    def test_streamed_responses_are_measured_after_the_body(self):
+        labels: tuple[str, str] = ("bond-list", "GET")
+        count_before: int = metrics.response_size.count(*labels)
+        size_before: float = metrics.response_size.total(*labels)
+
+        response = self.api_client.get("/api/bonds/manage/?stream=ndjson")
+        self.assertEqual(metrics.response_size.count(*labels), count_before)
+        body: bytes = b"".join(response.streaming_content)
+
+        self.assertEqual(metrics.response_size.count(*labels), count_before + 1)
+        self.assertEqual(metrics.response_size.total(*labels) - size_before, len(body))
+
+    @responses.activate
+    def test_cdcp_calls_are_attributed_to_the_request(self):
+        cval: str = "CZ0003551269"
+        responses.get(
+            CDCPService.API_URL_TEMPLATE.format(cval),
+            json={"vydaneisiny": [{"cval": cval}]},
+        )
+        labels: tuple[str, str] = ("bond-list", "POST")
+        calls_before: float = metrics.request_cdcp_calls.total(*labels)
+        successes_before: float = metrics.cdcp_calls_total.value("success")
+
+        response = self.api_client.post(
+            "/api/bonds/manage/",
+            {
+                "cval": cval,
+                "ison": "Metrics bond",
+                "tval": "100.00",
+                "pdcp": "list",
+                "regdt": "2023-05-24",
+                "eico": "0019319703",
+                "ename": "Rentico Invest s.r.o.",
+                "elei": "315700PZ559GOUR26559",
+                "interest_rate": "5.00",
+                "purchase_date": "2023-01-01",
+                "maturity_date": "2030-05-31",
+                "interest_frequency": "Semiannual",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(metrics.request_cdcp_calls.total(*labels) - calls_before, 1)
+        self.assertEqual(
+            metrics.cdcp_calls_total.value("success"), successes_before + 1
+        )
+
+    def test_metrics_endpoint_is_disabled_by_default(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+
+    @override_settings(METRICS={"ENABLED": True, "ALLOWED_IPS": []})
+    def test_metrics_endpoint(self):
+        self.api_client.get("/api/bonds/analysis/")
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            response["Content-Type"].startswith("text/plain; version=0.0.4")
+        )
+        body: str = response.content.decode()
+        self.assertIn("# TYPE bsd_http_request_duration_seconds histogram", body)
+        self.assertIn(
+            'bsd_http_request_db_queries_count{view="portfolio-analysis",method="GET"}',
+            body,
+        )
+
+    @override_settings(METRICS={"ENABLED": True, "ALLOWED_IPS": ["10.0.0.1"]})
+    def test_metrics_endpoint_ip_allow_list(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(
+            self.client.get("/metrics", REMOTE_ADDR="10.0.0.1").status_code, 200
+        )
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from bonds.models import Bond, PortfolioSummary
+from bonds.services.portfolio_analysis import PortfolioAnalysisService
+
+
+def seed_bonds(owner: User, count: int, start: date | None = None) -> list[Bond]:
+    """Creates ``count`` bonds with varied values and maturities, bypassing validation."""
+    start = start or date.today() - timedelta(days=400)
+    bonds: list[Bond] = [
+        Bond(
+            owner=owner,
+            cval="CZ0003551251",
+            ison=f"Bond {index}",
+            tval=Decimal(1000 + 37 * index) / Decimal(4),
+            pdcp="list",
+            regdt=date(2023, 5, 24),
+            eico="0019319703",
+            ename="Rentico Invest s.r.o.",
+            elei="315700PZ559GOUR26559",
+            interest_rate=Decimal(index % 17 + 1) + Decimal("0.25"),
+            purchase_date=date(2023, 1, 1),
+            maturity_date=start + timedelta(days=(index * 97) % 3000),
+            interest_frequency="Semiannual",
+        )
+        for index in range(count)
+    ]
+    bonds = Bond.objects.bulk_create(bonds)
+    PortfolioSummary.objects.record_change(
+        owner.pk, added=[bond.position() for bond in bonds]
+    )
+    return bonds
+
+
+class PortfolioAnalysisParityTestCase(TestCase):
+    def setUp(self):
+        self.user: User = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def assertAnalysisEqual(self, first: dict, second: dict) -> None:
+        self.assertEqual(
+            first["nearest_maturity_bond"], second["nearest_maturity_bond"]
+        )
+        for key in ("average_interest_rate", "total_value", "future_value"):
+            self.assertAlmostEqual(
+                first[key], second[key], delta=Decimal("1e-9"), msg=key
+            )
+
+    def test_aggregate_matches_python(self):
+        seed_bonds(self.user, 250)
+        bonds = Bond.objects.filter(owner=self.user)
+        self.assertAnalysisEqual(
+            PortfolioAnalysisService.python_analysis(bonds),
+            PortfolioAnalysisService.aggregate_analysis(bonds),
+        )
+
+    def test_summary_matches_python(self):
+        seed_bonds(self.user, 250)
+        self.assertAnalysisEqual(
+            PortfolioAnalysisService.python_analysis(
+                Bond.objects.filter(owner=self.user)
+            ),
+            PortfolioAnalysisService.summary_analysis(self.user),
+        )
+
+    def test_aggregate_matches_python_for_empty_portfolio(self):
+        bonds = Bond.objects.filter(owner=self.user)
+        self.assertEqual(
+            PortfolioAnalysisService.python_analysis(bonds),
+            PortfolioAnalysisService.aggregate_analysis(bonds),
+        )
+        self.assertEqual(
+            PortfolioAnalysisService.python_analysis(bonds),
+            PortfolioAnalysisService.summary_analysis(self.user),
+        )
+
+    def test_aggregate_uses_constant_number_of_queries(self):
+        seed_bonds(self.user, 100)
+        with self.assertNumQueries(2):
+            PortfolioAnalysisService.aggregate_analysis(
+                Bond.objects.filter(owner=self.user)
+            )
+
+    def test_summary_uses_single_query(self):
+        seed_bonds(self.user, 100)
+        with self.assertNumQueries(1):
+            PortfolioAnalysisService.summary_analysis(self.user)
+
+    def test_view_responses_match_between_modes(self):
+        seed_bonds(self.user, 40)
+        responses: dict[str, Response] = {}
+        for mode in ("python", "aggregate", "summary"):
+            with override_settings(PORTFOLIO_ANALYSIS_MODE=mode):
+                responses[mode] = self.api_client.get("/api/bonds/analysis/")
+        self.assertEqual(responses["python"].status_code, 200)
+        self.assertEqual(responses["python"].json(), responses["aggregate"].json())
+        for key, value in responses["python"].json().items():
+            self.assertAlmostEqual(value, responses["summary"].json()[key], places=6)
@@ -0,0 +1,130 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from bonds.models import Bond, PortfolioSummary
+
+
+@mock.patch(
+    "bonds.services.cdcp_service.CDCPService.is_cdcp_bond_data_matching",
+    return_value=True,
+)
+class PortfolioSummaryTestCase(TestCase):
+    def setUp(self):
+        self.user: User = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.another_user: User = User.objects.create_user(
+            username="anotheruser", password="password"
+        )
+        self.bond_data: dict[str, str | Decimal | date | User] = {
+            "cval": "CZ0003551251",
+            "ison": "Rentico Invest/11.23 DEB 20260531",
+            "tval": Decimal("100.00"),
+            "pdcp": "list",
+            "regdt": "2023-05-24",
+            "eico": "0019319703",
+            "ename": "Rentico Invest s.r.o.",
+            "elei": "315700PZ559GOUR26559",
+            "interest_rate": Decimal("5.00"),
+            "purchase_date": date(2023, 1, 1),
+            "maturity_date": date(2025, 5, 31),
+            "interest_frequency": "Semiannual",
+            "owner": self.user,
+        }
+
+    def create_bond(self, **overrides) -> Bond:
+        return Bond.objects.create(**{**self.bond_data, **overrides})
+
+    def assertSummaryCurrent(self, owner: User) -> None:
+        summary: PortfolioSummary = PortfolioSummary.objects.get(owner=owner)
+        expected: dict = PortfolioSummary.objects.computed_totals(owner.pk)
+        for field, value in expected.items():
+            self.assertEqual(getattr(summary, field), value, msg=field)
+
+    def test_create_updates_summary(self, _):
+        self.create_bond()
+        self.create_bond(tval=Decimal("250.50"), maturity_date=date(2024, 1, 1))
+        summary: PortfolioSummary = PortfolioSummary.objects.get(owner=self.user)
+        self.assertEqual(summary.bond_count, 2)
+        self.assertEqual(summary.total_value, Decimal("350.50"))
+        self.assertEqual(summary.nearest_maturity_date, date(2024, 1, 1))
+        self.assertSummaryCurrent(self.user)
+
+    def test_update_of_nearest_bond_refreshes_nearest(self, _):
+        nearest: Bond = self.create_bond(maturity_date=date(2024, 1, 1))
+        other: Bond = self.create_bond(maturity_date=date(2026, 1, 1))
+        nearest = Bond.objects.get(pk=nearest.pk)
+        nearest.maturity_date = date(2027, 1, 1)
+        nearest.interest_rate = Decimal("7.25")
+        nearest.save()
+        summary: PortfolioSummary = PortfolioSummary.objects.get(owner=self.user)
+        self.assertEqual(summary.nearest_bond_id, other.pk)
+        self.assertSummaryCurrent(self.user)
+
+    def test_delete_updates_summary(self, _):
+        nearest: Bond = self.create_bond(maturity_date=date(2024, 1, 1))
+        self.create_bond()
+        nearest.delete()
+        self.assertSummaryCurrent(self.user)
+        self.assertEqual(PortfolioSummary.objects.get(owner=self.user).bond_count, 1)
+
+    def test_saving_a_partially_loaded_bond_keeps_the_summary(self, _):
+        bond: Bond = self.create_bond()
+        self.create_bond(tval=Decimal("250.50"))
+
+        partial: Bond = Bond.objects.only("ison").get(pk=bond.pk)
+        partial.ison = "Renamed"
+        partial.save(validate=False)
+        self.assertEqual(PortfolioSummary.objects.get(owner=self.user).bond_count, 2)
+        self.assertSummaryCurrent(self.user)
+
+        partial = Bond.objects.only("ison").get(pk=bond.pk)
+        partial.tval = Decimal("400.00")
+        partial.save(validate=False)
+        summary: PortfolioSummary = PortfolioSummary.objects.get(owner=self.user)
+        self.assertEqual(summary.total_value, Decimal("650.50"))
+        self.assertSummaryCurrent(self.user)
+
+    def test_owner_change_moves_bond_between_summaries(self, _):
+        bond: Bond = self.create_bond()
+        bond.owner = self.another_user
+        bond.save()
+        self.assertSummaryCurrent(self.user)
+        self.assertSummaryCurrent(self.another_user)
+        self.assertEqual(
+            PortfolioSummary.objects.get(owner=self.another_user).bond_count, 1
+        )
+
+    def test_write_cost_does_not_depend_on_portfolio_size(self, _):
+        query_counts: list[int] = []
+        for size in (2, 20):
+            for _ in range(size):
+                self.create_bond(owner=self.another_user)
+            bond: Bond = Bond.objects.filter(owner=self.another_user).last()
+            bond.tval = Decimal(size)
+            with CaptureQueriesContext(connection) as queries:
+                bond.save()
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertSummaryCurrent(self.another_user)
+
+    def test_command_detects_and_repairs_drift(self, _):
+        self.create_bond()
+        self.create_bond(tval=Decimal("10.00"))
+        call_command("rebuild_portfolio_summaries", "--check", stdout=StringIO())
+
+        Bond.objects.filter(owner=self.user).update(tval=Decimal("1.00"))
+        with self.assertRaises(CommandError):
+            call_command("rebuild_portfolio_summaries", "--check", stdout=StringIO())
+
+        out: StringIO = StringIO()
+        call_command("rebuild_portfolio_summaries", stdout=out)
+        self.assertIn("Rebuilt 1 portfolio summaries", out.getvalue())
+        self.assertSummaryCurrent(self.user)
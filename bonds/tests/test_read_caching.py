@@ -0,0 +1,141 @@
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from bonds.models import Bond, PortfolioSummary
+from bonds.response_cache import response_cache
+from bonds.services.cdcp_service import CDCPService
+from bonds.tests.test_portfolio_analysis import seed_bonds
+from bonds.tests.test_write_path import bond_queries
+
+LIST_URL: str = "/api/bonds/manage/"
+ANALYSIS_URL: str = "/api/bonds/analysis/"
+
+
+@mock.patch.object(CDCPService, "is_cdcp_bond_data_matching", return_value=True)
+class ConditionalReadTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        response_cache.reset_stats()
+        self.user: User = User.objects.create_user(username="owner", password="x")
+        token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.bonds: list[Bond] = seed_bonds(self.user, 3)
+
+    def version(self) -> int:
+        return PortfolioSummary.objects.version_of(self.user.pk)
+
+    def test_unchanged_list_and_analysis_return_304(self, cdcp):
+        for url in (LIST_URL, ANALYSIS_URL, LIST_URL + "?page_size=2"):
+            first = self.api_client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertIn("ETag", first)
+
+            second = self.api_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(second.status_code, 304, url)
+            self.assertEqual(second["ETag"], first["ETag"])
+            self.assertEqual(second.content, b"")
+
+    def test_etags_differ_by_query_and_owner(self, cdcp):
+        other: User = User.objects.create_user(username="other", password="x")
+        seed_bonds(other, 3)
+        other_client: APIClient = APIClient()
+        other_client.force_authenticate(other)
+
+        etags: set[str] = {
+            self.api_client.get(LIST_URL)["ETag"],
+            self.api_client.get(LIST_URL + "?page_size=2")["ETag"],
+            self.api_client.get(ANALYSIS_URL)["ETag"],
+            other_client.get(LIST_URL)["ETag"],
+        }
+        self.assertEqual(len(etags), 4)
+
+    def test_every_write_changes_the_version(self, cdcp):
+        bond: Bond = Bond.objects.get(pk=self.bonds[0].pk)
+        versions: list[int] = [self.version()]
+
+        bond.ison = "Renamed bond"
+        bond.save()
+        versions.append(self.version())
+
+        created = self.api_client.post(
+            LIST_URL,
+            {
+                "cval": "CZ0003551251",
+                "ison": "New bond",
+                "tval": "100.00",
+                "pdcp": "list",
+                "regdt": "2023-05-24",
+                "eico": "0019319703",
+                "ename": "Rentico Invest s.r.o.",
+                "elei": "315700PZ559GOUR26559",
+                "interest_rate": "5.00",
+                "purchase_date": "2023-01-01",
+                "maturity_date": "2030-05-31",
+                "interest_frequency": "Semiannual",
+            },
+            format="json",
+        )
+        self.assertEqual(created.status_code, 201)
+        versions.append(self.version())
+
+        self.api_client.patch(
+            f"{LIST_URL}{bond.pk}/", {"tval": "999.00"}, format="json"
+        )
+        versions.append(self.version())
+
+        self.api_client.delete(f"{LIST_URL}{bond.pk}/")
+        versions.append(self.version())
+
+        self.assertEqual(versions, sorted(set(versions)))
+
+    def test_write_invalidates_list_etag(self, cdcp):
+        etag: str = self.api_client.get(LIST_URL)["ETag"]
+
+        self.api_client.patch(
+            f"{LIST_URL}{self.bonds[0].pk}/", {"ison": "Renamed bond"}, format="json"
+        )
+        response = self.api_client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn("Renamed bond", {row["ison"] for row in response.json()})
+
+    def test_repeated_read_is_served_from_cache(self, cdcp):
+        first = self.api_client.get(LIST_URL)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.api_client.get(LIST_URL)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+        self.assertEqual(bond_queries(queries, "SELECT"), [])
+        self.assertEqual(response_cache.stats()["hits"], 1)
+
+    def test_streamed_list_has_etag_but_is_not_cached(self, cdcp):
+        first = self.api_client.get(LIST_URL + "?stream=ndjson")
+        b"".join(first.streaming_content)
+
+        second = self.api_client.get(
+            LIST_URL + "?stream=ndjson", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(response_cache.stats()["hits"], 0)
+
+    def test_retrieve_returns_304_until_the_bond_changes(self, cdcp):
+        url: str = f"{LIST_URL}{self.bonds[0].pk}/"
+        etag: str = self.api_client.get(url)["ETag"]
+
+        self.assertEqual(
+            self.api_client.get(url, HTTP_IF_NONE_MATCH=f"W/{etag}").status_code, 304
+        )
+        self.api_client.patch(url, {"tval": "999.00"}, format="json")
+        self.assertEqual(
+            self.api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200
+        )
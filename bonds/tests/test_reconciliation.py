@@ -0,0 +1,203 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from bonds.models import (
+    Bond,
+    PortfolioSummary,
+    ReconciliationDiff,
+    ReconciliationRun,
+    ReconciliationTask,
+)
+from bonds.services.cdcp_cache import cdcp_cache
+from bonds.services.cdcp_client import CDCPClient, CircuitBreaker
+from bonds.services.reconciliation import CDCPReconciler, RateLimiter, enqueue_run
+from bonds.tests.cdcp_stub import CDCPStubServer
+
+
+def stored_bond(owner: User, cval: str) -> Bond:
+    """A bond matching the default record of CDCPStubServer, saved without validation."""
+    return Bond(
+        owner=owner,
+        cval=cval,
+        ison=f"Bond {cval}",
+        tval=Decimal("100.00"),
+        pdcp="list",
+        regdt=date(2023, 5, 24),
+        eico="0019319703",
+        ename="Issuer",
+        elei="315700PZ559GOUR26559",
+        interest_rate=Decimal("5.00"),
+        purchase_date=date(2023, 1, 1),
+        maturity_date=date(2030, 5, 31),
+        interest_frequency="Semiannual",
+    )
+
+
+class ReconciliationTestCase(TestCase):
+    def setUp(self):
+        cdcp_cache.clear()
+        cache.clear()
+        self.stub: CDCPStubServer = CDCPStubServer()
+        self.stub.__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+        self.client: CDCPClient = CDCPClient(
+            max_retries=0, breaker=CircuitBreaker(failure_threshold=100)
+        )
+        self.addCleanup(self.client.close)
+
+        owners: list[User] = [
+            User.objects.create_user(username=f"owner{index}", password="x")
+            for index in range(2)
+        ]
+        bonds: list[Bond] = Bond.objects.bulk_create(
+            [stored_bond(owner, "CZ0003551251") for owner in owners]
+            + [stored_bond(owners[0], "CZ0003551269")]
+            + [stored_bond(owners[1], "CZ0003551277")]
+        )
+        for owner in owners:
+            PortfolioSummary.objects.rebuild(owner.pk)
+        self.renamed_pks: list[int] = [bonds[0].pk, bonds[1].pk]
+        self.stub.records["CZ0003551251"] = {
+            "cval": "CZ0003551251",
+            "ison": "Renamed bond",
+            "ename": "Issuer",
+            "pdcp": "list",
+        }
+        self.stub.records["CZ0003551277"] = None
+
+    def reconciler(self, run: ReconciliationRun, **kwargs) -> CDCPReconciler:
+        return CDCPReconciler(
+            run,
+            client=self.client,
+            url_template=self.stub.url_template,
+            rate=0,
+            **kwargs,
+        )
+
+    def test_run_deduplicates_isins_and_records_differences(self):
+        run: ReconciliationRun = enqueue_run()
+        progress = self.reconciler(run).process()
+
+        self.assertEqual(run.tasks.count(), 3)
+        self.assertEqual(self.stub.request_count, 3)
+        self.assertEqual((progress.checked, progress.remaining), (3, 0))
+        run.refresh_from_db()
+        self.assertEqual(run.status, ReconciliationRun.COMPLETED)
+
+        renamed = ReconciliationDiff.objects.filter(run=run, field="ison")
+        self.assertEqual(
+            sorted(renamed.values_list("bond_id", flat=True)), self.renamed_pks
+        )
+        self.assertEqual(
+            set(renamed.values_list("stored_value", "cdcp_value")),
+            {("Bond CZ0003551251", "Renamed bond")},
+        )
+        missing = ReconciliationDiff.objects.get(
+            run=run, field=ReconciliationDiff.MISSING_FIELD
+        )
+        self.assertEqual((missing.cval, missing.cdcp_value), ("CZ0003551277", None))
+        self.assertEqual(progress.diffs, 3)
+
+    def test_resumes_after_a_crash(self):
+        run: ReconciliationRun = enqueue_run()
+        self.reconciler(run, batch_size=1).process(limit=1)
+        # A worker that crashed holding a lease
+        crashed: list[ReconciliationTask] = self.reconciler(run).claim(1)
+        ReconciliationTask.objects.filter(pk=crashed[0].pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+
+        progress = self.reconciler(run, lease=60).process()
+
+        self.assertEqual((progress.checked, progress.remaining), (2, 0))
+        self.assertEqual(self.stub.request_count, 3)
+        self.assertEqual(ReconciliationDiff.objects.filter(run=run).count(), 3)
+
+    def test_worker_that_lost_its_lease_discards_its_result(self):
+        run: ReconciliationRun = enqueue_run()
+        slow: CDCPReconciler = self.reconciler(run, lease=60)
+        stalled: list[ReconciliationTask] = slow.claim(1)
+        ReconciliationTask.objects.filter(pk=stalled[0].pk).update(
+            locked_at=timezone.now() - timedelta(hours=1)
+        )
+        self.reconciler(run, lease=60).process()
+        diffs: int = ReconciliationDiff.objects.filter(run=run).count()
+
+        self.assertEqual(slow.reconcile(stalled[0]), 0)
+        slow.fail(stalled[0], Exception("late failure"))
+
+        self.assertEqual(ReconciliationDiff.objects.filter(run=run).count(), diffs)
+        self.assertEqual(
+            run.tasks.get(pk=stalled[0].pk).status, ReconciliationTask.DONE
+        )
+
+    def test_custom_api_leaves_the_validation_cache_untouched(self):
+        run: ReconciliationRun = enqueue_run()
+
+        self.reconciler(run).process()
+
+        for cval in ("CZ0003551251", "CZ0003551269", "CZ0003551277"):
+            self.assertIsNone(cdcp_cache.get(cval))
+
+    def test_failed_isins_are_retried_then_given_up(self):
+        self.stub.script.extend([(500, 0)] * 2)
+        run: ReconciliationRun = enqueue_run()
+
+        progress = self.reconciler(run, batch_size=1, max_attempts=2).process()
+
+        failed: ReconciliationTask = run.tasks.get(status=ReconciliationTask.FAILED)
+        self.assertEqual(failed.attempts, 2)
+        self.assertIn("500", failed.error)
+        self.assertEqual((progress.failed, progress.remaining), (1, 0))
+
+    def test_command_resumes_the_latest_run(self):
+        output: StringIO = StringIO()
+        call_command(
+            "reconcile_cdcp",
+            "--enqueue",
+            "--limit",
+            "2",
+            "--rate",
+            "0",
+            "--api-url-template",
+            self.stub.url_template,
+            stdout=output,
+        )
+        self.assertIn("checked 2 ISINs", output.getvalue())
+        self.assertIn("1 remaining", output.getvalue())
+
+        call_command(
+            "reconcile_cdcp",
+            "--rate",
+            "0",
+            "--api-url-template",
+            self.stub.url_template,
+            stdout=output,
+        )
+        self.assertIn("checked 1 ISINs", output.getvalue())
+        self.assertEqual(
+            ReconciliationRun.objects.get().status, ReconciliationRun.COMPLETED
+        )
+
+
+class RateLimiterTestCase(SimpleTestCase):
+    def test_spaces_calls_at_the_configured_rate(self):
+        now: list[float] = [0.0]
+        sleeps: list[float] = []
+
+        def sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter: RateLimiter = RateLimiter(
+            rate=4, burst=2, clock=lambda: now[0], sleep=sleep
+        )
+        for _ in range(4):
+            limiter.acquire()
+
+        self.assertEqual(sleeps, [0.25, 0.25])
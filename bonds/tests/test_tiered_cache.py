@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from bond_service_demonstrator.cache import TieredCache
+from bonds.models import Bond
+from bonds.response_cache import response_cache
+from bonds.tests.test_portfolio_analysis import seed_bonds
+
+
+class SlowCounter:
+    """Callable standing in for an expensive lookup; counts its calls."""
+
+    def __init__(self, delay: float = 0.1) -> None:
+        self.delay: float = delay
+        self.calls: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def __call__(self) -> dict:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"value": 42}
+
+    async def acall(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"value": 42}
+
+
+class TieredCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        # Two instances sharing the shared tier stand for two worker processes
+        self.first: TieredCache = TieredCache("test:", ttl=60, local_ttl=60)
+        self.second: TieredCache = TieredCache("test:", ttl=60, local_ttl=60)
+
+    def test_values_are_shared_between_processes(self):
+        self.first.set("key", {"a": 1})
+
+        self.assertEqual(self.second.get("key"), {"a": 1})
+        self.assertEqual(self.second.get("key"), {"a": 1})
+        stats: dict = self.second.stats()
+        self.assertEqual((stats["shared_hits"], stats["local_hits"]), (1, 1))
+
+    def test_namespace_invalidation_drops_entries_of_one_owner(self):
+        self.first.set("list", "owner 1", namespace=1)
+        self.first.set("list", "owner 2", namespace=2)
+        self.assertEqual(self.second.get("list", namespace=1), "owner 1")
+
+        self.second.invalidate_namespace(1)
+
+        self.assertIsNone(self.second.get("list", namespace=1))
+        self.assertEqual(self.second.get("list", namespace=2), "owner 2")
+        # The first process still holds the old generation until it expires
+        self.first.clear()
+        self.assertIsNone(self.first.get("list", namespace=1))
+
+    def test_concurrent_misses_compute_once(self):
+        compute: SlowCounter = SlowCounter()
+
+        with ThreadPoolExecutor(8) as executor:
+            results: list[dict] = list(
+                executor.map(
+                    lambda index: (self.first, self.second)[index % 2].get_or_set(
+                        "hot", compute
+                    ),
+                    range(8),
+                )
+            )
+
+        self.assertEqual(results, [{"value": 42}] * 8)
+        self.assertEqual(compute.calls, 1)
+        self.assertEqual(
+            self.first.stats()["coalesced"] + self.second.stats()["coalesced"], 7
+        )
+
+    def test_slow_computation_does_not_block_other_keys(self):
+        slow: SlowCounter = SlowCounter(delay=1.0)
+        fast: SlowCounter = SlowCounter(delay=0)
+
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(self.first.get_or_set, "slow", slow)
+            time.sleep(0.05)
+            started: float = time.perf_counter()
+            for index in range(100):
+                self.first.get_or_set(f"key{index}", fast)
+            elapsed: float = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual((slow.calls, fast.calls), (1, 100))
+
+    def test_concurrent_misses_share_the_failure(self):
+        def fail() -> dict:
+            time.sleep(0.1)
+            raise ValueError("lookup failed")
+
+        with ThreadPoolExecutor(4) as executor:
+            futures: list = [
+                executor.submit(self.first.get_or_set, "key", fail) for _ in range(4)
+            ]
+        for future in futures:
+            self.assertIsInstance(future.exception(), ValueError)
+        self.assertEqual(self.first.stats()["coalesced"], 3)
+
+    def test_failed_computation_is_not_cached(self):
+        def fail() -> dict:
+            raise ValueError("lookup failed")
+
+        with self.assertRaises(ValueError):
+            self.first.get_or_set("key", fail)
+        self.assertEqual(self.first.get_or_set("key", SlowCounter(0)), {"value": 42})
+
+    def test_concurrent_async_misses_compute_once(self):
+        compute: SlowCounter = SlowCounter()
+
+        async def lookups() -> list[dict]:
+            return await asyncio.gather(
+                *(self.first.aget_or_set("hot", compute.acall) for _ in range(5))
+            )
+
+        self.assertEqual(asyncio.run(lookups()), [{"value": 42}] * 5)
+        self.assertEqual(compute.calls, 1)
+
+
+class ResponseCacheInvalidationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        response_cache.clear()
+        self.user: User = User.objects.create_user(username="owner", password="x")
+        self.bonds: list[Bond] = seed_bonds(self.user, 2, start=date(2024, 1, 1))
+
+    def test_bond_write_drops_the_owners_responses(self):
+        other: User = User.objects.create_user(username="other", password="x")
+        response_cache.set("etag", (b"[]", "application/json"), namespace=self.user.pk)
+        response_cache.set("etag", (b"[]", "application/json"), namespace=other.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bonds[0].tval += 1
+            self.bonds[0].save(validate=False)
+
+        self.assertIsNone(response_cache.get(self.user.pk, '"etag"'))
+        self.assertIsNotNone(response_cache.get(other.pk, '"etag"'))
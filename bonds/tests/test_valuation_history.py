@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from bonds.models import Bond, PortfolioValuationSnapshot
+from bonds.services.portfolio_analysis import PortfolioAnalysisService
+from bonds.services.valuation_history import backfill, held_on, snapshot_day
+from bonds.tests.test_portfolio_analysis import seed_bonds
+
+HISTORY_URL: str = "/api/bonds/analysis/history/"
+
+
+class ValuationSnapshotTestCase(TestCase):
+    def setUp(self):
+        self.user: User = User.objects.create_user(username="owner", password="x")
+        self.other: User = User.objects.create_user(username="other", password="x")
+        seed_bonds(self.user, 40, start=date(2024, 1, 1))
+        seed_bonds(self.other, 10, start=date(2024, 1, 1))
+        token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def test_snapshot_matches_point_in_time_valuation(self):
+        valuation_date: date = date(2025, 3, 1)
+
+        self.assertEqual(snapshot_day(valuation_date), 2)
+
+        held: list[Bond] = list(held_on(valuation_date).filter(owner=self.user))
+        snapshot: PortfolioValuationSnapshot = PortfolioValuationSnapshot.objects.get(
+            owner=self.user, valuation_date=valuation_date
+        )
+        self.assertEqual(snapshot.bond_count, len(held))
+        self.assertEqual(
+            snapshot.total_value, PortfolioAnalysisService.total_value(held)
+        )
+        self.assertAlmostEqual(
+            snapshot.future_value,
+            PortfolioAnalysisService.future_value_sum(held, valuation_date),
+            delta=Decimal("0.0001"),
+        )
+
+    def test_resnapshot_replaces_the_day(self):
+        valuation_date: date = date(2025, 3, 1)
+        snapshot_day(valuation_date)
+        Bond.objects.filter(owner=self.other).delete()
+
+        snapshot_day(valuation_date)
+
+        self.assertEqual(
+            list(
+                PortfolioValuationSnapshot.objects.filter(
+                    valuation_date=valuation_date
+                ).values_list("owner_id", flat=True)
+            ),
+            [self.user.pk],
+        )
+
+    def test_history_endpoint_reads_the_owners_snapshots(self):
+        backfill(date(2025, 1, 1), date(2025, 1, 10))
+
+        response = self.api_client.get(
+            HISTORY_URL, {"from": "2025-01-03", "to": "2025-01-05"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["date"] for row in response.json()],
+            ["2025-01-03", "2025-01-04", "2025-01-05"],
+        )
+        stored: PortfolioValuationSnapshot = PortfolioValuationSnapshot.objects.get(
+            owner=self.user, valuation_date=date(2025, 1, 4)
+        )
+        self.assertEqual(response.data[1]["total_value"], stored.total_value)
+        self.assertEqual(response.data[1]["bond_count"], stored.bond_count)
+
+    def test_history_endpoint_rejects_bad_ranges(self):
+        for params in (
+            {"from": "2025-13-01"},
+            {"from": "yesterday"},
+            {"from": "2025-02-01", "to": "2025-01-01"},
+            {"from": "2000-01-01", "to": "2025-01-01"},
+        ):
+            response = self.api_client.get(HISTORY_URL, params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class BackfillCommandTestCase(TestCase):
+    def test_chunked_backfill_covers_the_range(self):
+        user: User = User.objects.create_user(username="owner", password="x")
+        seed_bonds(user, 20, start=date(2024, 1, 1))
+        start: date = date(2025, 1, 1)
+        output: StringIO = StringIO()
+
+        call_command(
+            "snapshot_portfolios",
+            "--from",
+            "2025-01-01",
+            "--to",
+            "2025-01-09",
+            "--workers",
+            "3",
+            "--chunk-days",
+            "3",
+            stdout=output,
+        )
+
+        self.assertIn("Wrote 9 portfolio snapshots", output.getvalue())
+        self.assertEqual(
+            list(
+                PortfolioValuationSnapshot.objects.order_by(
+                    "valuation_date"
+                ).values_list("valuation_date", flat=True)
+            ),
+            [start + timedelta(days=offset) for offset in range(9)],
+        )
@@ -0,0 +1,139 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from bonds.models import Bond
+from bonds.services.cdcp_service import CDCPService
+
+
+def bond_queries(queries: CaptureQueriesContext, verb: str) -> list[str]:
+    """SQL statements of ``queries`` that start with ``verb`` and touch the Bond table."""
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith(verb) and '"bonds_bond"' in query["sql"]
+    ]
+
+
+@mock.patch.object(CDCPService, "is_cdcp_bond_data_matching", return_value=True)
+class BondWritePathTestCase(TestCase):
+    def setUp(self):
+        self.user: User = User.objects.create_user(username="owner", password="x")
+        token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        self.bond: Bond = Bond.objects.create(
+            owner=self.user,
+            cval="CZ0003551251",
+            ison="Rentico Invest/11.23 DEB 20260531",
+            tval=Decimal("100.00"),
+            pdcp="list",
+            regdt=date(2023, 5, 24),
+            eico="0019319703",
+            ename="Rentico Invest s.r.o.",
+            elei="315700PZ559GOUR26559",
+            interest_rate=Decimal("5.00"),
+            purchase_date=date(2023, 1, 1),
+            maturity_date=date(2030, 5, 31),
+            interest_frequency="Semiannual",
+        )
+        self.url: str = f"/api/bonds/manage/{self.bond.pk}/"
+
+    def test_update_loads_once_and_skips_cdcp_for_unchanged_cval(self, cdcp):
+        cdcp.reset_mock()
+        with CaptureQueriesContext(connection) as queries:
+            response: Response = self.api_client.patch(
+                self.url, {"tval": "150.00", "cval": "CZ0003551251"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(bond_queries(queries, "SELECT")), 1)
+        self.assertEqual(len(bond_queries(queries, "UPDATE")), 1)
+        cdcp.assert_not_called()
+        self.bond.refresh_from_db()
+        self.assertEqual(self.bond.tval, Decimal("150.00"))
+
+    def test_changed_cval_is_checked_once(self, cdcp):
+        cdcp.reset_mock()
+        response: Response = self.api_client.patch(
+            self.url, {"cval": "CZ0003551269"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        cdcp.assert_called_once_with("CZ0003551269")
+
+    def test_no_op_update_is_not_written(self, cdcp):
+        etag: str = self.api_client.get(self.url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response: Response = self.api_client.patch(
+                self.url, {"tval": "100.00", "ison": self.bond.ison}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(bond_queries(queries, "UPDATE"), [])
+        self.assertEqual(response["ETag"], etag)
+
+    def test_if_match(self, cdcp):
+        etag: str = self.api_client.get(self.url)["ETag"]
+
+        stale: Response = self.api_client.patch(
+            self.url, {"tval": "120.00"}, format="json", HTTP_IF_MATCH='"stale"'
+        )
+        self.assertEqual(stale.status_code, 412)
+        self.bond.refresh_from_db()
+        self.assertEqual(self.bond.tval, Decimal("100.00"))
+
+        fresh: Response = self.api_client.patch(
+            self.url, {"tval": "120.00"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh["ETag"], etag)
+
+        reused: Response = self.api_client.patch(
+            self.url, {"tval": "130.00"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(reused.status_code, 412)
+
+    def test_weak_etag_does_not_match(self, cdcp):
+        etag: str = self.api_client.get(self.url)["ETag"]
+        response: Response = self.api_client.patch(
+            self.url, {"tval": "120.00"}, format="json", HTTP_IF_MATCH=f"W/{etag}"
+        )
+        self.assertEqual(response.status_code, 412)
+
+    def test_invalid_update_is_rejected_with_400(self, cdcp):
+        response: Response = self.api_client.patch(
+            self.url, {"tval": "-5"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("tval", response.data)
+
+    def test_destroy_loads_once_and_honours_if_match(self, cdcp):
+        stale: Response = self.api_client.delete(self.url, HTTP_IF_MATCH='"stale"')
+        self.assertEqual(stale.status_code, 412)
+        self.assertTrue(Bond.objects.filter(pk=self.bond.pk).exists())
+
+        with CaptureQueriesContext(connection) as queries:
+            response: Response = self.api_client.delete(self.url, HTTP_IF_MATCH="*")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(len(bond_queries(queries, "SELECT")), 1)
+        self.assertFalse(Bond.objects.filter(pk=self.bond.pk).exists())
+
+    def test_model_save_skips_cdcp_for_unchanged_cval(self, cdcp):
+        bond: Bond = Bond.objects.get(pk=self.bond.pk)
+        cdcp.reset_mock()
+
+        bond.tval = Decimal("200.00")
+        bond.save()
+        cdcp.assert_not_called()
+
+        bond.cval = "CZ0003551269"
+        bond.save()
+        cdcp.assert_called_once_with("CZ0003551269")
@@ -1,12 +1,40 @@
 from django.urls import path, include
 from django.urls.resolvers import URLPattern, URLResolver
 from rest_framework.routers import DefaultRouter
-from .views import BondViewSet, PortfolioAnalysisView
+from .async_views import (
+    AsyncBondDetailView,
+    AsyncBondListView,
+    AsyncPortfolioAnalysisView,
+)
+from .views import (
+    BondExportView,
+    BondViewSet,
+    PortfolioAnalysisView,
+    PortfolioHistoryView,
+)
 
 router = DefaultRouter()
 router.register(r"manage", BondViewSet)
 
 urlpatterns: list[URLPattern | URLResolver] = [
     path("", include(router.urls)),
+    path("export/<slug:export_format>/", BondExportView.as_view(), name="bond-export"),
     path("analysis/", PortfolioAnalysisView.as_view(), name="portfolio-analysis"),
+    path(
+        "analysis/history/",
+        PortfolioHistoryView.as_view(),
+        name="portfolio-analysis-history",
+    ),
+    # Async-native variants of list/create, retrieve and analysis for ASGI
+    path("async/manage/", AsyncBondListView.as_view(), name="async-bond-list"),
+    path(
+        "async/manage/<int:pk>/",
+        AsyncBondDetailView.as_view(),
+        name="async-bond-detail",
+    ),
+    path(
+        "async/analysis/",
+        AsyncPortfolioAnalysisView.as_view(),
+        name="async-portfolio-analysis",
+    ),
 ]
@@ -1,16 +1,45 @@
+import logging
+from datetime import date, timedelta
 from decimal import Decimal
+from typing import Iterator
+from django.conf import settings
 from django.db.models import QuerySet
-from django.shortcuts import get_object_or_404
+from django.http import Http404, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.request import Request
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound
+from .export import (
+    EXPORT_FORMATS,
+    accepts_gzip,
+    export_rows,
+    gzip_stream,
+    parquet_available,
+)
+from .conditional import (
+    bond_etag,
+    check_if_match,
+    is_not_modified,
+    not_modified,
+    owner_cached_read,
+)
+from .pagination import BondKeysetPagination
+from .parsers import NDJSONParser
+from .services.bulk_import import BondBulkImportService, BulkImportResult
 from .services.portfolio_analysis import PortfolioAnalysisService
+from .services.valuation_history import history
 from .models import Bond
-from .serializers import BondSerializer
-from bond_service_demonstrator.logger import logger
+from .renderers import FastJSONRenderer
+from .serializers import BondSerializer, bond_rows
+from .streaming import STREAM_FORMATS
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 class BondViewSet(viewsets.ModelViewSet):
@@ -18,131 +47,317 @@ class BondViewSet(viewsets.ModelViewSet):
     queryset: QuerySet[Bond] = Bond.objects.all()
     serializer_class = BondSerializer
     permission_classes: list[type[IsAuthenticated]] = [IsAuthenticated]
+    pagination_class = BondKeysetPagination
+    renderer_classes: list[type[FastJSONRenderer]] = [FastJSONRenderer]
 
     def perform_create(self, serializer: BondSerializer) -> None:
         """Assigns the logged-in user as the owner and saves the bond."""
-        logger.debug(f"Creating a new bond for user {self.request.user}")
+        logger.debug("Creating a new bond for user %s", self.request.user)
         created_bond: Bond = serializer.save(owner=self.request.user)
-        logger.info(f"Bond created with name: {created_bond.ison}")
+        logger.info("Bond created with name: %s", created_bond.ison)
 
-    def list(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
-        """Returns a list of bonds belonging to the current user."""
-        logger.debug(f"Listing bonds for user {request.user}")
-        queryset: QuerySet = self.get_queryset().filter(owner=request.user)
-        serializer: BondSerializer = self.get_serializer(queryset, many=True)
-        logger.debug(f"Found {len(queryset)} bonds for user {request.user.username}")
-        return Response(serializer.data)
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    def bulk(self, request: Request) -> Response:
+        """Creates many bonds at once from a JSON array or an NDJSON stream."""
+        logger.debug("Bulk importing bonds for user %s", request.user)
+        if not isinstance(request.data, list):
+            return Response(
+                {"detail": "Expected a JSON array or an NDJSON stream of bonds."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-    def retrieve(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
-        """Fetches a specific bond owned by the user."""
-        logger.debug(
-            f"Retrieving bond with ID {kwargs['pk']} for user {request.user.username}"
-        )
-        try:
-            bond: Bond = get_object_or_404(Bond, pk=kwargs["pk"], owner=request.user)
-            serializer: BondSerializer = self.get_serializer(bond)
-            logger.debug(f"Bond retrieved: {bond.ison}")
-            return Response(serializer.data)
-        except NotFound as e:
-            logger.error(
-                f"Bond not found with ID {kwargs['pk']} for user {request.user.username}"
+        batch_size: str | None = request.query_params.get("batch_size")
+        if batch_size is not None and (not batch_size.isdigit() or int(batch_size) < 1):
+            return Response(
+                {"detail": "batch_size must be a positive integer."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            logger.error(f"Error retrieving bond with ID {kwargs['pk']}: {e}")
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    def update(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
-        """Updates a bond if owned by the current user."""
-        logger.debug(
-            f"Updating bond with ID {kwargs['pk']} for user {request.user.username}"
+        result: BulkImportResult = BondBulkImportService(
+            owner=request.user,
+            batch_size=int(batch_size) if batch_size else None,
+        ).import_rows(request.data)
+        return Response(
+            {"created": result.created, "errors": result.errors},
+            status=(
+                status.HTTP_400_BAD_REQUEST
+                if result.errors
+                else status.HTTP_201_CREATED
+            ),
         )
-        try:
-            bond: Bond = get_object_or_404(Bond, pk=kwargs["pk"], owner=request.user)
 
-            # Ensure cval is included in the request data
-            if isinstance(request.data, dict) and "cval" not in request.data:
-                request.data["cval"] = bond.cval
+    def list(self, request: Request, *args: tuple, **kwargs: dict) -> HttpResponseBase:
+        """
+        Returns a list of bonds belonging to the current user, ordered by
+        maturity. ``?cursor=``/``?page_size=`` switch to keyset pagination and
+        ``?stream=json`` or ``?stream=ndjson`` stream the rows instead. The
+        response carries an ETag of the owner's portfolio version and is
+        answered with 304 or from the response cache while it is current.
+        """
+        return owner_cached_read(request, self.build_list)
+
+    def build_list(self) -> Response | StreamingHttpResponse:
+        """Serializes the current user's bonds for ``list``."""
+        request: Request = self.request
+        logger.debug("Listing bonds for user %s", request.user)
+        queryset: QuerySet = self.get_queryset().order_by("maturity_date", "id")
+
+        stream_format: str | None = request.query_params.get("stream")
+        if stream_format is not None:
+            return self.stream(queryset, stream_format)
+
+        fast: bool = settings.BOND_LIST["FAST_SERIALIZER"]
+        page: list[Bond] | None = self.paginate_queryset(queryset)
+        if page is not None:
+            if fast:
+                return self.get_paginated_response(
+                    [bond_rows.from_instance(bond) for bond in page]
+                )
+            serializer: BondSerializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        if fast:
+            data: list = bond_rows.rows(queryset)
+        else:
+            data = self.get_serializer(queryset, many=True).data
+        logger.debug("Found %d bonds for user %s", len(data), request.user.username)
+        return Response(data)
 
-            serializer: BondSerializer = self.get_serializer(
-                bond, data=request.data, partial=True
+    def stream(
+        self, queryset: QuerySet[Bond], stream_format: str
+    ) -> Response | StreamingHttpResponse:
+        """Streams the serialized rows of ``queryset`` with constant memory."""
+        if stream_format not in STREAM_FORMATS:
+            return Response(
+                {"detail": f"stream must be one of: {', '.join(STREAM_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        chunk_size: int = settings.BOND_LIST["STREAM_CHUNK_SIZE"]
+        if settings.BOND_LIST["FAST_SERIALIZER"]:
+            rows: Iterator[dict] = iter(bond_rows.rows(queryset, chunk_size))
+        else:
+            serializer: BondSerializer = self.get_serializer()
+            rows = (
+                serializer.to_representation(bond)
+                for bond in queryset.iterator(chunk_size=chunk_size)
             )
+        encode, content_type = STREAM_FORMATS[stream_format]
+        return StreamingHttpResponse(
+            encode(rows, chunk_size=chunk_size), content_type=content_type
+        )
 
-            serializer.is_valid(raise_exception=True)
+    def get_queryset(self) -> QuerySet[Bond]:
+        """Limits every lookup to the bonds of the current user."""
+        if getattr(self, "swagger_fake_view", False):
+            return Bond.objects.none()
+        return Bond.objects.filter(owner=self.request.user)
 
-            response: Response = super().update(request, *args, **kwargs)
-            logger.info(f"Bond updated with ID {kwargs['pk']}")
-            return response
-        except NotFound as e:
+    def get_object(self) -> Bond:
+        """Loads the requested bond with one owner-scoped query."""
+        try:
+            return super().get_object()
+        except Http404:
             logger.error(
-                f"Bond not found with ID {kwargs['pk']} for user {request.user.username}"
+                "Bond not found with ID %s for user %s",
+                self.kwargs["pk"],
+                self.request.user.username,
             )
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            logger.error(f"Error updating bond with ID {kwargs['pk']}: {e}")
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+            raise NotFound()
+
+    def retrieve(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        """
+        Fetches a specific bond owned by the user, answering 304 when the
+        ``If-None-Match`` header lists the bond's current ETag.
+        """
+        logger.debug(
+            "Retrieving bond with ID %s for user %s",
+            kwargs["pk"],
+            request.user.username,
+        )
+        bond: Bond = self.get_object()
+        etag: str = bond_etag(bond)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        serializer: BondSerializer = self.get_serializer(bond)
+        logger.debug("Bond retrieved: %s", bond.ison)
+        return Response(serializer.data, headers={"ETag": etag})
+
+    def update(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
+        """
+        Updates a bond if owned by the current user. The bond is loaded and
+        validated once. An ``If-Match`` header that does not match the bond's
+        ETag is rejected with 412, and a write that changes nothing is skipped.
+        """
+        logger.debug(
+            "Updating bond with ID %s for user %s", kwargs["pk"], request.user.username
+        )
+        bond: Bond = self.get_object()
+        check_if_match(request, bond_etag(bond))
+
+        serializer: BondSerializer = self.get_serializer(
+            bond, data=request.data, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        if any(
+            getattr(bond, field) != value
+            for field, value in serializer.validated_data.items()
+        ):
+            serializer.save()
+            logger.info("Bond updated with ID %s", kwargs["pk"])
+        else:
+            logger.debug("Bond with ID %s unchanged, skipping write", kwargs["pk"])
+        return Response(serializer.data, headers={"ETag": bond_etag(bond)})
 
     def destroy(self, request: Request, *args: tuple, **kwargs: dict) -> Response:
-        """Deletes a bond if owned by the current user."""
+        """Deletes a bond if owned by the current user, honouring ``If-Match``."""
         logger.debug(
-            f"Deleting bond with ID {kwargs['pk']} for user {request.user.username}"
+            "Deleting bond with ID %s for user %s", kwargs["pk"], request.user.username
         )
-        try:
-            get_object_or_404(Bond, pk=kwargs["pk"], owner=request.user)
-            response: Response = super().destroy(request, *args, **kwargs)
-            logger.info(f"Bond with ID {kwargs['pk']} deleted")
-            return response
-        except NotFound as e:
-            logger.error(
-                f"Bond not found with ID {kwargs['pk']} for user {request.user.username}"
+        bond: Bond = self.get_object()
+        check_if_match(request, bond_etag(bond))
+        self.perform_destroy(bond)
+        logger.info("Bond with ID %s deleted", kwargs["pk"])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BondExportView(APIView):
+    permission_classes: list[type[IsAuthenticated]] = [IsAuthenticated]
+
+    def get(self, request: Request, export_format: str) -> HttpResponseBase:
+        """
+        Streams all bonds of the current user as a CSV, NDJSON or Parquet
+        download. Rows are read as tuples and encoded in chunks, so memory
+        stays constant however many bonds there are. The body is gzipped
+        when the client's ``Accept-Encoding`` allows it.
+        """
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"format must be one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if export_format == "parquet" and not parquet_available():
+            return Response(
+                {"detail": "Parquet export is not available on this server."},
+                status=status.HTTP_406_NOT_ACCEPTABLE,
             )
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            logger.error(f"Error deleting bond with ID {kwargs['pk']}: {e}")
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        config: dict = settings.BOND_EXPORT
+        encode, content_type, extension = EXPORT_FORMATS[export_format]
+        logger.debug("Exporting bonds of user %s as %s", request.user, export_format)
+        body: Iterator[bytes] = encode(
+            export_rows(Bond.objects.filter(owner=request.user), config["CHUNK_SIZE"]),
+            config["CHUNK_SIZE"],
+        )
+        compress: bool = accepts_gzip(request.headers.get("Accept-Encoding", ""))
+        if compress:
+            body = gzip_stream(body, level=config["GZIP_LEVEL"])
+
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            body, content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="bonds.{extension}"'
+        response["Vary"] = "Accept-Encoding"
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        return response
 
 
 class PortfolioAnalysisView(APIView):
     permission_classes: list[type[IsAuthenticated]] = [IsAuthenticated]
 
-    def get(self, request: Request) -> Response:
-        """Performs portfolio analysis for the current user's bonds."""
-        logger.debug(f"Performing portfolio analysis for user {request.user}")
-        bonds: QuerySet[Bond] = Bond.objects.filter(owner=request.user)
+    def get(self, request: Request) -> HttpResponseBase:
+        """
+        Performs portfolio analysis for the current user's bonds. The result
+        depends on the valuation date and the analysis mode as well as the
+        bonds, so both are part of the ETag.
+        """
+        return owner_cached_read(
+            request,
+            self.analyze,
+            date.today().isoformat(),
+            settings.PORTFOLIO_ANALYSIS_MODE,
+        )
 
-        if not bonds.exists():
+    def analyze(self) -> Response:
+        """Computes the analysis response for ``get``."""
+        request: Request = self.request
+        logger.debug("Performing portfolio analysis for user %s", request.user)
+        analysis: dict[str, Decimal | str | None] = (
+            PortfolioAnalysisService.analyze_owner(
+                request.user, mode=settings.PORTFOLIO_ANALYSIS_MODE
+            )
+        )
+
+        if analysis["nearest_maturity_bond"] is None:
             logger.info(
-                f"No bonds found for user {request.user}, returning default analysis"
+                "No bonds found for user %s, returning default analysis", request.user
             )
+            return Response(analysis, status=status.HTTP_200_OK)
+
+        logger.debug(
+            "Portfolio analysis for user %s: average interest rate %s, nearest "
+            "maturity bond %s, total value %s, future value %s",
+            request.user.username,
+            analysis["average_interest_rate"],
+            analysis["nearest_maturity_bond"],
+            analysis["total_value"],
+            analysis["future_value"],
+        )
+
+        return Response(analysis, status=status.HTTP_200_OK)
+
+
+class PortfolioHistoryView(APIView):
+    permission_classes: list[type[IsAuthenticated]] = [IsAuthenticated]
+
+    def get(self, request: Request) -> Response:
+        """
+        Returns the stored daily valuations of the current user's portfolio
+        between ``?from=`` and ``?to=`` (ISO dates, inclusive). ``to``
+        defaults to today and ``from`` to ``VALUATION_HISTORY["DEFAULT_DAYS"]``
+        days before it. Days without holdings or not yet snapshotted are absent.
+        """
+        config: dict = settings.VALUATION_HISTORY
+        end: date | None = self.parse(request, "to", date.today())
+        start: date | None = self.parse(
+            request,
+            "from",
+            (end or date.today()) - timedelta(days=config["DEFAULT_DAYS"]),
+        )
+        if start is None or end is None:
+            return Response(
+                {"detail": "from and to must be dates in YYYY-MM-DD format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if start > end or (end - start).days >= config["MAX_DAYS"]:
             return Response(
                 {
-                    "average_interest_rate": Decimal(0),
-                    "nearest_maturity_bond": None,
-                    "total_value": Decimal(0),
-                    "future_value": Decimal(0),
+                    "detail": "from must not be after to and the range may span "
+                    f"at most {config['MAX_DAYS']} days."
                 },
-                status=status.HTTP_200_OK,
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        average_interest_rate: Decimal = PortfolioAnalysisService.average_interest_rate(
-            bonds
+        logger.debug(
+            "Reading portfolio history of user %s from %s to %s",
+            request.user,
+            start,
+            end,
         )
-        nearest_bond: Bond = PortfolioAnalysisService.nearest_bond(bonds)
-        total_value: Decimal = PortfolioAnalysisService.total_value(bonds)
-        future_value: Decimal = PortfolioAnalysisService.future_value_sum(bonds)
+        return Response(history(request.user.pk, start, end))
 
-        logger.debug(f"Portfolio analysis for user {request.user.username}:")
-        logger.debug(f"Average Interest Rate: {average_interest_rate}")
-        logger.debug(f"Nearest Maturity Bond: {nearest_bond.ison}")
-        logger.debug(f"Total Value: {total_value}")
-        logger.debug(f"Future Value: {future_value}")
-
-        return Response(
-            {
-                "average_interest_rate": average_interest_rate,
-                "nearest_maturity_bond": nearest_bond.ison,
-                "total_value": total_value,
-                "future_value": future_value,
-            },
-            status=status.HTTP_200_OK,
-        )
+    @staticmethod
+    def parse(request: Request, name: str, default: date) -> date | None:
+        """Reads a date query parameter; None if it is malformed."""
+        value: str | None = request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            return parse_date(value)
+        except ValueError:
+            return None
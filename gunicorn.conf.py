@@ -0,0 +1,53 @@
+"""
+Gunicorn settings of the production serving profile (docker-compose.prod.yml).
+
+WSGI, threaded workers:
+    gunicorn -c gunicorn.conf.py bond_service_demonstrator.wsgi:application
+ASGI, uvicorn workers:
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+        gunicorn -c gunicorn.conf.py bond_service_demonstrator.asgi:application
+
+Every value can be overridden with the GUNICORN_* variable next to it.
+"""
+
+import multiprocessing
+import os
+
+bind: str = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Request handling is mostly CPU-bound Python, so processes give parallelism:
+# the usual two per core plus one, capped so the workers fit the 2 GB
+# container limit of docker-compose.yml
+workers: int = int(
+    os.getenv(
+        "GUNICORN_WORKERS",
+        min(
+            multiprocessing.cpu_count() * 2 + 1,
+            int(os.getenv("GUNICORN_MAX_WORKERS", 8)),
+        ),
+    )
+)
+
+# Threads overlap the waits on PostgreSQL and the CDCP API within a worker.
+# Each thread keeps its own database connection open for DB_CONN_MAX_AGE, so
+# PostgreSQL sees up to workers * threads connections (default limit 100).
+worker_class: str = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads: int = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Keep-alive lets clients and proxies reuse connections between requests
+keepalive: int = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+timeout: int = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout: int = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+# Workers are replaced after this many requests (with jitter so they do not
+# restart together), which bounds the growth of the in-process caches
+max_requests: int = int(os.getenv("GUNICORN_MAX_REQUESTS", 5000))
+max_requests_jitter: int = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 500))
+
+# Worker heartbeats go to memory instead of the container's overlay filesystem
+worker_tmp_dir: str = os.getenv("GUNICORN_WORKER_TMP_DIR", "/dev/shm")
+
+# The application logs every request itself; gunicorn's access log is opt-in
+accesslog: str | None = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog: str = "-"
+loglevel: str = os.getenv("GUNICORN_LOG_LEVEL", "info")
@@ -1,12 +1,26 @@
-import psycopg2
 import os
+import sys
 import time
-import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+import django
+import psycopg2
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError
+from django.db import connection as django_connection
+from django.db.migrations.executor import MigrationExecutor
+from psycopg2 import sql
 from psycopg2.extensions import connection
 from dotenv import load_dotenv
 from bond_service_demonstrator.logger import logger, setup_logging
 
 load_dotenv()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bond_service_demonstrator.settings")
+
+# Key of the advisory lock taken while bootstrapping, so containers starting
+# together create the database and apply migrations one at a time
+BOOTSTRAP_LOCK_ID: int = 0x424F4E44
 
 
 class PostgresDatabaseManager:
@@ -27,108 +41,146 @@ class PostgresDatabaseManager:
             )
         return value
 
-    def connect_to_postgres(self, dbname: str) -> connection:
+    def connect_to_postgres(self, dbname: str, timeout: int = 5) -> connection:
         """Connect to PostgreSQL database."""
-        logger.debug(f"Attempting to connect to PostgreSQL database: {dbname}")
+        logger.debug("Attempting to connect to PostgreSQL database: %s", dbname)
         return psycopg2.connect(
             dbname=dbname,
             user=self.user,
             password=self.password,
             host=self.host,
             port=self.port,
+            connect_timeout=timeout,
         )
 
     def check_database_exists(self, cursor: psycopg2.extensions.cursor) -> bool:
         """Check if the database already exists."""
-        cursor.execute(f"SELECT 1 FROM pg_database WHERE datname = '{self.dbname}'")
+        cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [self.dbname])
         return cursor.fetchone() is not None
 
     def drop_database(self, cursor: psycopg2.extensions.cursor) -> None:
         """Drop the database if it exists."""
-        logger.info(f"Dropping database '{self.dbname}'...")
-        cursor.execute(f"DROP DATABASE IF EXISTS {self.dbname}")
+        logger.info("Dropping database '%s'...", self.dbname)
+        cursor.execute(
+            sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(self.dbname))
+        )
 
     def create_database(self, cursor: psycopg2.extensions.cursor) -> None:
         """Create the database if it doesn't exist."""
-        logger.info(f"Creating database '{self.dbname}'...")
-        cursor.execute(f"CREATE DATABASE {self.dbname}")
+        logger.info("Creating database '%s'...", self.dbname)
         cursor.execute(
-            f"GRANT ALL PRIVILEGES ON DATABASE {self.dbname} TO {self.user};"
+            sql.SQL("CREATE DATABASE {}").format(sql.Identifier(self.dbname))
+        )
+        cursor.execute(
+            sql.SQL("GRANT ALL PRIVILEGES ON DATABASE {} TO {}").format(
+                sql.Identifier(self.dbname), sql.Identifier(self.user)
+            )
         )
 
-    def wait_for_postgres(self, timeout: int, delay: int = 5) -> bool:
-        start_time: float = time.time()
-        logger.info(f"Waiting for PostgreSQL server at {self.host}:{self.port}...")
-        while time.time() - start_time < timeout:
-            if (
-                subprocess.run(
-                    ["nc", "-zv", self.host, self.port],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                ).returncode
-                == 0
-            ):
+    def wait_for_postgres(
+        self, timeout: float, delay: float = 0.1, max_delay: float = 5.0
+    ) -> connection | None:
+        """
+        Connects to the ``postgres`` maintenance database, retrying with
+        exponential backoff from ``delay`` up to ``max_delay`` seconds until
+        ``timeout`` runs out. Returns the open connection, or None.
+        """
+        deadline: float = time.monotonic() + timeout
+        logger.info("Waiting for PostgreSQL server at %s:%s...", self.host, self.port)
+        while True:
+            remaining: float = deadline - time.monotonic()
+            try:
+                # libpq treats connect timeouts below 2 seconds as 2
+                conn: connection = self.connect_to_postgres(
+                    "postgres", timeout=max(2, int(min(remaining, max_delay)))
+                )
+            except psycopg2.OperationalError as e:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.error(
+                        "PostgreSQL server did not become available after %s seconds.",
+                        timeout,
+                    )
+                    return None
+                logger.debug("PostgreSQL server is not ready yet: %s", e)
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, max_delay)
+            else:
                 logger.info("PostgreSQL server is up!")
-                return True
-            time.sleep(delay)
-        logger.error(
-            f"PostgreSQL server did not become available after {timeout} seconds."
-        )
-        return False
+                return conn
 
     def run_django_migrations(self) -> None:
-        """Run Django migrations (makemigrations and migrate)."""
+        """
+        Run Django migrations in this process. ``migrate`` is skipped when the
+        migration table already records every migration; ``makemigrations``
+        runs only outside the production profile.
+        """
         try:
-            logger.info("Running Django migrations...")
-            subprocess.run(["python", "manage.py", "makemigrations"], check=True)
-            subprocess.run(["python", "manage.py", "migrate"], check=True)
+            if not settings.PRODUCTION:
+                call_command("makemigrations", interactive=False)
+            executor: MigrationExecutor = MigrationExecutor(django_connection)
+            plan: list = executor.migration_plan(executor.loader.graph.leaf_nodes())
+            if not plan:
+                logger.info("Database schema is up to date, skipping migrations.")
+                return
+            logger.info("Running %s Django migrations...", len(plan))
+            call_command("migrate", interactive=False)
             logger.info("Migrations completed successfully.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error running migrations: {e}", exc_info=True)
-
-    def manage_database(self, timeout: int = 40) -> None:
-        """Main function to manage the PostgreSQL database."""
-        if not self.wait_for_postgres(timeout):
-            logger.error(
-                f"Error: PostgreSQL server is not available after waiting for {timeout} seconds."
-            )
-            return
-
-        try:
-            conn: connection = self.connect_to_postgres("postgres")
-            conn.autocommit = True
-            cursor: psycopg2.extensions.cursor = conn.cursor()
-
-            # Check if the database already exists
-            if not self.check_database_exists(cursor):
-                self.drop_database(cursor)
-                self.create_database(cursor)
-            else:
-                logger.info(f"Database '{self.dbname}' already exists.")
-
-            cursor.close()
-            conn.close()
-
-            # Connect to the newly created database
-            conn = self.connect_to_postgres(self.dbname)
-            cursor = conn.cursor()
-
-            # After connecting to the database, run migrations
-            self.run_django_migrations()
-
-            cursor.close()
-            conn.close()
-
-        except Exception as e:
-            logger.error(f"Error occurred: {e}", exc_info=True)
-
-
-if __name__ == "__main__":
+        except (CommandError, DatabaseError) as e:
+            logger.error("Error running migrations: %s", e, exc_info=True)
+            raise
+
+    def manage_database(self, timeout: int = 40) -> bool:
+        """
+        Main function to manage the PostgreSQL database. Returns False if the
+        database could not be prepared, so the server must not be started.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Django loads its apps while the PostgreSQL server is starting
+            django_ready: Future = executor.submit(django.setup)
+            conn: connection | None = self.wait_for_postgres(timeout)
+            if conn is None:
+                logger.error(
+                    "Error: PostgreSQL server is not available after waiting for %s seconds.",
+                    timeout,
+                )
+                return False
+
+            try:
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    # Held until the connection closes
+                    cursor.execute("SELECT pg_advisory_lock(%s)", [BOOTSTRAP_LOCK_ID])
+
+                    # Check if the database already exists
+                    if not self.check_database_exists(cursor):
+                        self.create_database(cursor)
+                    else:
+                        logger.info("Database '%s' already exists.", self.dbname)
+
+                    django_ready.result()
+                    self.run_django_migrations()
+
+            except Exception as e:
+                logger.error("Error occurred: %s", e, exc_info=True)
+                return False
+            finally:
+                conn.close()
+        return True
+
+
+def main() -> int:
+    """Prepares the database; the exit status is non-zero if that failed."""
     # Initialize the logger before using it
     setup_logging()
 
     # Create an instance of PostgresDatabaseManager
     manager = PostgresDatabaseManager()
 
-    # Call the function to manage the database
-    manager.manage_database(timeout=40)
+    # Call the function to manage the database; a failure stops the
+    # "init_db.py && server" chain of the compose files
+    return 0 if manager.manage_database(timeout=40) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
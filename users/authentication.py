@@ -0,0 +1,66 @@
+from django.contrib.auth.models import User
+from django.http import HttpRequest
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+from .token_cache import token_cache
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that resolves tokens through ``token_cache`` and only
+    queries the Token and User tables on a cache miss.
+    """
+
+    def authenticate_credentials(self, key: str) -> tuple[User, Token]:
+        token: Token | None = token_cache.get(key)
+        if token is None:
+            try:
+                token = self.get_model().objects.select_related("user").get(key=key)
+            except self.get_model().DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            token_cache.set(token)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return token.user, token
+
+    async def aauthenticate(self, request: HttpRequest) -> tuple[User, Token] | None:
+        """
+        Asynchronous variant of ``authenticate`` for async Django views; returns
+        None when the request carries no token.
+        """
+        auth: list[bytes] = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(
+                _("Invalid token header. Token string should not contain spaces.")
+            )
+        try:
+            key: str = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _(
+                    "Invalid token header. Token string should not contain "
+                    "invalid characters."
+                )
+            )
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key: str) -> tuple[User, Token]:
+        """Asynchronous variant of ``authenticate_credentials``."""
+        token: Token | None = await token_cache.aget(key)
+        if token is None:
+            try:
+                token = await (
+                    self.get_model().objects.select_related("user").aget(key=key)
+                )
+            except self.get_model().DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            await token_cache.aset(token)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return token.user, token
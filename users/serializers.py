@@ -1,8 +1,10 @@
+import logging
 from rest_framework import serializers
 from django.db import IntegrityError
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
-from bond_service_demonstrator.logger import logger
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -24,7 +26,9 @@ class RegisterSerializer(serializers.ModelSerializer):
         validated_email: str = validated_data.get("email", "")
 
         logger.debug(
-            f"Registration started for user '{validated_username}' with email '{validated_email}'."
+            "Registration started for user '%s' with email '%s'.",
+            validated_username,
+            validated_email,
         )
 
         try:
@@ -34,17 +38,17 @@ class RegisterSerializer(serializers.ModelSerializer):
                 password=validated_data["password"],
             )
 
-            logger.info(f"User '{validated_username}' successfully created.")
+            logger.info("User '%s' successfully created.", validated_username)
 
             Token.objects.create(user=user)
 
-            logger.debug(f"Token created for user '{validated_username}'.")
+            logger.debug("Token created for user '%s'.", validated_username)
 
             return user
 
         except IntegrityError as e:
-            logger.error(f"Database error during registration: {str(e)}")
+            logger.error("Database error during registration: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error during registration: {str(e)}")
+            logger.error("Unexpected error during registration: %s", e)
             raise
@@ -0,0 +1,26 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .token_cache import token_cache
+
+
+def invalidate_on_commit(key: str) -> None:
+    """Drops a token from the cache once the current transaction commits."""
+    transaction.on_commit(lambda: token_cache.invalidate(key))
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender: type[Token], instance: Token, **kwargs) -> None:
+    """Logout and token rotation delete the token; stop accepting it at once."""
+    invalidate_on_commit(instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender: type[User], instance: User, created: bool, **kwargs) -> None:
+    """Cached tokens hold a copy of the user; drop it when the user changes."""
+    if created:
+        return
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+        invalidate_on_commit(key)
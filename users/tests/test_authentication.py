@@ -0,0 +1,96 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from users.token_cache import token_cache
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        token_cache.clear()
+        token_cache.reset_stats()
+        self.user: User = User.objects.create_user(
+            username="testuser", password="password"
+        )
+        self.token: Token = Token.objects.create(user=self.user)
+        self.api_client: APIClient = APIClient()
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def token_queries(self, queries: CaptureQueriesContext) -> list[str]:
+        return [
+            query["sql"] for query in queries if '"authtoken_token"' in query["sql"]
+        ]
+
+    def test_repeated_requests_skip_the_token_query(self) -> None:
+        self.assertEqual(self.api_client.get("/api/bonds/manage/").status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            response: Response = self.api_client.get("/api/bonds/manage/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.token_queries(queries), [])
+        stats: dict = token_cache.stats()
+        self.assertEqual((stats["misses"], stats["local_hits"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_requests_get_their_own_token_and_user(self) -> None:
+        token_cache.set(Token.objects.select_related("user").get(pk=self.token.pk))
+
+        first: Token = token_cache.get(self.token.key)
+        first.user.first_name = "Changed by one request"
+        second: Token = token_cache.get(self.token.key)
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.user, second.user)
+        self.assertEqual(second.user.first_name, "")
+
+    def test_shared_tier_serves_other_processes(self) -> None:
+        self.api_client.get("/api/bonds/manage/")
+        token_cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.api_client.get("/api/bonds/manage/")
+
+        self.assertEqual(self.token_queries(queries), [])
+        self.assertEqual(token_cache.stats()["shared_hits"], 1)
+
+    def test_logout_invalidates_the_cached_token(self) -> None:
+        self.api_client.get("/api/bonds/manage/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response: Response = self.api_client.post("/api/users/logout/")
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.api_client.get("/api/bonds/manage/").status_code, 401)
+
+    def test_rotated_token_is_rejected(self) -> None:
+        self.api_client.get("/api/bonds/manage/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+            new_token: Token = Token.objects.create(user=self.user)
+
+        self.assertEqual(self.api_client.get("/api/bonds/manage/").status_code, 401)
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Token {new_token.key}")
+        self.assertEqual(self.api_client.get("/api/bonds/manage/").status_code, 200)
+
+    def test_deactivated_user_is_rejected(self) -> None:
+        self.api_client.get("/api/bonds/manage/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(self.api_client.get("/api/bonds/manage/").status_code, 401)
+
+    def test_read_before_invalidation_is_not_cached_again(self) -> None:
+        stale: Token = Token.objects.select_related("user").get(key=self.token.key)
+        token_cache.invalidate(self.token.key)
+
+        token_cache.set(stale)
+
+        self.assertIsNone(token_cache.get(self.token.key))
@@ -0,0 +1,124 @@
+import copy
+import hashlib
+from typing import Any
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+from bond_service_demonstrator import metrics
+from bond_service_demonstrator.cache import MISSING, TieredCache
+
+token_cache_lookups: metrics.Counter = metrics.registry.counter(
+    "bsd_token_cache_lookups_total",
+    "Token authentication cache lookups by result.",
+    ("result",),
+)
+
+
+class TokenCache(TieredCache):
+    """
+    Cache of authenticated tokens, each loaded together with its user.
+
+    Lookups hit a bounded in-process LRU first and then the shared Django
+    cache, so the Token + User query runs once per token and TTL instead of
+    once per request. Entries are dropped on both tiers when a token is
+    deleted or its user changes, but other processes keep their in-process
+    entry for up to ``local_ttl`` seconds, so keep that window short.
+    Invalidation leaves a tombstone in the shared tier so that a request which
+    read the token just before it was deleted cannot cache it again.
+
+    Cache keys are hashes of the token keys. The shared tier holds user rows,
+    so it must be as private as the database. Every lookup returns its own
+    copy of the token and user, so changes a request makes to
+    ``request.auth`` or ``request.user`` do not reach other requests.
+    """
+
+    KEY_PREFIX: str = "auth:token:"
+    # Shared-tier value of a recently invalidated token, kept for longer than
+    # any request that may still hold a token read before the invalidation
+    TOMBSTONE: str = "invalidated"
+    TOMBSTONE_TTL: int = 60
+
+    def __init__(
+        self,
+        ttl: int = 300,
+        local_ttl: int = 5,
+        max_entries: int = 4096,
+        alias: str = "default",
+    ) -> None:
+        super().__init__(
+            self.KEY_PREFIX,
+            ttl=ttl,
+            local_ttl=local_ttl,
+            max_entries=max_entries,
+            alias=alias,
+        )
+
+    @classmethod
+    def from_settings(cls) -> "TokenCache":
+        """Builds the cache from the ``TOKEN_AUTH_CACHE`` setting."""
+        config: dict = getattr(settings, "TOKEN_AUTH_CACHE", {})
+        return cls(
+            ttl=config.get("TTL", 300),
+            local_ttl=config.get("LOCAL_TTL", 5),
+            max_entries=config.get("MAX_ENTRIES", 4096),
+            alias=config.get("ALIAS", "default"),
+        )
+
+    @staticmethod
+    def digest(key: str) -> str:
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    @classmethod
+    def cache_key(cls, key: str) -> str:
+        return cls.KEY_PREFIX + cls.digest(key)
+
+    def accepts(self, value: Any) -> bool:
+        # Tombstones of invalidated tokens are misses
+        return isinstance(value, Token)
+
+    @staticmethod
+    def detached(token: Token) -> Token:
+        """Copy of ``token`` with its own copy of the user."""
+        copied: Token = copy.copy(token)
+        copied.user = copy.copy(token.user)
+        return copied
+
+    def get(self, key: str) -> Token | None:
+        """Returns a copy of the cached token with its user, or None on a miss."""
+        token: Token | None = super().get(self.digest(key))
+        return None if token is None else self.detached(token)
+
+    def set(self, token: Token) -> None:
+        """
+        Stores a token, loaded with its user, in both cache tiers unless it
+        was invalidated since the lookup missed.
+        """
+        cache_key: str = self.cache_key(token.key)
+        if not self.shared.add(cache_key, token, timeout=self.ttl) and not isinstance(
+            self.shared.get(cache_key), Token
+        ):
+            return
+        self._local.set(cache_key, self.detached(token))
+
+    async def aget(self, key: str) -> Token | None:
+        """Asynchronous variant of ``get``."""
+        token, _ = await self.alookup(self.digest(key))
+        return None if token is MISSING else self.detached(token)
+
+    async def aset(self, token: Token) -> None:
+        """Asynchronous variant of ``set``."""
+        await sync_to_async(self.set, thread_sensitive=False)(token)
+
+    def invalidate(self, key: str) -> None:
+        """Drops a single token from both cache tiers."""
+        cache_key: str = self.cache_key(key)
+        self._local.delete(cache_key)
+        self.shared.set(cache_key, self.TOMBSTONE, timeout=self.TOMBSTONE_TTL)
+
+    def _count(self, counter: str) -> None:
+        super()._count(counter)
+        token_cache_lookups.inc(counter)
+
+
+# Process-wide instance shared by CachedTokenAuthentication
+token_cache: TokenCache = TokenCache.from_settings()
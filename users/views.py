@@ -1,9 +1,9 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.generics import CreateAPIView
+from users.authentication import CachedTokenAuthentication
 from users.serializers import RegisterSerializer
 
 
@@ -29,11 +29,14 @@ class CustomLogoutView(APIView):
     View for logging out the user by deleting their auth token.
     """
 
-    authentication_classes: list[type[TokenAuthentication]] = [TokenAuthentication]
+    authentication_classes: list[type[CachedTokenAuthentication]] = [
+        CachedTokenAuthentication
+    ]
 
     def post(self, request, *args, **kwargs) -> Response:
         """
-        Log out the user by deleting the auth token.
+        Log out the user by deleting the auth token, which also drops it from
+        the token authentication cache.
         """
-        request.user.auth_token.delete()
+        request.auth.delete()
         return Response({"detail": "Successfully logged out."}, status=200)